@@ -0,0 +1,135 @@
+'''
+An incremental ("active region") stepper for the same rules and neighbors functions used by GolAR.step.
+
+GolAR.step re-expands every live cell each generation.  ActiveLife only re-evaluates cells
+whose neighborhood differs from two generations ago, and lets settled regions run for free:
+- still lifes (period 1) never change, so they never enter the frontier;
+- oscillating cells in settled period-2 regions are "parked": instead of being toggled
+  every generation, each parked cell remembers the generation at which its stored state
+  was correct and its current state is derived from the generation's parity.
+
+Why this is exact: write change(c, t) for "cell c flipped between generation t-1 and t".
+If change(n, t) == change(n, t-1) for every cell n in c's neighborhood (c included), then
+the neighborhood is identical at generations t and t-2, so change(c, t+1) == change(c, t).
+Only cells within one neighbor step of the difference between the last two change-sets
+need their neighbors counted; every other cell simply repeats its last change.
+This relies on the neighborhood being symmetric (b is a neighbor of a exactly when
+a is a neighbor of b), as GolAR.neighbors_rect is.
+'''
+
+import GolAR
+
+class ActiveLife:
+    '''
+    Holds one Game of Life universe and advances it one generation at a time,
+    doing work proportional to its activity rather than its population.
+    '''
+
+    def __init__(self, live_cells, rules=GolAR.conway_rules, neighbors=GolAR.neighbors_rect):
+        self.rules = rules
+        self.neighbors = neighbors
+        self.generation = 0
+        # live cells, except that parked cells may be stale by one phase
+        self._live = set(live_cells)
+        # parked cell -> generation at which its membership in _live was correct
+        self._parked = {}
+        # cells that flipped between the previous generation and this one (excluding parked cells)
+        self._changed = set(self._live)
+        # symmetric difference between the last two change-sets (parked cells included in both)
+        self._diff = set(self._live)
+        # number of cells evaluated by the most recent step
+        self.evaluated = 0
+
+    def is_alive(self, cell):
+        '''Returns True if cell is alive in the current generation.'''
+        alive = cell in self._live
+        parked_at = self._parked.get(cell)
+        if parked_at is not None and (self.generation - parked_at) % 2 == 1:
+            alive = not alive
+        return alive
+
+    def _unpark(self, cell):
+        '''Stores cell's current state in _live and stops deriving it from the generation's parity.'''
+        if self.is_alive(cell):
+            self._live.add(cell)
+        else:
+            self._live.discard(cell)
+        del self._parked[cell]
+
+    def step(self):
+        '''Advances the universe one generation.'''
+        neighbors = self.neighbors
+        # cells whose neighborhood changed differently over the last two generations
+        evaluate = set(self._diff)
+        for cell in self._diff:
+            evaluate.update(neighbors(cell))
+        unparked = [cell for cell in evaluate if cell in self._parked]
+        for cell in unparked:
+            self._unpark(cell)
+
+        # is_alive, inlined: a parked cell's state is flipped on odd generations since parking
+        live = self._live
+        parked = self._parked
+        generation = self.generation
+        rules = self.rules
+        changed = set()
+        for cell in evaluate:
+            alive = cell in live
+            count = 0
+            for n in neighbors(cell):
+                if (n in live) != (n in parked and (generation - parked[n]) % 2 == 1):
+                    count += 1
+            if rules(count, alive) != alive:
+                changed.add(cell)
+
+        # Cells that changed last generation but are too far from any difference to be evaluated
+        # change again, and keep doing so until a difference reaches them: park them.
+        for cell in self._changed.difference(evaluate):
+            self._parked[cell] = self.generation
+
+        # The last change-set, less the cells just parked, plus the cells just unparked
+        # (which were flipping) lines up with the new change-set for the next difference.
+        previous = self._changed.intersection(evaluate)
+        previous.update(unparked)
+        if self.generation == 0:
+            # generation 0 has no real predecessor, so generation 2 cannot be inferred from it:
+            # evaluate around every change of the first step
+            self._diff = set(changed)
+        else:
+            self._diff = changed.symmetric_difference(previous)
+        self._changed = changed
+        self._live.symmetric_difference_update(changed)
+        self.generation += 1
+        self.evaluated = len(evaluate)
+
+    def advance(self, generations):
+        '''Advances the universe by the specified number of generations.'''
+        for i in range(generations):
+            self.step()
+
+    @property
+    def active(self):
+        '''Returns the number of cells that flipped last generation outside of parked regions.'''
+        return len(self._changed)
+
+    def live_cells(self):
+        '''Returns the set of live (x, y) cells in the current generation.'''
+        cells = set(self._live)
+        for cell in self._parked:
+            if self.is_alive(cell):
+                cells.add(cell)
+            else:
+                cells.discard(cell)
+        return cells
+
+    @property
+    def population(self):
+        return len(self.live_cells())
+
+
+def life(live_cells, rules=GolAR.conway_rules, neighbors=GolAR.neighbors_rect):
+    '''Incremental counterpart of GolAR.life: a generator yielding successive generations as live-cell sets.'''
+    universe = ActiveLife(live_cells, rules, neighbors)
+    while True:
+        universe.step()
+        yield universe.live_cells()
@@ -0,0 +1,113 @@
+'''
+A dense, NumPy-backed alternative to the set-based GolAR.step.
+
+GolAR.step counts neighbors by building a Counter over every neighbor tuple
+of every live cell, which is flexible but allocates heavily for large populations.
+This module stores a bounded (or toroidal) board as a 2-d uint8 array of 0/1 cells,
+counts neighbors with whole-array shifted slices, and resolves the next generation
+with a lookup table compiled from any outer-totalistic rules function,
+e.g. GolAR.conway_rules.
+
+Grids are indexed grid[y, x], so the (x, y) tuples used by GolAR map onto
+rows (y) and columns (x) of the array.
+'''
+
+import numpy as np
+
+import GolAR
+
+MAX_NEIGHBORS = 8
+
+def rule_table(rules, max_neighbors=MAX_NEIGHBORS):
+    '''
+    Compiles an outer-totalistic rules function (same signature as GolAR.conway_rules)
+    into a uint8 lookup table indexed by [is_alive, number_of_neighbors].
+    '''
+    table = np.zeros((2, max_neighbors + 1), dtype=np.uint8)
+    for is_alive in (0, 1):
+        for count in range(max_neighbors + 1):
+            table[is_alive, count] = 1 if rules(count, bool(is_alive)) else 0
+    return table
+
+def rulestring_table(rulestring, max_neighbors=MAX_NEIGHBORS):
+    '''
+    Compiles a declared outer-totalistic rule in B/S notation, e.g. 'B3/S23' (Conway)
+    or 'B36/S23' (HighLife), into a lookup table like rule_table's.
+    '''
+    parts = rulestring.upper().split('/')
+    births = [p[1:] for p in parts if p.startswith('B')]
+    survivals = [p[1:] for p in parts if p.startswith('S')]
+    if len(parts) != 2 or len(births) != 1 or len(survivals) != 1:
+        raise ValueError('Expected a rule like B3/S23: rulestring={0}'.format(rulestring))
+    born = {int(n) for n in births[0]}
+    survive = {int(n) for n in survivals[0]}
+    return rule_table(lambda count, is_alive: count in (survive if is_alive else born), max_neighbors)
+
+def neighbor_offsets(neighbors=GolAR.neighbors_rect):
+    '''
+    Returns the (dx, dy) offsets of a translation-invariant neighbors function
+    (same signature as GolAR.neighbors_rect) by evaluating it at the origin.
+    '''
+    return [(x, y) for x, y in neighbors((0, 0))]
+
+def to_grid(live_cells, cols, rows, origin=(0, 0)):
+    '''
+    Returns a rows-by-cols uint8 array with 1 for every (x, y) in live_cells.
+    origin is the (x, y) location that maps to grid[0, 0].
+    Raises ValueError if a live cell falls outside the grid.
+    '''
+    grid = np.zeros((rows, cols), dtype=np.uint8)
+    ox, oy = origin
+    for x, y in live_cells:
+        gx, gy = x - ox, y - oy
+        if not (0 <= gx < cols and 0 <= gy < rows):
+            raise ValueError('live cell ({0}, {1}) is outside the {2}x{3} grid at origin {4}'.format(x, y, cols, rows, origin))
+        grid[gy, gx] = 1
+    return grid
+
+def to_live_cells(grid, origin=(0, 0)):
+    '''Returns the set of (x, y) location tuples of the live cells in grid.'''
+    ox, oy = origin
+    ys, xs = np.nonzero(grid)
+    return {(int(x) + ox, int(y) + oy) for x, y in zip(xs, ys)}
+
+def neighbor_counts(grid, offsets=None, torus=False):
+    '''
+    Returns a uint8 array the shape of grid holding each cell's live-neighbor count.
+    On a bounded grid, cells beyond the edges count as dead;
+    on a torus, rows and columns wrap around at the edges.
+    '''
+    if offsets is None:
+        offsets = neighbor_offsets()
+    counts = np.zeros(grid.shape, dtype=np.uint8)
+    if torus:
+        for dx, dy in offsets:
+            # the neighbor at (x+dx, y+dy) contributes to (x, y): shift the grid by (-dx, -dy)
+            counts += np.roll(grid, (-dy, -dx), axis=(0, 1))
+        return counts
+    halo = max([max(abs(dx), abs(dy)) for dx, dy in offsets] + [0])
+    rows, cols = grid.shape
+    padded = np.zeros((rows + 2 * halo, cols + 2 * halo), dtype=np.uint8)
+    padded[halo:halo + rows, halo:halo + cols] = grid
+    for dx, dy in offsets:
+        counts += padded[halo + dy:halo + dy + rows, halo + dx:halo + dx + cols]
+    return counts
+
+def step(rules, grid, torus=False, offsets=None):
+    '''
+    Applies rules to grid, returning the next generation as a new uint8 array.
+    rules may be a rules function (like GolAR.conway_rules) or a table from rule_table.
+    '''
+    table = rules if isinstance(rules, np.ndarray) else rule_table(rules, len(offsets) if offsets else MAX_NEIGHBORS)
+    return table[grid, neighbor_counts(grid, offsets, torus)]
+
+def life(live_cells, cols, rows, origin=(0, 0), torus=False, rules=GolAR.conway_rules):
+    '''
+    Dense counterpart of GolAR.life: a generator yielding successive generations
+    as sets of live (x, y) cells on a cols-by-rows board.
+    '''
+    table = rule_table(rules)
+    grid = to_grid(live_cells, cols, rows, origin)
+    while True:
+        grid = step(table, grid, torus)
+        yield to_live_cells(grid, origin)
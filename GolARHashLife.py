@@ -0,0 +1,258 @@
+'''
+A HashLife engine for the same live-cell sets used by GolAR.life.
+
+HashLife (Bill Gosper, 1984) represents the plane as a quadtree whose nodes are
+hash-consed, so identical sub-patterns share a single node, and memoizes the
+"successor" of each node: the centre of the node advanced 2**j generations.
+Periodic and repetitive patterns therefore advance exponentially many
+generations for linear work.
+See:
+"An Algorithm for Compressing Space and Time", Tomas Rokicki, Dr. Dobb's Journal, 2006
+https://www.drdobbs.com/jvm/an-algorithm-for-compressing-space-and-t/184406478
+
+The join (hash-consing) and successor caches are bounded LRU caches.
+Evicting an entry never changes results: it only costs recomputation,
+and possibly a duplicate (but equivalent) node.
+
+Quadrants are named a (north-west), b (north-east), c (south-west), d (south-east),
+with x increasing to the east and y increasing to the south.
+'''
+
+from functools import lru_cache
+
+import GolAR
+
+DEFAULT_CACHE_SIZE = 1 << 20
+
+class Node:
+    '''
+    One immutable quadtree node of level k, covering a 2**k by 2**k square of cells.
+    Level 0 nodes are single cells; population n is the number of live cells covered.
+    '''
+    __slots__ = ('k', 'a', 'b', 'c', 'd', 'n')
+
+    def __init__(self, k, a, b, c, d, n):
+        self.k = k
+        self.a = a
+        self.b = b
+        self.c = c
+        self.d = d
+        self.n = n
+
+    def __repr__(self):
+        return 'Node(k={0}, n={1})'.format(self.k, self.n)
+
+OFF = Node(0, None, None, None, None, 0)
+ON = Node(0, None, None, None, None, 1)
+
+class HashLife:
+    '''
+    Holds a HashLife universe: a root node, the (x, y) location of the root's
+    north-west corner, and the number of generations advanced so far.
+    '''
+
+    def __init__(self, live_cells=(), rules=GolAR.conway_rules, cache_size=DEFAULT_CACHE_SIZE):
+        self.rules = rules
+        self.join = lru_cache(maxsize=cache_size)(self._join)
+        self.successor = lru_cache(maxsize=cache_size)(self._successor)
+        self.empty = lru_cache(maxsize=None)(self._empty)
+        self.generation = 0
+        self.root, self.origin = self.build(set(live_cells))
+
+    def clear_caches(self):
+        '''Drops every memoized join and successor result.'''
+        self.join.cache_clear()
+        self.successor.cache_clear()
+
+    def cache_info(self):
+        '''Returns the (join, successor) lru_cache statistics.'''
+        return self.join.cache_info(), self.successor.cache_info()
+
+    #----- node construction
+
+    def _join(self, a, b, c, d):
+        '''Returns the canonical level k+1 node with quadrants a, b, c, d of level k.'''
+        return Node(a.k + 1, a, b, c, d, a.n + b.n + c.n + d.n)
+
+    def _empty(self, k):
+        '''Returns the canonical empty node of level k.'''
+        if k == 0:
+            return OFF
+        e = self.empty(k - 1)
+        return self.join(e, e, e, e)
+
+    def centre(self, m):
+        '''Returns a node one level up from m, with m at its centre and empty space around it.'''
+        e = self.empty(m.k - 1)
+        return self.join(
+            self.join(e, e, e, m.a), self.join(e, e, m.b, e),
+            self.join(e, m.c, e, e), self.join(m.d, e, e, e))
+
+    def build(self, live_cells):
+        '''
+        Returns (node, origin): the smallest node (of level >= 2) covering live_cells,
+        and the (x, y) location of its north-west corner.
+        '''
+        if not live_cells:
+            return self.empty(2), (0, 0)
+        xs = [x for x, y in live_cells]
+        ys = [y for x, y in live_cells]
+        x0, y0 = min(xs), min(ys)
+        span = max(max(xs) - x0, max(ys) - y0) + 1
+        k = 2
+        while (1 << k) < span:
+            k += 1
+        return self._build(k, x0, y0, live_cells), (x0, y0)
+
+    def _build(self, k, x0, y0, cells):
+        if not cells:
+            return self.empty(k)
+        if k == 0:
+            return ON
+        half = 1 << (k - 1)
+        quadrants = ([], [], [], [])
+        for x, y in cells:
+            quadrants[(2 if y >= y0 + half else 0) + (1 if x >= x0 + half else 0)].append((x, y))
+        return self.join(
+            self._build(k - 1, x0, y0, quadrants[0]), self._build(k - 1, x0 + half, y0, quadrants[1]),
+            self._build(k - 1, x0, y0 + half, quadrants[2]), self._build(k - 1, x0 + half, y0 + half, quadrants[3]))
+
+    #----- evolution
+
+    def _life_4x4(self, m):
+        '''Returns the level 1 centre of level 2 node m advanced one generation.'''
+        quads = (m.a, m.b, m.c, m.d)
+        cells = [[0] * 4 for i in range(4)]
+        for iq, q in enumerate(quads):
+            for ic, cell in enumerate((q.a, q.b, q.c, q.d)):
+                cells[2 * (iq // 2) + ic // 2][2 * (iq % 2) + ic % 2] = cell.n
+        centre = []
+        for y in (1, 2):
+            for x in (1, 2):
+                count = sum(cells[y + dy][x + dx] for dy in (-1, 0, 1) for dx in (-1, 0, 1)) - cells[y][x]
+                centre.append(ON if self.rules(count, cells[y][x] == 1) else OFF)
+        return self.join(*centre)
+
+    def _successor(self, m, j):
+        '''
+        Returns the level k-1 centre of level k node m advanced 2**j generations,
+        where 0 <= j <= k-2.
+        '''
+        if m.n == 0:
+            return m.a
+        if m.k == 2:
+            return self._life_4x4(m)
+        j = min(j, m.k - 2)
+        join = self.join
+        # nine overlapping level k-1 sub-squares, advanced to their level k-2 centres
+        c1 = self.successor(join(m.a.a, m.a.b, m.a.c, m.a.d), j)
+        c2 = self.successor(join(m.a.b, m.b.a, m.a.d, m.b.c), j)
+        c3 = self.successor(join(m.b.a, m.b.b, m.b.c, m.b.d), j)
+        c4 = self.successor(join(m.a.c, m.a.d, m.c.a, m.c.b), j)
+        c5 = self.successor(join(m.a.d, m.b.c, m.c.b, m.d.a), j)
+        c6 = self.successor(join(m.b.c, m.b.d, m.d.a, m.d.b), j)
+        c7 = self.successor(join(m.c.a, m.c.b, m.c.c, m.c.d), j)
+        c8 = self.successor(join(m.c.b, m.d.a, m.c.d, m.d.c), j)
+        c9 = self.successor(join(m.d.a, m.d.b, m.d.c, m.d.d), j)
+        if j < m.k - 2:
+            # the sub-squares are already 2**j generations on: just reassemble their centres
+            return join(
+                join(c1.d, c2.c, c4.b, c5.a), join(c2.d, c3.c, c5.b, c6.a),
+                join(c4.d, c5.c, c7.b, c8.a), join(c5.d, c6.c, c8.b, c9.a))
+        # j == k-2: advance 2**(k-3) generations twice
+        return join(
+            self.successor(join(c1, c2, c4, c5), j - 1), self.successor(join(c2, c3, c5, c6), j - 1),
+            self.successor(join(c4, c5, c7, c8), j - 1), self.successor(join(c5, c6, c8, c9), j - 1))
+
+    def _is_padded(self, m):
+        '''Returns True if every live cell of m lies within its central half.'''
+        return (m.a.d.n == m.a.n and m.b.c.n == m.b.n and
+                m.c.b.n == m.c.n and m.d.a.n == m.d.n)
+
+    def _grow(self):
+        '''Wraps the root in empty space, keeping track of its north-west corner.'''
+        half = 1 << (self.root.k - 1)
+        self.root = self.centre(self.root)
+        self.origin = (self.origin[0] - half, self.origin[1] - half)
+
+    def _advance_power_of_two(self, j):
+        '''Advances the universe exactly 2**j generations.'''
+        # Pad until the pattern fits in the central quarter of a node of level >= j+3:
+        # it can then grow by at most 2**j cells per side without leaving the successor's square.
+        while self.root.k < 3 or not self._is_padded(self.root):
+            self._grow()
+        self._grow()
+        while self.root.k < j + 3:
+            self._grow()
+        offset = 1 << (self.root.k - 2)
+        self.root = self.successor(self.root, j)
+        self.origin = (self.origin[0] + offset, self.origin[1] + offset)
+        self.generation += 1 << j
+
+    def advance(self, generations):
+        '''
+        Advances the universe by the specified number of generations,
+        one power-of-two jump per set bit, i.e. in time logarithmic in generations
+        for patterns whose sub-patterns repeat.
+        '''
+        if generations < 0:
+            raise ValueError('Cannot advance a negative number of generations: {0}'.format(generations))
+        j = 0
+        while generations:
+            if generations & 1:
+                self._advance_power_of_two(j)
+            generations >>= 1
+            j += 1
+
+    def life(self):
+        '''A generator yielding successive generations as live-cell sets, like GolAR.life.'''
+        while True:
+            self.advance(1)
+            yield self.live_cells()
+
+    #----- views
+
+    @property
+    def population(self):
+        return self.root.n
+
+    def live_cells(self):
+        '''Returns the set of live (x, y) cells in the universe.'''
+        cells = set()
+        self._collect(self.root, self.origin[0], self.origin[1], cells)
+        return cells
+
+    def _collect(self, m, x, y, cells):
+        if m.n == 0:
+            return
+        if m.k == 0:
+            cells.add((x, y))
+            return
+        half = 1 << (m.k - 1)
+        self._collect(m.a, x, y, cells)
+        self._collect(m.b, x + half, y, cells)
+        self._collect(m.c, x, y + half, cells)
+        self._collect(m.d, x + half, y + half, cells)
+
+    def bounding_box(self):
+        '''
+        Returns the (xmin, ymin, xmax, ymax) inclusive bounds of the live cells,
+        or None if the universe is empty.
+        '''
+        cells = self.live_cells()
+        if not cells:
+            return None
+        xs = [x for x, y in cells]
+        ys = [y for x, y in cells]
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def to_text(self, live='#', dead='.'):
+        '''Returns the bounding box of the live cells as lines of text, north row first.'''
+        box = self.bounding_box()
+        if box is None:
+            return ''
+        cells = self.live_cells()
+        xmin, ymin, xmax, ymax = box
+        return '\n'.join(
+            ''.join(live if (x, y) in cells else dead for x in range(xmin, xmax + 1))
+            for y in range(ymin, ymax + 1))
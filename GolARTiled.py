@@ -0,0 +1,200 @@
+'''
+A multi-process, tiled Game of Life engine for boards too large for one core.
+
+The board is split into fixed-size tiles, and each generation every tile is stepped
+by a worker in a multiprocessing Pool.  The current and next generations live in
+two uint8 buffers in a single multiprocessing.shared_memory block, so nothing but
+tile coordinates crosses a process boundary: each worker reads its tile plus a
+one-cell halo (more, for wider neighborhoods) straight out of the current buffer,
+which is how neighboring tiles' borders are exchanged, and writes its tile into
+the next buffer.  The buffers swap roles every generation.
+
+Per-tile step times are recorded each generation to make load imbalance visible.
+'''
+
+import time
+from multiprocessing import Pool
+from multiprocessing import shared_memory
+
+import numpy as np
+
+import GolAR
+import GolARDense
+
+DEFAULT_TILE_SIZE = 256
+
+# Per-process state of a pool worker, set up by attach_worker.
+_worker = {}
+
+def tile_state(buffers, table, offsets, torus):
+    '''Returns the state step_tile needs: the board buffers, the rule set and the halo width, as a dict.'''
+    return {
+        'buffers': buffers,
+        'table': table,
+        'offsets': offsets,
+        'torus': torus,
+        'halo': max([max(abs(dx), abs(dy)) for dx, dy in offsets] + [0]),
+    }
+
+def attach_worker(shm_name, rows, cols, table, offsets, torus):
+    '''Pool initializer: attaches to the shared board buffers and stores the rule set in this worker's state.'''
+    shm = shared_memory.SharedMemory(name=shm_name)
+    _worker['shm'] = shm
+    _worker.update(tile_state(np.ndarray((2, rows, cols), dtype=np.uint8, buffer=shm.buf), table, offsets, torus))
+
+def read_with_halo(grid, y0, y1, x0, x1, halo, torus):
+    '''
+    Returns a copy of grid[y0:y1, x0:x1] surrounded by halo cells on every side.
+    Halo cells beyond the board wrap on a torus, and are dead otherwise.
+    '''
+    rows, cols = grid.shape
+    if torus:
+        row_index = np.arange(y0 - halo, y1 + halo) % rows
+        col_index = np.arange(x0 - halo, x1 + halo) % cols
+        return grid[np.ix_(row_index, col_index)]
+    block = np.zeros((y1 - y0 + 2 * halo, x1 - x0 + 2 * halo), dtype=grid.dtype)
+    gy0, gy1 = max(y0 - halo, 0), min(y1 + halo, rows)
+    gx0, gx1 = max(x0 - halo, 0), min(x1 + halo, cols)
+    block[gy0 - (y0 - halo):gy1 - (y0 - halo), gx0 - (x0 - halo):gx1 - (x0 - halo)] = grid[gy0:gy1, gx0:gx1]
+    return block
+
+def step_tile(task, state=None):
+    '''
+    Steps one tile from buffer current into buffer 1 - current, using state (from tile_state),
+    or this pool worker's state if state is None.
+    task is (tile_index, current, y0, y1, x0, x1); returns (tile_index, elapsed seconds).
+    '''
+    start = time.perf_counter()
+    if state is None:
+        state = _worker
+    tile_index, current, y0, y1, x0, x1 = task
+    buffers = state['buffers']
+    halo = state['halo']
+    block = read_with_halo(buffers[current], y0, y1, x0, x1, halo, state['torus'])
+    counts = GolARDense.neighbor_counts(block, state['offsets'])
+    if halo:
+        block = block[halo:-halo, halo:-halo]
+        counts = counts[halo:-halo, halo:-halo]
+    buffers[1 - current, y0:y1, x0:x1] = state['table'][block, counts]
+    return tile_index, time.perf_counter() - start
+
+class TiledLife:
+    '''
+    A cols-by-rows board (bounded, or a torus) stepped tile by tile in a process pool.
+    rules may be a rules function (like GolAR.conway_rules), a rule string like 'B3/S23',
+    or a table from GolARDense.rule_table.  neighbors must be translation-invariant,
+    like GolAR.neighbors_rect.
+    Use as a context manager, or call close(), to release the pool and shared memory.
+    '''
+
+    def __init__(self, cols, rows, live_cells=(), origin=(0, 0), rules=GolAR.conway_rules,
+                 neighbors=GolAR.neighbors_rect, torus=False, tile_size=DEFAULT_TILE_SIZE, workers=None):
+        self.cols = cols
+        self.rows = rows
+        self.origin = origin
+        self.torus = torus
+        offsets = GolARDense.neighbor_offsets(neighbors)
+        if isinstance(rules, str):
+            table = GolARDense.rulestring_table(rules, len(offsets))
+        elif isinstance(rules, np.ndarray):
+            table = rules
+        else:
+            table = GolARDense.rule_table(rules, len(offsets))
+        self.tiles = [(y0, min(y0 + tile_size, rows), x0, min(x0 + tile_size, cols))
+                      for y0 in range(0, rows, tile_size) for x0 in range(0, cols, tile_size)]
+        self.generation = 0
+        self._current = 0
+        # tile_timings[g][i] is the seconds tile i took to step from generation g to g+1
+        self.tile_timings = []
+
+        self._shm = shared_memory.SharedMemory(create=True, size=2 * rows * cols)
+        self._buffers = np.ndarray((2, rows, cols), dtype=np.uint8, buffer=self._shm.buf)
+        self._buffers[0] = GolARDense.to_grid(live_cells, cols, rows, origin)
+        if workers == 0:
+            # step tiles in this process, from this board's own state: handy for debugging and timing comparisons
+            self._pool = None
+            self._state = tile_state(self._buffers, table, offsets, torus)
+        else:
+            self._pool = Pool(workers, initializer=attach_worker, initargs=(self._shm.name, rows, cols, table, offsets, torus))
+            self._state = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        '''Shuts down the worker pool and releases the shared memory block.'''
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        if self._shm is not None:
+            self._buffers = None
+            self._state = None
+            self._shm.close()
+            self._shm.unlink()
+            self._shm = None
+
+    @property
+    def grid(self):
+        '''Returns a copy of the current generation as a rows-by-cols uint8 array.'''
+        return self._buffers[self._current].copy()
+
+    def live_cells(self):
+        '''Returns the set of live (x, y) cells in the current generation.'''
+        return GolARDense.to_live_cells(self._buffers[self._current], self.origin)
+
+    def step(self):
+        '''Advances the board one generation, recording each tile's step time.'''
+        tasks = [(i, self._current) + tile for i, tile in enumerate(self.tiles)]
+        if self._pool is None:
+            results = [step_tile(task, self._state) for task in tasks]
+        else:
+            results = self._pool.map(step_tile, tasks)
+        timings = [0.0] * len(self.tiles)
+        for tile_index, elapsed in results:
+            timings[tile_index] = elapsed
+        self.tile_timings.append(timings)
+        self._current = 1 - self._current
+        self.generation += 1
+
+    def advance(self, generations):
+        '''Advances the board by the specified number of generations.'''
+        for i in range(generations):
+            self.step()
+
+    def load_imbalance(self):
+        '''
+        Returns the ratio of the slowest tile's total step time to the mean tile's:
+        1.0 means perfectly balanced tiles.
+        '''
+        if not self.tile_timings:
+            return 1.0
+        totals = np.sum(self.tile_timings, axis=0)
+        mean = totals.mean()
+        return float(totals.max() / mean) if mean > 0 else 1.0
+
+
+if __name__ == '__main__':
+
+    import argparse
+
+    parser = argparse.ArgumentParser(description='Runs a random soup on a tiled, multi-process Game of Life torus.')
+    parser.add_argument('-s', '--size', type=int, default=2048, help='board width and height in cells')
+    parser.add_argument('-t', '--tile', type=int, default=DEFAULT_TILE_SIZE, help='tile width and height in cells')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='number of worker processes (0 = no pool)')
+    parser.add_argument('-g', '--generations', type=int, default=20, help='number of generations to run')
+    parser.add_argument('-r', '--rule', type=str, default='B3/S23', help='outer-totalistic rule string')
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(1234)
+    ys, xs = np.nonzero(rng.random((args.size, args.size)) < 0.3)
+    soup = set(zip(xs.tolist(), ys.tolist()))
+    with TiledLife(args.size, args.size, soup, rules=args.rule, torus=True, tile_size=args.tile, workers=args.workers) as board:
+        start = time.perf_counter()
+        board.advance(args.generations)
+        elapsed = time.perf_counter() - start
+        print('generations={0} seconds={1:.3f} tiles={2} imbalance={3:.2f} population={4}'.format(
+            args.generations, elapsed, len(board.tiles), board.load_imbalance(), len(board.live_cells())))
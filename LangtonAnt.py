@@ -10,24 +10,43 @@
 '''
 Langton's Ant program using Python 3 and Pygame
 This verison uses a toroidal grid.
+The ant itself is simulated by LangtonAntEngine; this module only draws it.
 
 This implementation by: Kevin Djang
 Developed using: Python 3.6.2 and PyGame 1.9.3
 Initial working version: 2017-10-14
 '''
 
+import argparse
 import sys
+import time
 import pygame
 
+from LangtonAntEngine import LangtonAntEngine
+
 # define colors
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 GRAY = (127, 127, 127)
 RED = (255, 0, 0)
+BLUE = (0, 0, 255)
+GREEN = (0, 160, 0)
+YELLOW = (255, 215, 0)
+CYAN = (0, 200, 200)
+MAGENTA = (200, 0, 200)
+ORANGE = (255, 140, 0)
 
 # Frame Rate (for Pygame engine)
 FRAMES_PER_SECOND = 15
 
+# Fraction of each frame's time that may be spent moving the ant, when the number of
+# steps per frame adapts to the frame rate: the rest is left for drawing and event handling.
+SIMULATION_BUDGET = 0.5
+# The most that the adaptive number of steps per frame may grow (or shrink) by in one frame
+MAX_STEPS_FACTOR = 2
+# With more changed cells than this in a frame, update the whole display instead of each cell's rectangle
+MAX_DIRTY_RECTS = 2000
+
 # Overall dimensions for display are based on the grid dimensions we want.
 # In turn, the grid dimensions depend on the dimensions of an indivitual cell,
 # plus its border width
@@ -40,33 +59,12 @@ WIDTH = (BORDER_WIDTH + CELL_WIDTH) * CELL_COLS + BORDER_WIDTH # in pixels
 HEIGHT = (BORDER_WIDTH + CELL_WIDTH) * CELL_ROWS + BORDER_WIDTH # in pixels
 SIZE = (WIDTH, HEIGHT)
 
-# Adjacent-cell functions: select the appropriate function by indexing
-# the list with the appropriate facing value:
-# 0 = above, 1 = right, 2 = below, 3 = left
-# The functions assume the grid surface they operate on is a torus:
-# column and row values wrap around at the "edges" of the grid.
-TORUS_ADJACENT = [
-    lambda xy: (xy[0], (xy[1] - 1) % CELL_ROWS), # above (or north)
-    lambda xy: ((xy[0] + 1) % CELL_COLS, xy[1]), # right (or east)
-    lambda xy: (xy[0], (xy[1] + 1) % CELL_ROWS), # below (or south)
-    lambda xy: ((xy[0] - 1) % CELL_COLS, xy[1])  # left  (or west)
-]
-FACINGS_COUNT = len(TORUS_ADJACENT)
+# Cell colors, indexed by the LangtonAntEngine cell color: 0 = white, 1 = black,
+# and so on for rules with more colors (repeating if there are more colors than these)
+STATE_COLORS = [WHITE, BLACK, BLUE, GREEN, YELLOW, CYAN, MAGENTA, ORANGE, GRAY]
 
 # ---- Functions
 
-def make_grid():
-    '''
-    Generates a grid with CELL_COLS columns and CEL_ROWS rows of cells,
-    and initializes each cell in the grid to its initial state.
-    '''
-    game_grid = [[WHITE for row in range(CELL_ROWS)] for col in range(CELL_COLS)]
-    return game_grid
-
-def move_ant(ant_location, facing):
-    '''Computes and returns new (row, col) ant_location based on specified ant_location and facing.'''
-    return TORUS_ADJACENT[facing](ant_location)
-
 def get_x_pixel(icol):
     '''
     Computes and returns the display x-coordinate for the upper-left corner of the cell
@@ -88,18 +86,46 @@ def get_cell_pixels(cell_location):
     '''
     return (get_x_pixel(cell_location[0]), get_y_pixel(cell_location[1]))
 
-def draw_grid(surface, grid):
+def get_display_size(cols, rows):
+    '''Returns the (width, height) in pixels of a display of cols-by-rows cells and their borders.'''
+    return ((BORDER_WIDTH + CELL_WIDTH) * cols + BORDER_WIDTH, (BORDER_WIDTH + CELL_WIDTH) * rows + BORDER_WIDTH)
+
+def get_state_color(state):
+    '''Returns the display color of the specified LangtonAntEngine cell color (state).'''
+    return STATE_COLORS[state % len(STATE_COLORS)]
+
+def draw_grid(surface, engine, cols=CELL_COLS, rows=CELL_ROWS):
     '''
-    Writes a grid of white cells bordered in gray onto the specified pygame Surface object.
+    Writes the cells of the specified LangtonAntEngine, bordered in gray, onto the specified pygame Surface object.
     Assumes surface dimensions will allow an integral number of CELL_WITH-by-CELL_WIDTH cells
     pluse border lines 1 pixel thick.
     '''
     surface.fill(GRAY)
-    for row in range(CELL_ROWS):
+    for row in range(rows):
         ypixel = get_y_pixel(row)
-        for col in range(CELL_COLS):
+        for col in range(cols):
             xpixel = get_x_pixel(col)
-            surface.blit(CELL_SURFACES[grid[col][row]], (xpixel, ypixel))
+            surface.blit(CELL_SURFACES[get_state_color(engine.state_at((col, row)))], (xpixel, ypixel))
+
+def draw_cells(surface, engine, cells):
+    '''
+    Writes the specified (col, row) cells of the specified LangtonAntEngine, and the ant, onto the
+    specified pygame Surface object.  Returns the list of display rectangles written.
+    '''
+    rects = [surface.blit(CELL_SURFACES[get_state_color(engine.state_at(cell))], get_cell_pixels(cell)) for cell in cells]
+    rects.append(surface.blit(RED_CELL, get_cell_pixels(engine.ant)))
+    return rects
+
+def adapt_steps(steps, elapsed, budget):
+    '''
+    Returns the number of steps per frame to run next, given that steps steps took elapsed seconds
+    and that they should take about budget seconds: never less than 1, and changed by
+    at most a factor of MAX_STEPS_FACTOR, so one slow frame cannot stall the display.
+    '''
+    if elapsed <= 0:
+        return steps * MAX_STEPS_FACTOR
+    target = int(steps * budget / elapsed)
+    return max(1, steps // MAX_STEPS_FACTOR, min(target, steps * MAX_STEPS_FACTOR))
 
 def get_cell_surface(cell_color):
     '''
@@ -117,6 +143,9 @@ CELL_SURFACES = {
     BLACK : BLACK_CELL,
     RED : RED_CELL
 }
+for color in STATE_COLORS:
+    if color not in CELL_SURFACES:
+        CELL_SURFACES[color] = get_cell_surface(color)
 
 # ----- Program Main
 
@@ -124,50 +153,52 @@ def main(argv):
     '''
     Langton's Ant Main Program: runs the langton's ant program in Pygame window
     until user closes the window.
+    Each frame runs a number of ant steps (fixed, or adapted to take SIMULATION_BUDGET
+    of the frame time), then redraws only the cells those steps changed.
     '''
 
-    ant_cell = (CELL_COLS // 2, CELL_ROWS //2) # Start at cell (x, y) near center of grid
-    ant_facing = 0  # 0 = N (up), 1 = E (right), 2 = S (down), 3 = W (left)
+    parser = argparse.ArgumentParser(description="Runs Langton's Ant in a Pygame window.")
+    parser.add_argument('-k', '--steps', type=int, default=0, help='ant steps per frame (0 adapts to the frame rate)')
+    parser.add_argument('-f', '--fps', type=int, default=FRAMES_PER_SECOND, help='frames per second')
+    parser.add_argument('-c', '--cols', type=int, default=CELL_COLS, help='grid columns')
+    parser.add_argument('-r', '--rows', type=int, default=CELL_ROWS, help='grid rows')
+    parser.add_argument('-u', '--rule', type=str, default='RL', help='the rule string, e.g. RL or LLRR')
+    args = parser.parse_args(argv[1:])
 
-    game_grid = make_grid()
+    # Start at cell (x, y) near center of grid, facing N (up)
+    engine = LangtonAntEngine(args.cols, args.rows, ant=(args.cols // 2, args.rows // 2), facing=0, rule=args.rule)
 
     pygame.init() # initialize game engine
     clock = pygame.time.Clock()
-    game_screen = pygame.display.set_mode(SIZE)
+    game_screen = pygame.display.set_mode(get_display_size(args.cols, args.rows))
     pygame.display.set_caption("Langton's Ant")
 
-    draw_grid(game_screen, game_grid)
-    game_screen.blit(RED_CELL, get_cell_pixels(ant_cell))
+    draw_grid(game_screen, engine, args.cols, args.rows)
+    game_screen.blit(RED_CELL, get_cell_pixels(engine.ant))
     pygame.display.flip()
 
+    steps_per_frame = args.steps if args.steps > 0 else 1
+    budget = SIMULATION_BUDGET / args.fps
     done = False
     while not done:
         for event in pygame.event.get():
             if event.type == pygame.QUIT:
                 done = True
-        # Move the ant
-        ant_col, ant_row = ant_cell
-        if game_grid[ant_col][ant_row] == WHITE:
-            # Turn 90 right, flip square, move forward\
-            ant_facing = (ant_facing + 1) % FACINGS_COUNT
-            game_grid[ant_col][ant_row] = BLACK
-            ant_cell = move_ant(ant_cell, ant_facing)
-        elif game_grid[ant_col][ant_row] == BLACK:
-            # Turn 90 right, flip square, move forward
-            ant_facing = (ant_facing - 1) % FACINGS_COUNT
-            game_grid[ant_col][ant_row] = WHITE
-            ant_cell = move_ant(ant_cell, ant_facing)
+        # Move the ant, recording the cells it changed (each step changes the cell it leaves)
+        start = time.perf_counter()
+        xs, ys, _ = engine.record(steps_per_frame)
+        elapsed = time.perf_counter() - start
+        # Update the display: only the changed cells and the ant, unless so many changed that one update is cheaper
+        rects = draw_cells(game_screen, engine, set(zip(xs, ys)))
+        if len(rects) > MAX_DIRTY_RECTS:
+            pygame.display.flip()
         else:
-            print("FAIL! Unknown cell value={0}".format(game_grid[ant_col][ant_row]))
-            done = True
-        # Update the display
-        # Important: At this point, ant_cell != (ant_col, ant_row) because ant_cell has moved.
-        # (ant_col, ant_row) == prior location, and ant_cell == new location.
-        game_screen.blit(CELL_SURFACES[game_grid[ant_col][ant_row]], get_cell_pixels((ant_col, ant_row)))
-        game_screen.blit(RED_CELL, get_cell_pixels(ant_cell))
-        pygame.display.flip()
-
-        clock.tick(FRAMES_PER_SECOND)
+            pygame.display.update(rects)
+        if args.steps <= 0:
+            steps_per_frame = adapt_steps(steps_per_frame, elapsed, budget)
+        pygame.display.set_caption("Langton's Ant: step {0}".format(engine.steps))
+
+        clock.tick(args.fps)
 
     # Be well-behaved
     pygame.quit()
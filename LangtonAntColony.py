@@ -0,0 +1,150 @@
+'''
+Many Langton's Ants (or turmites) on one toroidal grid, advanced together with NumPy.
+
+LangtonAntEngine steps one ant at a time.  LangtonAntColony keeps the positions, facings
+and states of hundreds of ants in NumPy arrays, and the grid as one uint8 array of cell
+colors, and advances every ant one step per tick with array operations.
+
+All ants act at once within a tick, so ants that are on the same cell need a conflict
+policy.  Both policies are deterministic: they order the ants sharing a cell by their
+index in the colony, so a colony built with the same seed (or the same explicit
+positions and facings) replays exactly.
+- 'each': the ants on a cell take their turns in index order, each reading the color
+  the previous one wrote, as if they had arrived one at a time;
+- 'once': every ant on a cell reads the color the cell had at the start of the tick,
+  and only the lowest-index ant writes to it.
+Either way, a colony of one ant follows exactly the same path as a LangtonAntEngine torus.
+'''
+
+import argparse
+import time
+
+import numpy as np
+
+from LangtonAntEngine import DEFAULT_RULE
+from LangtonAntEngine import FACING_DELTAS
+from LangtonAntEngine import FACINGS_COUNT
+from LangtonAntEngine import turmite_table
+
+CONFLICT_POLICIES = ('each', 'once')
+
+class LangtonAntColony:
+    '''
+    Contains the grid and the ants of a colony on a cols-by-rows torus, and the methods required to advance them.
+    The ants start on distinct cells chosen at random by seed, facing random directions,
+    unless positions (a sequence of (x, y) cells) and facings are specified.
+    '''
+
+    def __init__(self, cols, rows, ants=100, seed=None, rule=DEFAULT_RULE, conflict='each', positions=None, facings=None):
+        if conflict not in CONFLICT_POLICIES:
+            raise ValueError('Unknown conflict policy {0}: expected one of {1}'.format(conflict, CONFLICT_POLICIES))
+        if cols < 1 or rows < 1:
+            raise ValueError('Torus dimensions must be positive: cols={0} rows={1}'.format(cols, rows))
+        self.cols = cols
+        self.rows = rows
+        self.conflict = conflict
+        table = turmite_table(rule)
+        self.number_of_colors = len(table[0])
+        # rule lookups indexed by state * colors + color read
+        self._write = np.array([entry[0] for row in table for entry in row], dtype=np.uint8)
+        self._turn = np.array([entry[1] for row in table for entry in row], dtype=np.int8)
+        self._next_state = np.array([entry[2] for row in table for entry in row], dtype=np.int32)
+        self._dx = np.array([d[0] for d in FACING_DELTAS], dtype=np.int64)
+        self._dy = np.array([d[1] for d in FACING_DELTAS], dtype=np.int64)
+        rng = np.random.default_rng(seed)
+        if positions is None:
+            if ants > cols * rows:
+                raise ValueError('Cannot place {0} ants on distinct cells of a {1}x{2} grid'.format(ants, cols, rows))
+            flat = rng.choice(cols * rows, size=ants, replace=False)
+            self.x, self.y = flat % cols, flat // cols
+        else:
+            positions = np.array(positions, dtype=np.int64).reshape(-1, 2)
+            self.x, self.y = positions[:, 0] % cols, positions[:, 1] % rows
+        if facings is None:
+            self.facing = rng.integers(0, FACINGS_COUNT, size=len(self.x))
+        else:
+            self.facing = np.array(facings, dtype=np.int64) % FACINGS_COUNT
+            if len(self.facing) != len(self.x):
+                raise ValueError('Expected {0} facings, got {1}'.format(len(self.x), len(self.facing)))
+        self.state = np.zeros(len(self.x), dtype=np.int32)
+        self.grid = np.zeros((rows, cols), dtype=np.uint8)
+        self.ticks = 0
+
+    @property
+    def number_of_ants(self):
+        return len(self.x)
+
+    def _ranks(self, flat):
+        '''
+        Returns (order, rank): the ant indices sorted by cell (and by index within a cell),
+        and each sorted ant's position among the ants on its cell (0 for the lowest index).
+        '''
+        order = np.argsort(flat, kind='stable')
+        sorted_flat = flat[order]
+        starts = np.ones(len(flat), dtype=bool)
+        starts[1:] = sorted_flat[1:] != sorted_flat[:-1]
+        positions = np.arange(len(flat))
+        rank = positions - np.maximum.accumulate(np.where(starts, positions, 0))
+        return order, rank
+
+    def _act(self, ants, colors):
+        '''Turns the specified ants, and changes their states, for the colors they read; returns the colors they write.'''
+        i = self.state[ants] * self.number_of_colors + colors
+        self.facing[ants] = (self.facing[ants] + self._turn[i]) % FACINGS_COUNT
+        self.state[ants] = self._next_state[i]
+        return self._write[i]
+
+    def step(self):
+        '''Advances every ant one step: read, write and turn on its cell (per the conflict policy), then move.'''
+        grid = self.grid.reshape(-1)
+        flat = self.y * self.cols + self.x
+        order, rank = self._ranks(flat)
+        if self.conflict == 'each':
+            # one pass per rank: within a pass every ant is on a different cell
+            for r in range(rank.max() + 1 if len(rank) else 0):
+                ants = order[rank == r]
+                grid[flat[ants]] = self._act(ants, grid[flat[ants]])
+        else:
+            writes = self._act(order, grid[flat[order]])
+            first = rank == 0
+            grid[flat[order[first]]] = writes[first]
+        self.x = (self.x + self._dx[self.facing]) % self.cols
+        self.y = (self.y + self._dy[self.facing]) % self.rows
+        self.ticks += 1
+
+    def run(self, ticks):
+        '''Advances every ant ticks steps.'''
+        for _ in range(ticks):
+            self.step()
+
+    def ants(self):
+        '''Returns a list of every ant's (x, y, facing, state), in index order.'''
+        return list(zip(self.x.tolist(), self.y.tolist(), self.facing.tolist(), self.state.tolist()))
+
+    def population(self):
+        '''Returns the number of non-white cells.'''
+        return int(np.count_nonzero(self.grid))
+
+
+#----- default main runs a colony and reports its speed
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Runs a colony of Langton's Ants on a torus.")
+    parser.add_argument('-a', '--ants', type=int, default=500, help='the number of ants')
+    parser.add_argument('-c', '--cols', type=int, default=1024, help='torus columns')
+    parser.add_argument('-r', '--rows', type=int, default=1024, help='torus rows')
+    parser.add_argument('-n', '--ticks', type=int, default=10000, help='the number of ticks to run')
+    parser.add_argument('-u', '--rule', type=str, default=DEFAULT_RULE, help='the rule string, e.g. RL or LLRR')
+    parser.add_argument('-p', '--policy', type=str, default='each', choices=CONFLICT_POLICIES, help='the conflict policy')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed for a reproducible run')
+    args = parser.parse_args()
+
+    colony = LangtonAntColony(args.cols, args.rows, args.ants, args.seed, args.rule, args.policy)
+    start = time.perf_counter()
+    colony.run(args.ticks)
+    elapsed = time.perf_counter() - start
+    print('Ticks,{0}'.format(colony.ticks))
+    print('Seconds,{0:.3f}'.format(elapsed))
+    print('AntStepsPerSecond,{0:.0f}'.format(colony.ticks * colony.number_of_ants / elapsed))
+    print('ColoredCells,{0}'.format(colony.population()))
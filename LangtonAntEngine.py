@@ -0,0 +1,508 @@
+'''
+A headless Langton's Ant engine, split out of LangtonAnt.main so the ant can be run
+far past the highway phase (about 10,000 steps) without a display.
+
+Besides the classic two-color ant ("RL": turn right on white, left on black) the engine
+runs any turmite: an ant with its own internal state, whose rule table gives, for every
+(ant state, cell color) pair, the color to write, the turn to make and the next ant state.
+Rule strings such as "RLR" or "LLRR" are the one-state turmites that cycle each cell
+through the colors 0 .. n-1, turning as the letter of the color read says:
+L = left, R = right, N = no turn, U = U-turn.
+
+Cells are stored one byte per cell, as small integer colors (0 = white), in flat
+bytearrays, and the ant's position is a flat index into one of them.  The rule table is
+compiled into flat lists indexed by the ant's "control" (its facing and state, premultiplied
+by the number of colors) plus the color read, so each move is one table lookup each for
+the color written, the next control and the index delta.
+The engine has two modes:
+- unbounded (the default): the plane is divided into square tiles, allocated only when
+  the ant first enters them, so memory follows the cells visited (a highway costs a
+  diagonal line of tiles) rather than the area of their bounding box;
+- torus: a fixed cols-by-rows grid, held as one tile whose edges wrap around, as in LangtonAnt.main.
+The ant moves at most one cell per step, so when it is d cells away from the nearest edge of
+its tile the next d steps cannot leave the tile: run() steps in such safe stretches with no
+bounds checks at all, and only handles crossing to the next tile (or wrapping) between them.
+
+On an unbounded grid, advance() also watches for a highway (or, with no displacement, a cycle):
+it records a window of steps and looks for a period p over which the sequence of
+(control, color read) repeats, then proves that the repetition lasts forever (see
+find_highway) and jumps ahead any number of whole periods at once: the stripe the highway
+leaves behind is written in closed form, by tiling the cells each period leaves final along
+the displacement (see Highway), and the ant is moved there directly, instead of stepping each move.
+
+Coordinates are (x, y) with y increasing downward (south), matching the Pygame display;
+facings are 0 = N (up), 1 = E (right), 2 = S (down), 3 = W (left).
+'''
+
+import argparse
+import time
+from array import array
+
+FACINGS_COUNT = 4
+
+# (dx, dy) of a move in each facing: N, E, S, W
+FACING_DELTAS = ((0, -1), (1, 0), (0, 1), (-1, 0))
+
+# Turns, in quarter turns clockwise, named by the letters of rule strings
+TURN_LETTERS = {'L': -1, 'R': 1, 'N': 0, 'U': 2}
+
+DEFAULT_RULE = 'RL'
+DEFAULT_TILE_SIZE = 128
+DEFAULT_WINDOW = 4096
+
+def rule_string_table(rule):
+    '''
+    Returns the turmite table of rule string rule, e.g. 'RL' (Langton's Ant) or 'LLRR':
+    one ant state, in which color c is replaced by color c + 1 (mod len(rule))
+    and the ant turns as letter c of rule says.
+    '''
+    rule = rule.upper()
+    if not 2 <= len(rule) <= 256 or any(letter not in TURN_LETTERS for letter in rule):
+        raise ValueError('Bad rule string {0}: expected 2 to 256 of the letters {1}'.format(rule, ''.join(TURN_LETTERS)))
+    colors = len(rule)
+    return [[((color + 1) % colors, TURN_LETTERS[letter], 0) for color, letter in enumerate(rule)]]
+
+def turmite_table(rule):
+    '''
+    Returns rule as a validated turmite table: table[state][color] = (write_color, turn, next_state),
+    with turns as quarter turns clockwise.  rule may be a rule string, or a table whose turns are
+    letters of TURN_LETTERS or integers.
+    '''
+    if isinstance(rule, str):
+        return rule_string_table(rule)
+    states = len(rule)
+    colors = len(rule[0]) if states else 0
+    if states < 1 or not 1 <= colors <= 256:
+        raise ValueError('A turmite table needs at least one state and 1 to 256 colors')
+    table = []
+    for state, row in enumerate(rule):
+        if len(row) != colors:
+            raise ValueError('State {0} has {1} colors, expected {2}'.format(state, len(row), colors))
+        entries = []
+        for write, turn, next_state in row:
+            turn = TURN_LETTERS[turn.upper()] if isinstance(turn, str) else turn
+            if not (0 <= write < colors and 0 <= next_state < states):
+                raise ValueError('Bad turmite entry {0} in state {1}'.format((write, turn, next_state), state))
+            entries.append((write, turn % FACINGS_COUNT, next_state))
+        table.append(entries)
+    return table
+
+class Highway:
+    '''
+    A proven periodic motion of the ant: from the step numbered start on, every period steps
+    the ant returns to the same control, displaced by displacement = (dx, dy) (a cycle if (0, 0)),
+    having written the (dx, dy, color) cells relative to where the period began.
+
+    Periods overlap: a cell q a period writes is written again by the period m later if
+    q - m * displacement is also one of its cells.  The final_cells are those no later period
+    writes again, so after many periods the stripe behind the ant is final_cells tiled along
+    the displacement, each cell written once; only the last overlap_periods periods (at most)
+    leave cells that no later period covers.
+    '''
+
+    def __init__(self, start, period, displacement, cells):
+        self.start = start
+        self.period = period
+        self.displacement = displacement
+        self.cells = cells
+        dx, dy = displacement
+        offsets = {(qx, qy) for qx, qy, color in cells}
+        self.final_cells = []
+        self.overlap_periods = 0
+        if (dx, dy) != (0, 0):
+            span = max(max(abs(qx) for qx, qy in offsets), max(abs(qy) for qx, qy in offsets))
+            reach = 2 * span // max(abs(dx), abs(dy)) + 1
+            for qx, qy, color in cells:
+                covered = [m for m in range(1, reach + 1) if (qx - m * dx, qy - m * dy) in offsets]
+                if covered:
+                    self.overlap_periods = max(self.overlap_periods, max(covered))
+                else:
+                    self.final_cells.append((qx, qy, color))
+
+    def __repr__(self):
+        return 'Highway(start={0}, period={1}, displacement={2})'.format(self.start, self.period, self.displacement)
+
+class LangtonAntEngine:
+    '''
+    Contains the grid, the ant's position, facing and state, and the methods required to step the ant.
+    With cols and rows both None the grid is unbounded; otherwise it is a cols-by-rows torus.
+    rule is a rule string or turmite table (see turmite_table).
+    '''
+
+    def __init__(self, cols=None, rows=None, ant=(0, 0), facing=0, tile_size=DEFAULT_TILE_SIZE, rule=DEFAULT_RULE, state=0):
+        if (cols is None) != (rows is None):
+            raise ValueError('Specify both cols and rows for a torus, or neither for an unbounded grid')
+        self.torus = cols is not None
+        if self.torus:
+            if cols < 1 or rows < 1:
+                raise ValueError('Torus dimensions must be positive: cols={0} rows={1}'.format(cols, rows))
+            self._width, self._height = cols, rows
+        else:
+            self._width, self._height = tile_size, tile_size
+        self.table = turmite_table(rule)
+        self._compile()
+        # tiles maps each allocated tile's (column, row) key to its bytearray of cell colors
+        self._tiles = {}
+        self._enter(ant[0], ant[1])
+        self._control = self._control_of(facing % FACINGS_COUNT, state)
+        self.steps = 0
+        # the Highway found by advance, once one has been proven
+        self.highway = None
+
+    def _compile(self):
+        '''
+        Compiles the turmite table into flat lists indexed by control + color read, where
+        control = (facing * states + ant state) * colors: the color to write and the next control;
+        and a list indexed by control of the flat index delta of a move in its facing.
+        '''
+        self.number_of_states = len(self.table)
+        self.number_of_colors = len(self.table[0])
+        controls = FACINGS_COUNT * self.number_of_states
+        moves = (-self._width, 1, self._width, -1)
+        self._write = [0] * (controls * self.number_of_colors)
+        self._next = [0] * (controls * self.number_of_colors)
+        self._moves = [0] * (controls * self.number_of_colors)
+        for facing in range(FACINGS_COUNT):
+            for state, row in enumerate(self.table):
+                control = self._control_of(facing, state)
+                self._moves[control] = moves[facing]
+                for color, (write, turn, next_state) in enumerate(row):
+                    self._write[control + color] = write
+                    self._next[control + color] = self._control_of((facing + turn) % FACINGS_COUNT, next_state)
+
+    def _control_of(self, facing, state):
+        return (facing * self.number_of_states + state) * self.number_of_colors
+
+    @property
+    def facing(self):
+        '''The ant's facing: 0 = N, 1 = E, 2 = S, 3 = W.'''
+        return self._control // (self.number_of_states * self.number_of_colors)
+
+    @property
+    def state(self):
+        '''The ant's internal (turmite) state.'''
+        return self._control // self.number_of_colors % self.number_of_states
+
+    def _enter(self, x, y):
+        '''Places the ant on cell (x, y), allocating the tile containing it if need be.'''
+        self._key, self._pos = self._locate(x, y)
+        self._grid = self._tile(self._key)
+
+    def _locate(self, x, y):
+        '''Returns the (tile key, flat index) of cell (x, y).'''
+        if self.torus:
+            x, y = x % self._width, y % self._height
+        return (x // self._width, y // self._height), (y % self._height) * self._width + x % self._width
+
+    def _tile(self, key):
+        grid = self._tiles.get(key)
+        if grid is None:
+            grid = self._tiles[key] = bytearray(self._width * self._height)
+        return grid
+
+    @property
+    def ant(self):
+        '''The ant's (x, y) cell.'''
+        row, col = divmod(self._pos, self._width)
+        return (self._key[0] * self._width + col, self._key[1] * self._height + row)
+
+    def _edge_distance(self):
+        '''Returns how many cells the ant can move in any direction before leaving its tile.'''
+        row, col = divmod(self._pos, self._width)
+        return min(col, self._width - 1 - col, row, self._height - 1 - row)
+
+    def _step_at_edge(self):
+        '''Takes one step from a cell on the edge of the ant's tile, moving it to the next tile (or wrapping).'''
+        i = self._control + self._grid[self._pos]
+        self._grid[self._pos] = self._write[i]
+        self._control = self._next[i]
+        x, y = self.ant
+        dx, dy = FACING_DELTAS[self.facing]
+        self._enter(x + dx, y + dy)
+        return i
+
+    def _run_unchecked(self, steps):
+        '''Takes steps steps with no bounds checks: the caller guarantees the ant stays on the grid.'''
+        grid = self._grid
+        write = self._write
+        next_control = self._next
+        moves = self._moves
+        pos = self._pos
+        control = self._control
+        for _ in range(steps):
+            i = control + grid[pos]
+            grid[pos] = write[i]
+            control = next_control[i]
+            pos += moves[control]
+        self._pos = pos
+        self._control = control
+
+    def run(self, steps):
+        '''Moves the ant steps times.'''
+        remaining = steps
+        while remaining > 0:
+            safe = self._edge_distance()
+            if safe == 0:
+                self._step_at_edge()
+                remaining -= 1
+                self.steps += 1
+                continue
+            n = min(safe, remaining)
+            self._run_unchecked(n)
+            remaining -= n
+            self.steps += n
+
+    def step(self):
+        '''Moves the ant once.'''
+        self.run(1)
+
+    def record(self, steps):
+        '''
+        Moves the ant steps times like run, returning the trace of the moves:
+        (xs, ys, symbols) arrays of the cell each move started from and its control + color read.
+        '''
+        xs, ys, symbols = array('q'), array('q'), array('I')
+        write = self._write
+        next_control = self._next
+        moves = self._moves
+        remaining = steps
+        while remaining > 0:
+            safe = self._edge_distance()
+            if safe == 0:
+                x, y = self.ant
+                xs.append(x)
+                ys.append(y)
+                symbols.append(self._step_at_edge())
+                remaining -= 1
+                self.steps += 1
+                continue
+            n = min(safe, remaining)
+            grid = self._grid
+            pos = self._pos
+            control = self._control
+            positions = []
+            for _ in range(n):
+                i = control + grid[pos]
+                positions.append(pos)
+                symbols.append(i)
+                grid[pos] = write[i]
+                control = next_control[i]
+                pos += moves[control]
+            self._pos = pos
+            self._control = control
+            x0, y0 = self._key[0] * self._width, self._key[1] * self._height
+            xs.extend([x0 + p % self._width for p in positions])
+            ys.extend([y0 + p // self._width for p in positions])
+            remaining -= n
+            self.steps += n
+        return xs, ys, symbols
+
+    def find_highway(self, xs, ys, symbols):
+        '''
+        Looks for a highway (or cycle) ending with the trace (xs, ys, symbols) of the latest moves,
+        as returned by record.  Returns a Highway whose period begins now, or None.
+
+        A candidate period p is one over which the last two periods' (control, color read)
+        sequences are identical.  It is proven to repeat forever when every cell the next period
+        first reads is sure to hold the color period 0 first read there: for each such cell q
+        (relative to the period's start) the color comes from the last earlier period that
+        wrote q + r * displacement (which, for the smallest such r, is what period 0 wrote there),
+        or, until such a period, from the grid as it is now, which is white beyond the tiles allocated.
+        '''
+        if self.torus:
+            return None
+        packed = symbols.tobytes()
+        width = symbols.itemsize
+        for period in range(1, len(symbols) // 2 + 1):
+            if packed[-period * width:] != packed[-2 * period * width:-period * width]:
+                continue
+            highway = self._prove_highway(xs, ys, symbols, period)
+            if highway is not None:
+                return highway
+        return None
+
+    def _prove_highway(self, xs, ys, symbols, period):
+        '''Returns the Highway of the candidate period ending the trace, if it is proven, else None.'''
+        x0, y0 = xs[-period], ys[-period]
+        x1, y1 = self.ant
+        dx, dy = x1 - x0, y1 - y0
+        colors = self.number_of_colors
+        # the color first read from each cell visited in the last period, relative to its start
+        first_reads = {}
+        for x, y, i in zip(xs[-period:], ys[-period:], symbols[-period:]):
+            first_reads.setdefault((x - x0, y - y0), i % colors)
+        written = {q: self.state_at((x0 + q[0], y0 + q[1])) for q in first_reads}
+        keys = self._tiles.keys()
+        kxs, kys = [k[0] for k in keys], [k[1] for k in keys]
+        xmin, xmax = min(kxs) * self._width, (max(kxs) + 1) * self._width - 1
+        ymin, ymax = min(kys) * self._height, (max(kys) + 1) * self._height - 1
+        for (qx, qy), color in first_reads.items():
+            m = 1
+            while True:
+                cx, cy = qx + m * dx, qy + m * dy
+                if (cx, cy) in written:
+                    if written[(cx, cy)] != color:
+                        return None
+                    break
+                x, y = x0 + cx, y0 + cy
+                if not (xmin <= x <= xmax and ymin <= y <= ymax):
+                    if color != 0:
+                        return None
+                    break
+                if self.state_at((x, y)) != color:
+                    return None
+                m += 1
+        cells = [(qx, qy, color) for (qx, qy), color in written.items()]
+        return Highway(self.steps, period, (dx, dy), cells)
+
+    def _write_periods(self, x, y, first, stop, cells):
+        '''Writes the (dx, dy, color) cells of each of the periods first to stop - 1 after the one starting at (x, y).'''
+        if not cells:
+            return
+        dx, dy = self.highway.displacement
+        qxs, qys = [q[0] for q in cells], [q[1] for q in cells]
+        xlo, xhi, ylo, yhi = min(qxs), max(qxs), min(qys), max(qys)
+        # flat index offsets of the cells, for periods that fall within one tile
+        offsets = [(qy * self._width + qx, color) for qx, qy, color in cells]
+        for j in range(first, stop):
+            px, py = x + j * dx, y + j * dy
+            key, pos = self._locate(px, py)
+            row, col = divmod(pos, self._width)
+            if 0 <= col + xlo and col + xhi < self._width and 0 <= row + ylo and row + yhi < self._height:
+                grid = self._tile(key)
+                for offset, color in offsets:
+                    grid[pos + offset] = color
+            else:
+                for qx, qy, color in cells:
+                    key, pos = self._locate(px + qx, py + qy)
+                    self._tile(key)[pos] = color
+
+    def _tile_periods(self, x, y, stop, cells):
+        '''
+        Writes the (dx, dy, color) cells of each of the periods 0 to stop - 1 after the one starting at (x, y),
+        where no two of the cells written are the same cell (so the order of the writes does not matter).
+        Each cell offset traces a line along the displacement: the line is written a tile at a time,
+        by one extended slice assignment of its color with the flat stride of the displacement.
+        '''
+        dx, dy = self.highway.displacement
+        width, height = self._width, self._height
+        stride = abs(dy * width + dx)
+        for qx, qy, color in cells:
+            j = 0
+            while j < stop:
+                key, pos = self._locate(x + qx + j * dx, y + qy + j * dy)
+                row, col = divmod(pos, width)
+                # the periods from j on whose cell stays within this tile
+                n = stop - j
+                for position, d, size in ((col, dx, width), (row, dy, height)):
+                    if d > 0:
+                        n = min(n, (size - 1 - position) // d + 1)
+                    elif d < 0:
+                        n = min(n, position // -d + 1)
+                first = min(pos, pos + (n - 1) * (dy * width + dx))
+                self._tile(key)[first:first + (n - 1) * stride + 1:stride or 1] = bytes((color,)) * n
+                j += n
+
+    def _jump(self, periods):
+        '''
+        Moves the ant periods periods of its highway ahead, from the start of a period, in closed form:
+        the stripe is the highway's final_cells tiled along the displacement, each cell written once,
+        then the last overlap_periods periods are written whole (in order, as they overlap);
+        the ant's control is unchanged, and its position moves by periods displacements.
+        '''
+        highway = self.highway
+        dx, dy = highway.displacement
+        x, y = self.ant
+        if (dx, dy) != (0, 0):
+            tail = min(periods, highway.overlap_periods)
+            self._tile_periods(x, y, periods - tail, highway.final_cells)
+            self._write_periods(x, y, periods - tail, periods, highway.cells)
+        control = self._control
+        self._enter(x + periods * dx, y + periods * dy)
+        self._control = control
+        self.steps += periods * highway.period
+
+    def advance(self, steps, window=DEFAULT_WINDOW):
+        '''
+        Moves the ant steps times, like run, but on an unbounded grid watches for a highway or cycle
+        (by recording window steps at a time, with growing gaps between the attempts while none is found)
+        and, once one is proven, jumps ahead whole periods at a time.
+        '''
+        target = self.steps + steps
+        gap = 0
+        while self.highway is None and not self.torus and self.steps < target:
+            self.run(min(gap, target - self.steps))
+            if self.steps + window > target:
+                break
+            self.highway = self.find_highway(*self.record(window))
+            gap = min(2 * gap + window, 16 * window)
+        if self.highway is not None:
+            period = self.highway.period
+            # finish the current period, then jump over all the whole periods that remain
+            self.run(min((self.highway.start - self.steps) % period, target - self.steps))
+            self._jump((target - self.steps) // period)
+        self.run(target - self.steps)
+
+    def state_at(self, cell):
+        '''Returns the color of the specified (x, y) cell: 0 for white (and any cell never visited).'''
+        key, pos = self._locate(*cell)
+        grid = self._tiles.get(key)
+        return 0 if grid is None else grid[pos]
+
+    def cells(self):
+        '''Returns a dict mapping every non-white (x, y) cell to its color.'''
+        width, height = self._width, self._height
+        return {(kx * width + i % width, ky * height + i // width): s
+                for (kx, ky), grid in self._tiles.items() for i, s in enumerate(grid) if s}
+
+    def population(self):
+        '''Returns the number of non-white cells.'''
+        return sum(len(grid) - grid.count(0) for grid in self._tiles.values())
+
+    def bounding_box(self):
+        '''Returns (xmin, ymin, xmax, ymax) of the non-white cells and the ant, inclusive.'''
+        xs, ys = zip(self.ant, *self.cells())
+        return (min(xs), min(ys), max(xs), max(ys))
+
+    def to_text(self, colors='.#23456789', ant='A'):
+        '''
+        Returns the bounding box of the non-white cells and the ant as lines of text, north row first:
+        each cell is drawn as the character of colors indexed by its color, and the ant's cell as ant.
+        '''
+        xmin, ymin, xmax, ymax = self.bounding_box()
+        ant_cell = self.ant
+        return '\n'.join(
+            ''.join(ant if (x, y) == ant_cell else colors[self.state_at((x, y))] for x in range(xmin, xmax + 1))
+            for y in range(ymin, ymax + 1))
+
+
+#----- default main runs the ant headless and reports its speed
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Runs Langton's Ant (or another turmite) without a display.")
+    parser.add_argument('-n', '--steps', type=int, default=1000000, help='the number of steps to run')
+    parser.add_argument('-c', '--cols', type=int, default=None, help='torus columns (unbounded if omitted)')
+    parser.add_argument('-r', '--rows', type=int, default=None, help='torus rows (unbounded if omitted)')
+    parser.add_argument('-u', '--rule', type=str, default=DEFAULT_RULE, help='the rule string, e.g. RL or LLRR')
+    parser.add_argument('-x', '--extrapolate', action='store_true', help='jump ahead along a highway once one is found')
+    parser.add_argument('-t', '--text', action='store_true', help='print the final grid as text')
+    args = parser.parse_args()
+
+    engine = LangtonAntEngine(args.cols, args.rows, rule=args.rule)
+    start = time.perf_counter()
+    if args.extrapolate:
+        engine.advance(args.steps)
+    else:
+        engine.run(args.steps)
+    elapsed = time.perf_counter() - start
+    print('Steps,{0}'.format(engine.steps))
+    print('Seconds,{0:.3f}'.format(elapsed))
+    print('StepsPerSecond,{0:.0f}'.format(engine.steps / elapsed))
+    print('Ant,{0},{1}'.format(*engine.ant))
+    print('ColoredCells,{0}'.format(engine.population()))
+    print('BoundingBox,{0},{1},{2},{3}'.format(*engine.bounding_box()))
+    if engine.highway is not None:
+        print('Highway,{0},{1},{2},{3}'.format(engine.highway.start, engine.highway.period, *engine.highway.displacement))
+    if args.text:
+        print(engine.to_text())
@@ -0,0 +1,159 @@
+'''
+Plays many L-C-R games at once, for Monte Carlo studies that need millions of games.
+
+The scalar LcrEngine plays one game with one random.randrange per die.
+LcrBatchEngine keeps the state of thousands of games in NumPy arrays
+(one row of player tokens per game), resolves every game's turn with one random
+index into the scalar engine's die-outcome table, and retires finished games with
+a mask at the end of each round.
+It follows the same rules, in the same turn order, as LcrEngine
+(and LcrBatchEngineCenterVariant1 as LcrEngineCenterVariant1),
+so its outcome distributions match the scalar engines' statistically, though not game for game.
+'''
+
+import argparse
+
+import numpy as np
+
+from LcrEngine import LcrEngine
+from LcrEngine import LcrEngineCenterVariant1
+
+class LcrBatchEngine:
+    '''
+    Contains the data state and methods required to play a batch of LCR games side by side.
+    '''
+
+    MIN_PLAYER_COUNT = LcrEngine.MIN_PLAYER_COUNT
+    MAX_DICE = 3
+
+    # The scalar engine whose rules (die faces and compiled outcome table) this batch engine plays.
+    ENGINE_CLASS = LcrEngine
+
+    def __init__(self, players=3, games=1, seed=None):
+        if players < self.MIN_PLAYER_COUNT:
+            raise RuntimeError('Cannot init an LcrBatchEngine with < {0} players: players={1}'.format(self.MIN_PLAYER_COUNT, players))
+        self.number_of_players = players
+        self.number_of_games = games
+        self.rng = np.random.default_rng(seed)
+        # The rules come from the scalar engine's outcome table: for each number of dice,
+        # an array of (self, left, right, center, takes_center) rows indexed by outcome index.
+        table = self.ENGINE_CLASS(players).outcome_table()
+        self._outcomes = [None] + [np.array(table[d], dtype=np.int32) for d in range(1, self.MAX_DICE + 1)]
+        # Each player starts with three tokens, the center pot with zero.
+        self.tokens = np.full((games, players), 3, dtype=np.int32)
+        self.center = np.zeros(games, dtype=np.int32)
+        # Rounds played by each game, frozen once that game is over.
+        self.round = np.zeros(games, dtype=np.int32)
+        # Indices of the games still being played.
+        self.active = np.arange(games)
+
+    def play_a_round(self):
+        '''
+        Every player in every unfinished game takes a turn; then finished games are retired.
+        '''
+        games = self.active
+        tokens = self.tokens[games]
+        center = self.center[games]
+        for iplayer in range(self.number_of_players):
+            self.play_a_turn(iplayer, tokens, center)
+        self.tokens[games] = tokens
+        self.center[games] = center
+        self.round[games] += 1
+        still_playing = np.count_nonzero(tokens > 0, axis=1) > 1
+        self.active = games[still_playing]
+
+    def play_a_turn(self, player_index, tokens, center):
+        '''
+        Player player_index takes a turn in every game represented by the tokens and center arrays,
+        which are updated in place.  Each player rolls min(tokens, 3) dice, as one random outcome
+        index per game looked up in the outcome table; a player with zero tokens passes.
+        '''
+        dice = np.minimum(tokens[:, player_index], self.MAX_DICE)
+        outcome = np.zeros((len(dice), 5), dtype=np.int32)
+        for d in range(1, self.MAX_DICE + 1):
+            games = np.flatnonzero(dice == d)
+            table = self._outcomes[d]
+            outcome[games] = table[self.rng.integers(0, len(table), size=len(games))]
+        tokens[:, player_index] += outcome[:, 0]
+        tokens[:, (player_index - 1) % self.number_of_players] += outcome[:, 1]
+        tokens[:, (player_index + 1) % self.number_of_players] += outcome[:, 2]
+        center += outcome[:, 3]
+        takes_center = outcome[:, 4] == 1
+        tokens[takes_center, player_index] += center[takes_center]
+        center[takes_center] = 0
+
+    def game_over(self):
+        '''Returns True when every game in the batch is over.'''
+        return len(self.active) == 0
+
+    def play(self):
+        '''Plays every game in the batch to completion.'''
+        while not self.game_over():
+            self.play_a_round()
+
+    def winners(self):
+        '''
+        Returns each game's winning player index: the only player left with tokens,
+        or -1 if the game is unfinished or no player has tokens.
+        '''
+        has_tokens = self.tokens > 0
+        winners = np.where(np.count_nonzero(has_tokens, axis=1) == 1, np.argmax(has_tokens, axis=1), -1)
+        winners[self.active] = -1
+        return winners
+
+
+class LcrBatchEngineCenterVariant1(LcrBatchEngine):
+    '''
+    The batch counterpart of LcrEngineCenterVariant1:
+    when a player rolls all dots for a given turn, the player receives all
+    tokens currently in the center.
+    '''
+
+    ENGINE_CLASS = LcrEngineCenterVariant1
+
+
+BATCH_ENGINES = {'s': LcrBatchEngine, 'cv1': LcrBatchEngineCenterVariant1}
+
+def play_games(games, players=5, engine='s', seed=None, batch_size=100000):
+    '''
+    Plays games LCR games, batch_size games at a time, so memory stays bounded.
+    Returns (winner_counts, round_counts): winner_counts[i] is the number of games won by
+    player i, with games without a winner counted at index players;
+    round_counts[r] is the number of games that ended after r rounds.
+    '''
+    rng = np.random.default_rng(seed)
+    winner_counts = np.zeros(players + 1, dtype=np.int64)
+    round_counts = np.zeros(1, dtype=np.int64)
+    played = 0
+    while played < games:
+        batch = BATCH_ENGINES[engine](players=players, games=min(batch_size, games - played), seed=rng)
+        batch.play()
+        winners = batch.winners()
+        winner_counts += np.bincount(np.where(winners < 0, players, winners), minlength=players + 1)
+        rounds = np.bincount(batch.round)
+        if len(rounds) > len(round_counts):
+            round_counts = np.concatenate([round_counts, np.zeros(len(rounds) - len(round_counts), dtype=np.int64)])
+        round_counts[:len(rounds)] += rounds
+        played += batch.number_of_games
+    return winner_counts, round_counts
+
+
+#----- default main plays a batch of games with 5 players
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Plays many LCR games at once and summarizes the outcomes.')
+    parser.add_argument('-p', '--players', type=int, default=5, help='the number of players per game (must be > 1)')
+    parser.add_argument('-g', '--games', type=int, default=100000, help='the number of games to play')
+    parser.add_argument('-e', '--engine', type=str, default='s', choices=sorted(BATCH_ENGINES), help='the engine type to use to play the games')
+    parser.add_argument('-b', '--batch', type=int, default=100000, help='the number of games played side by side')
+    parser.add_argument('-s', '--seed', type=int, default=None, help='seed for a reproducible run')
+    args = parser.parse_args()
+
+    winner_counts, round_counts = play_games(args.games, args.players, args.engine, args.seed, args.batch)
+    print('Player,Wins,Fraction')
+    for i, wins in enumerate(winner_counts[:-1]):
+        print('{0},{1},{2:.6f}'.format(i, wins, wins / args.games))
+    print('None,{0},{1:.6f}'.format(winner_counts[-1], winner_counts[-1] / args.games))
+    mean_rounds = np.dot(np.arange(len(round_counts)), round_counts) / args.games
+    print('MeanRounds,{0:.4f}'.format(mean_rounds))
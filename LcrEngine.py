@@ -9,6 +9,34 @@ It requires no player strategy at all, and is thus simple to automate.
 
 import argparse
 import random
+import sys
+from functools import lru_cache
+from itertools import product
+
+MAX_DICE = 3
+
+@lru_cache(maxsize=None)
+def compile_outcome_table(faces, face_deltas, take_center_on_all=None):
+    '''
+    Compiles a variant's rules into a die-outcome lookup table.
+    faces is the tuple of die faces; face_deltas is a tuple of (face, (self, left, right, center))
+    token deltas per face; take_center_on_all is the face that, when every die shows it,
+    makes the player take the center pot (None for no such rule).
+    Returns a list indexed by dice count (1 to MAX_DICE) of lists indexed by outcome index,
+    where outcome index enumerates the len(faces) ** dice ordered rolls with the first die
+    most significant.  Each entry is the net (self, left, right, center) token delta of that roll,
+    plus whether the player then takes the center pot.
+    '''
+    deltas = dict(face_deltas)
+    table = [[]]
+    for dice in range(1, MAX_DICE + 1):
+        outcomes = []
+        for roll in product(faces, repeat=dice):
+            net = tuple(sum(component) for component in zip(*(deltas[face] for face in roll)))
+            takes_center = take_center_on_all is not None and all(face == take_center_on_all for face in roll)
+            outcomes.append(net + (takes_center,))
+        table.append(outcomes)
+    return table
 
 class LcrEngine:
     '''
@@ -17,7 +45,20 @@ class LcrEngine:
 
     MIN_PLAYER_COUNT = 2
 
-    def __init__(self, players=3):
+    # The rules, declared as the (self, left, right, center) token deltas of each die face.
+    # These are the only definition of what each face does: a house-rule variant changes them
+    # (and self.faces), and the outcome table is compiled from them.
+    FACE_DELTAS = {
+        'Dot' : (0, 0, 0, 0),
+        'Left' : (-1, 1, 0, 0),
+        'Right' : (-1, 0, 1, 0),
+        'Center' : (-1, 0, 0, 1)
+    }
+    # The face that, when a player's dice all come up on it, gives the player every token in the center
+    # (None: no face does).
+    TAKE_CENTER_ON_ALL = None
+
+    def __init__(self, players=3, rng=None):
         if players < self.MIN_PLAYER_COUNT:
             raise RuntimeError('Cannot init an LcrEngine with < {0} players: players={1}'.format(self.MIN_PLAYER_COUNT, players))
         self.number_of_players = players
@@ -28,15 +69,13 @@ class LcrEngine:
         # Zero rounds have been played
         # A round has been play after every player has had a turn
         self.round = int(0)
+        # Dice are rolled with the global random module unless an independent
+        # random.Random stream is supplied (e.g. one per worker process).
+        self.rng = random if rng is None else rng
         # Set the faces of a six-sided game die
         self.faces = ['Dot', 'Left', 'Dot', 'Right', 'Dot', 'Center']
-        # Configure a dispatcher mapping an action for each possible die face.
-        self.roll_action = { 
-            'Dot' : self.do_dot, 
-            'Left' : self.do_left, 
-            'Right' : self.do_right, 
-            'Center' : self.do_center 
-        }
+        # The die-outcome table is compiled on first use, from the faces in effect then.
+        self._outcome_table = None
 
     def csv_header_string(self):
         hdrlist = ['Round', 'Center']
@@ -62,26 +101,42 @@ class LcrEngine:
     def play_a_turn(self, player_index):
         '''
         A player takes a turn by rolling 1 to 3 die, depending on the number of tokens the player has.
-        Each die rolled is resolved, and then the player's turn is over.
+        The dice are resolved together, by looking up their net effect in the outcome table,
+        and then the player's turn is over.
         A player with zero tokens simply passes their turn -- they may be able to play in future rounds
         if they receive tokens from adjacent players during those player's turns.
         '''
         player_tokens = self.tokens[player_index]
         if player_tokens > 0:
             player_dice = player_tokens if player_tokens < 4 else 3
-            player_rolls = [self.roll() for i in range(player_dice)]
-            for r in player_rolls:
-                self.roll_action[r](player_index)
+            outcome = self.outcome_table()[player_dice][self.roll_index(player_dice)]
+            self.do_outcome(player_index, outcome)
+
+    def outcome_table(self):
+        '''Returns this engine's die-outcome table (see compile_outcome_table).'''
+        if self._outcome_table is None:
+            face_deltas = tuple(sorted(self.FACE_DELTAS.items()))
+            self._outcome_table = compile_outcome_table(tuple(self.faces), face_deltas, self.TAKE_CENTER_ON_ALL)
+        return self._outcome_table
 
     # Ordinarily, letting random default-initialize via the system clock is fine.
     # The set_seed method provides and API-explicit way to "lock" on to a prng sequence
     # for unit-testing of the LcrEngine.
     
     def set_seed(self, a=1234):
-        random.seed(a=a)
+        self.rng.seed(a=a)
 
-    def roll(self):
-        return self.faces[random.randrange(len(self.faces))]
+    def roll_index(self, dice):
+        '''
+        Rolls dice dice and returns the outcome index of the roll (see compile_outcome_table).
+        Each die is still drawn with its own randrange, so a seeded game plays out exactly
+        as it did when every die was resolved one at a time.
+        '''
+        number_of_faces = len(self.faces)
+        index = 0
+        for i in range(dice):
+            index = index * number_of_faces + self.rng.randrange(number_of_faces)
+        return index
     
     def number_of_players_with_tokens(self):
         return sum(1 for player_tokens in self.tokens if player_tokens > 0)
@@ -89,35 +144,31 @@ class LcrEngine:
     def game_over(self):
         return self.number_of_players_with_tokens() <= 1
 
-    def do_dot(self, player_index):
-        '''Do nothing when a die roll results in a dot.'''
-        pass
-
-    def do_left(self, player_index):
+    def winner(self):
         '''
-        When a die roll results in a left, transfer one token from player_index
-        to the player to the left.
+        Returns the index of the only player with tokens once the game is over,
+        or None if the game is not over or no player has any tokens left.
         '''
-        player_left = (player_index - 1) % self.number_of_players
-        self.tokens[player_left] += 1
-        self.tokens[player_index] -= 1
-    
-    def do_right(self, player_index):
-        '''
-        When a die roll results in a right, transfer one token from player_index
-        to the player to the right.
-        '''
-        player_right = (player_index + 1) % self.number_of_players
-        self.tokens[player_right] += 1
-        self.tokens[player_index] -= 1
+        holders = [i for i, player_tokens in enumerate(self.tokens) if player_tokens > 0]
+        return holders[0] if len(holders) == 1 else None
 
-    def do_center(self, player_index):
+    def do_outcome(self, player_index, outcome):
         '''
-        When a die roll results in a center, transfer one token from player_index
-        to the center.
+        Applies one entry of the outcome table -- the net effect of all of a turn's dice --
+        for player_index.
         '''
-        self.center += 1
-        self.tokens[player_index] -= 1
+        delta_self, delta_left, delta_right, delta_center, takes_center = outcome
+        self.tokens[player_index] += delta_self
+        self.tokens[(player_index - 1) % self.number_of_players] += delta_left
+        self.tokens[(player_index + 1) % self.number_of_players] += delta_right
+        self.center += delta_center
+        if takes_center:
+            self.do_take_center(player_index)
+
+    def do_take_center(self, player_index):
+        '''Transfer all tokens in the center to player_index.'''
+        self.tokens[player_index] += self.center
+        self.center = 0
 
 
 class LcrEngineCenterVariant1(LcrEngine):
@@ -126,30 +177,18 @@ class LcrEngineCenterVariant1(LcrEngine):
     When a player rolls all dots for a given turn, the player receives all
     tokens currently in the center.
     '''
-    
-    def __init__(self, players=3):
-        super(LcrEngineCenterVariant1, self).__init__(players)
 
-    def play_a_turn(self, player_index):
-        '''
-        A player takes a turn by rolling 1 to 3 die, depending on the number of tokens the player has.
-        Each die rolled is resolved, and then the player's turn is over.
-        A player with zero tokens simply passes their turn -- they may be able to play in future rounds
-        if they receive tokens from adjacent players during those player's turns.
-        '''
-        player_tokens = self.tokens[player_index]
-        if player_tokens > 0:
-            player_dice = player_tokens if player_tokens < 4 else 3
-            player_rolls = [self.roll() for i in range(player_dice)]
-            for r in player_rolls:
-                self.roll_action[r](player_index)
-            if player_rolls.count('Dot') == player_dice:
-                self.do_take_center(player_index)
+    TAKE_CENTER_ON_ALL = 'Dot'
+
+    def __init__(self, players=3, rng=None):
+        super(LcrEngineCenterVariant1, self).__init__(players, rng)
 
-    def do_take_center(self, player_index):
-        self.tokens[player_index] += self.center
-        self.center = 0
 
+# Engine types selectable by name, e.g. from the command-line.
+ENGINES = {
+    's' : LcrEngine,
+    'cv1' : LcrEngineCenterVariant1
+}
 
 #----- default main plays a game with 5 players
 
@@ -158,16 +197,27 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Plays the LCR game.')
     parser.add_argument('-p', '--players', type=int, default=5, help='the number of players per game (must be > 1)')
     parser.add_argument('-g', '--games', type=int, default=1, help='the number of games to play')
-    parser.add_argument('-e', '--engine', type=str, default='s', choices={'s', 'cv1'}, help='the engine type to use to play the game')
+    parser.add_argument('-e', '--engine', type=str, default='s', choices=sorted(ENGINES), help='the engine type to use to play the game')
+    parser.add_argument('-o', '--output', type=str, default=None, help='write every round of every game to this file instead of printing')
+    parser.add_argument('-f', '--format', type=str, default='csv', choices=('csv', 'npy', 'bin'), help='the --output file format')
+    parser.add_argument('-a', '--append', action='store_true', help='append to the --output file instead of replacing it')
     args = parser.parse_args()
 
+    if args.output:
+        # Buffered bulk output of the full per-round history (imported here: it needs NumPy).
+        from LcrOutput import LcrRoundWriter
+        with LcrRoundWriter(args.output, args.players, args.format, append=args.append) as writer:
+            for games_played in range(args.games):
+                lcr = ENGINES[args.engine](players=args.players)
+                writer.record(lcr, games_played)
+                while not lcr.game_over():
+                    lcr.play_a_round()
+                    writer.record(lcr, games_played)
+        sys.exit(0)
+
     for games_played in range(args.games):
 
-        # default engine assignment ...
-        lcr = LcrEngine(players=args.players)
-        # ... possibly changed by user command-line selection
-        if args.engine == 'cv1':
-            lcr = LcrEngineCenterVariant1(players=args.players)
+        lcr = ENGINES[args.engine](players=args.players)
 
         if args.games == 1:
             print(lcr.csv_header_string())
@@ -0,0 +1,222 @@
+'''
+Solves small L-C-R games exactly, as an absorbing Markov chain, instead of simulating them.
+
+A game's state is the token count of every player plus the center pot; the total number
+of tokens (3 per player) never changes, so for a handful of players the state space is
+small enough to enumerate: every way of dividing the tokens among the players and the center.
+Each player's turn is a sparse transition matrix over those states, built from the
+engine's die-outcome table (LcrEngine.outcome_table), so any declaratively defined
+variant is solved from its own rules.
+
+LcrEngine checks game_over at the end of each round, so the chain is taken a round at a time:
+the round matrix R is the product of the turn matrices, Q is R between unfinished (transient)
+states, and b_k is the probability of a round ending in a finished state with outcome k (a
+winning seat, or no winner).  The win probabilities x_k and the expected number of rounds t
+from every transient state solve the linear systems (I - Q) x_k = b_k and (I - Q) t = 1.
+R itself is far denser than the turns (thousands of entries per row for 5 players), so it is
+never formed: it is applied as the turn matrices in turn, and the systems are solved by GMRES,
+which converges in a few dozen of those products.  This needs scipy (scipy.sparse).
+
+The distribution of game lengths is optional (rounds_distribution): it propagates the
+probability of every state forward a round at a time, until little enough is unfinished.
+'''
+
+import argparse
+from collections import Counter
+from itertools import combinations
+from math import comb
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.linalg import LinearOperator
+from scipy.sparse.linalg import gmres
+
+from LcrEngine import ENGINES
+from LcrEngine import MAX_DICE
+
+STARTING_TOKENS = 3
+
+def turn_outcomes(outcomes):
+    '''
+    Collapses one dice count's row of an outcome table (equally likely ordered rolls)
+    into a list of its distinct (self, left, right, center, takes_center, probability) tuples.
+    '''
+    tally = Counter(outcomes)
+    return [key + (count / len(outcomes),) for key, count in sorted(tally.items())]
+
+def enumerate_states(players):
+    '''
+    Returns an (n, players + 1) int array of every way to divide players * 3 tokens
+    among the players (columns 0 .. players-1) and the center (column players).
+    '''
+    total = STARTING_TOKENS * players
+    parts = players + 1
+    states = np.empty((comb(total + parts - 1, parts - 1), parts), dtype=np.int64)
+    # stars and bars: choose where the parts-1 bars go among total+parts-1 slots
+    for i, bars in enumerate(combinations(range(total + parts - 1), parts - 1)):
+        previous = -1
+        for j, bar in enumerate(bars):
+            states[i, j] = bar - previous - 1
+            previous = bar
+        states[i, parts - 1] = total + parts - 2 - previous
+    return states
+
+class LcrMarkovResult:
+    '''Exact outcome probabilities of an LCR game, as computed by solve.'''
+
+    def __init__(self, players, win_probabilities, no_winner_probability, expected_rounds, rounds_distribution=None, unresolved_probability=0.0):
+        self.number_of_players = players
+        # win_probabilities[i] is the probability that player i wins
+        self.win_probabilities = win_probabilities
+        # probability that the game ends with no player holding tokens
+        self.no_winner_probability = no_winner_probability
+        # mean number of rounds a game lasts
+        self.expected_rounds = expected_rounds
+        # rounds_distribution[r] is the probability that the game lasts exactly r rounds (None unless asked for)
+        self.rounds_distribution = rounds_distribution
+        # probability of games still unfinished when the rounds distribution stopped
+        self.unresolved_probability = unresolved_probability
+
+class LcrMarkovSolver:
+    '''
+    Builds the per-turn transition matrices of an LCR game from an LcrEngine's outcome table.
+    '''
+
+    def __init__(self, lcr):
+        self.number_of_players = lcr.number_of_players
+        self.outcome_table = lcr.outcome_table()
+        self.states = enumerate_states(self.number_of_players)
+        # states are located by a mixed-radix key of their token counts
+        self._radix = STARTING_TOKENS * self.number_of_players + 1
+        self._weights = self._radix ** np.arange(self.number_of_players + 1)
+        self._keys = self.states @ self._weights
+        self._order = np.argsort(self._keys)
+        self._sorted_keys = self._keys[self._order]
+        self.turns = [self._turn_matrix(i) for i in range(self.number_of_players)]
+        holders = np.count_nonzero(self.states[:, :self.number_of_players] > 0, axis=1)
+        self.game_over = holders <= 1
+        # the seat holding tokens in each finished state, or players if no one does
+        has_tokens = self.states[:, :self.number_of_players] > 0
+        self.winner = np.where(holders == 1, np.argmax(has_tokens, axis=1), self.number_of_players)
+        self.transient = np.flatnonzero(~self.game_over)
+        self.start = self.index_of(np.append(np.full(self.number_of_players, STARTING_TOKENS), 0)[np.newaxis, :])[0]
+
+    def index_of(self, states):
+        '''Returns the row indices in self.states of the specified (n, players + 1) states.'''
+        keys = states @ self._weights
+        return self._order[np.searchsorted(self._sorted_keys, keys)]
+
+    def _turn_matrix(self, player_index):
+        '''
+        Returns the sparse transition matrix of player_index's turn, as a CSR matrix whose
+        entry [src, dst] is the probability of going from state src to state dst.
+        A player with no tokens passes, which leaves the state unchanged.
+        '''
+        players = self.number_of_players
+        left_index = (player_index - 1) % players
+        right_index = (player_index + 1) % players
+        dice = np.minimum(self.states[:, player_index], MAX_DICE)
+        sources = [np.flatnonzero(dice == 0)]
+        destinations = [sources[0]]
+        probabilities = [np.ones(len(sources[0]))]
+        for d in range(1, MAX_DICE + 1):
+            rows = np.flatnonzero(dice == d)
+            for delta_self, left, right, center, takes_center, probability in turn_outcomes(self.outcome_table[d]):
+                after = self.states[rows].copy()
+                after[:, player_index] += delta_self
+                after[:, left_index] += left
+                after[:, right_index] += right
+                after[:, players] += center
+                if takes_center:
+                    after[:, player_index] += after[:, players]
+                    after[:, players] = 0
+                sources.append(rows)
+                destinations.append(self.index_of(after))
+                probabilities.append(np.full(len(rows), probability))
+        n = len(self.states)
+        return csr_matrix((np.concatenate(probabilities), (np.concatenate(sources), np.concatenate(destinations))), shape=(n, n))
+
+    def round_values(self, values):
+        '''
+        Returns R @ values, for the round matrix R (the product of the turn matrices): for each state,
+        the expected value after one round of values (an array with a row per state).
+        '''
+        for turn in reversed(self.turns):
+            values = turn @ values
+        return values
+
+    def _solve_transient(self, b, tolerance):
+        '''Returns the solution x, over the transient states, of (I - Q) x = b, by GMRES to within tolerance relative to b.'''
+        n = len(self.states)
+        def matvec(x):
+            values = np.zeros(n)
+            values[self.transient] = x.ravel()
+            return x.ravel() - self.round_values(values)[self.transient]
+        system = LinearOperator((len(self.transient), len(self.transient)), matvec=matvec, dtype=float)
+        x, info = gmres(system, b, rtol=tolerance, atol=0.0, restart=100, maxiter=100)
+        if info:
+            raise RuntimeError('Cannot solve the LCR chain for {0} players to within {1}: GMRES stopped after {2} iterations'.format(self.number_of_players, tolerance, info))
+        return x
+
+    def solve(self, tolerance=1e-12, rounds_distribution=False, max_rounds=100000):
+        '''
+        Solves the chain from its starting state, returning an LcrMarkovResult: each seat's win probability,
+        the probability of no winner and the expected number of rounds, to within tolerance (relative).
+        If rounds_distribution is True, the distribution of game lengths is computed too (see rounds_distribution).
+        '''
+        players = self.number_of_players
+        # finished[s, k] is 1 if state s is a finished game with outcome k (a winning seat, or players for no winner)
+        over = np.flatnonzero(self.game_over)
+        finished = np.zeros((len(self.states), players + 1))
+        finished[over, self.winner[over]] = 1.0
+        b = self.round_values(finished)[self.transient]
+        start = np.searchsorted(self.transient, self.start)
+        wins = [self._solve_transient(b[:, k], tolerance)[start] for k in range(players + 1)]
+        expected_rounds = self._solve_transient(np.ones(len(self.transient)), tolerance)[start]
+        distribution, unresolved = self.rounds_distribution(tolerance, max_rounds) if rounds_distribution else (None, 0.0)
+        return LcrMarkovResult(players, wins[:players], wins[players], expected_rounds, distribution, unresolved)
+
+    def rounds_distribution(self, tolerance=1e-12, max_rounds=100000):
+        '''
+        Propagates the game from its starting state a round at a time until less than tolerance
+        probability remains unfinished (or max_rounds rounds pass), returning (distribution, unresolved):
+        distribution[r] is the probability that the game lasts exactly r rounds, and unresolved the rest.
+        '''
+        mass = np.zeros(len(self.states))
+        mass[self.start] = 1.0
+        distribution = [0.0]
+        over = np.flatnonzero(self.game_over)
+        while mass.sum() > tolerance and len(distribution) <= max_rounds:
+            for turn in self.turns:
+                mass = turn.T @ mass
+            distribution.append(mass[over].sum())
+            mass[over] = 0.0
+        return distribution, mass.sum()
+
+def solve(players=3, engine='s', tolerance=1e-12, rounds_distribution=False):
+    '''Solves an LCR game with the specified number of players and engine type exactly.'''
+    return LcrMarkovSolver(ENGINES[engine](players=players)).solve(tolerance, rounds_distribution)
+
+
+#----- default main solves a game with 5 players
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Computes exact LCR outcome probabilities.')
+    parser.add_argument('-p', '--players', type=int, default=5, help='the number of players per game (must be > 1)')
+    parser.add_argument('-e', '--engine', type=str, default='s', choices=sorted(ENGINES), help='the engine type whose rules to solve')
+    parser.add_argument('-t', '--tolerance', type=float, default=1e-12, help='the relative tolerance of the solve (and the unfinished probability at which --rounds stops)')
+    parser.add_argument('-r', '--rounds', action='store_true', help='also print the distribution of game lengths')
+    args = parser.parse_args()
+
+    result = solve(args.players, args.engine, args.tolerance, args.rounds)
+    print('Player,WinProbability')
+    for i, p in enumerate(result.win_probabilities):
+        print('{0},{1:.10f}'.format(i, p))
+    print('None,{0:.10f}'.format(result.no_winner_probability))
+    print('ExpectedRounds,{0:.10f}'.format(result.expected_rounds))
+    if args.rounds:
+        print('Rounds,Probability')
+        for r, p in enumerate(result.rounds_distribution):
+            print('{0},{1:.3e}'.format(r, p))
+        print('Unresolved,{0:.3e}'.format(result.unresolved_probability))
@@ -0,0 +1,149 @@
+'''
+Buffered, columnar output of per-round LcrEngine states.
+
+Formatting a csv_state_string and printing it every round dominates the run time of
+long LCR runs.  LcrRoundWriter instead copies each round's state (game, round, center,
+and every player's tokens) into a preallocated integer array and writes the array out
+in bulk whenever it fills, so a run of any length holds only one chunk in memory.
+
+Supported formats:
+- 'csv': the same columns as the LcrEngine command-line output, with a header line;
+- 'npy': a NumPy .npy file of int32 rows (readable with numpy.load, including mmap_mode);
+- 'bin': headerless little-endian int32 rows, players + 3 columns wide.
+Every format can be appended to (a missing file is created): an existing 'csv' file must
+have the same header line, and an existing 'npy' file must
+have been written by LcrRoundWriter (or have the same int32 layout and 128-byte preamble),
+because the row count in its header is updated in place.  The header is rewritten after
+every chunk, so a writer that is interrupted leaves a valid file of the rows flushed so far.
+'''
+
+import ast
+import os
+
+import numpy as np
+
+DTYPE = np.dtype('<i4')
+DEFAULT_CHUNK_ROWS = 1 << 16
+FORMATS = ('csv', 'npy', 'bin')
+
+# .npy preamble reserved by LcrRoundWriter: magic string, version, header length, padded header
+NPY_MAGIC = b'\x93NUMPY\x01\x00'
+NPY_PREAMBLE_BYTES = 128
+
+def column_names(players):
+    return ['Game', 'Round', 'Center'] + ['Player{0}'.format(i) for i in range(players)]
+
+def npy_header(rows, columns):
+    '''Returns a .npy version 1.0 preamble for a rows-by-columns int32 array, padded to NPY_PREAMBLE_BYTES.'''
+    header = "{{'descr': '{0}', 'fortran_order': False, 'shape': ({1}, {2}), }}".format(DTYPE.str, rows, columns)
+    header_bytes = NPY_PREAMBLE_BYTES - len(NPY_MAGIC) - 2
+    header = header.ljust(header_bytes - 1) + '\n'
+    return NPY_MAGIC + header_bytes.to_bytes(2, 'little') + header.encode('latin1')
+
+def read_npy_header(fp):
+    '''Returns (rows, columns) from a .npy preamble written by npy_header.'''
+    preamble = fp.read(NPY_PREAMBLE_BYTES)
+    if len(preamble) != NPY_PREAMBLE_BYTES or not preamble.startswith(NPY_MAGIC) or \
+            int.from_bytes(preamble[8:10], 'little') != NPY_PREAMBLE_BYTES - 10:
+        raise ValueError('Cannot append: not an .npy file written by LcrRoundWriter')
+    header = ast.literal_eval(preamble[10:].decode('latin1'))
+    if np.dtype(header['descr']) != DTYPE or header['fortran_order'] or len(header['shape']) != 2:
+        raise ValueError('Cannot append: unexpected .npy layout {0}'.format(header))
+    return header['shape']
+
+class LcrRoundWriter:
+    '''
+    Writes per-round LcrEngine states to path in the specified format, chunk_rows rows at a time.
+    Use as a context manager, or call close(), so the last partial chunk is written.
+    '''
+
+    def __init__(self, path, players, fmt='csv', chunk_rows=DEFAULT_CHUNK_ROWS, append=False):
+        if fmt not in FORMATS:
+            raise ValueError('Unknown format {0}: expected one of {1}'.format(fmt, FORMATS))
+        self.path = path
+        self.number_of_players = players
+        self.format = fmt
+        self.columns = players + 3
+        self.rows_written = 0
+        self._buffer = np.zeros((chunk_rows, self.columns), dtype=DTYPE)
+        self._count = 0
+        # appending to a missing (or empty) .npy file starts a new one, as the other formats do
+        append_npy = append and fmt == 'npy' and os.path.exists(path) and os.path.getsize(path) > 0
+        if fmt == 'npy':
+            # the header is rewritten in place, which a file opened to append cannot do
+            mode = 'r+b' if append_npy else 'wb'
+        else:
+            mode = 'ab' if append else 'wb'
+        header = ','.join(column_names(players))
+        if fmt == 'csv' and append and os.path.exists(path) and os.path.getsize(path) > 0:
+            with open(path, 'rb') as fp:
+                existing = fp.readline().decode('ascii', 'replace').rstrip('\r\n')
+            if existing != header:
+                raise ValueError('Cannot append: CSV header {0} does not match {1}'.format(existing, header))
+        self._fp = open(path, mode)
+        if fmt == 'npy':
+            if append_npy:
+                try:
+                    self.rows_written, columns = read_npy_header(self._fp)
+                    if columns != self.columns:
+                        raise ValueError('Cannot append {0} columns to {1} columns'.format(self.columns, columns))
+                except ValueError:
+                    self._fp.close()
+                    raise
+                self._fp.seek(0, 2)
+            else:
+                self._fp.write(npy_header(0, self.columns))
+        elif fmt == 'csv' and self._fp.tell() == 0:
+            self._fp.write((header + '\n').encode('ascii'))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def record(self, lcr, game=0):
+        '''Copies the current state of LcrEngine lcr, as a row for game game, into the buffer.'''
+        row = self._buffer[self._count]
+        row[0] = game
+        row[1] = lcr.round
+        row[2] = lcr.center
+        row[3:] = lcr.tokens
+        self._count += 1
+        if self._count == len(self._buffer):
+            self.flush()
+
+    def flush(self):
+        '''Writes the buffered rows to the file.'''
+        rows = self._buffer[:self._count]
+        if self.format == 'csv':
+            np.savetxt(self._fp, rows, fmt='%d', delimiter=',')
+        else:
+            rows.tofile(self._fp)
+        self.rows_written += self._count
+        self._count = 0
+        if self.format == 'npy':
+            self._write_npy_header()
+
+    def _write_npy_header(self):
+        '''Rewrites the .npy header with the rows written so far, and returns to the end of the file.'''
+        self._fp.seek(0)
+        self._fp.write(npy_header(self.rows_written, self.columns))
+        self._fp.seek(0, 2)
+        self._fp.flush()
+
+    def close(self):
+        '''Writes any buffered rows, updates the .npy row count, and closes the file.'''
+        if self._fp is None:
+            return
+        self.flush()
+        self._fp.close()
+        self._fp = None
+
+def read_rounds(path, players, fmt='csv'):
+    '''Reads a file written by LcrRoundWriter back into a rows-by-(players + 3) array.'''
+    if fmt == 'csv':
+        return np.loadtxt(path, dtype=DTYPE, delimiter=',', skiprows=1, ndmin=2)
+    if fmt == 'npy':
+        return np.load(path, mmap_mode='r')
+    return np.fromfile(path, dtype=DTYPE).reshape(-1, players + 3)
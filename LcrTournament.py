@@ -0,0 +1,131 @@
+'''
+Plays a reproducible LCR tournament across a pool of worker processes.
+
+LcrEngine.set_seed reseeds the global random module, which makes seeded games
+impossible to run in parallel.  Instead, the tournament is cut into fixed-size chunks
+of games, and each chunk plays with its own random.Random stream whose seed is derived
+from the master seed and the chunk's index.  Chunks do not depend on which worker plays
+them, or in what order, and their results are integer counts merged by addition,
+so a tournament's results are bit-identical for any number of workers.
+
+Workers send back only aggregated counts (wins per seat and a histogram of rounds
+to finish) rather than per-round CSV lines.
+'''
+
+import argparse
+import hashlib
+import random
+from collections import Counter
+from multiprocessing import Pool
+
+from LcrEngine import ENGINES
+
+DEFAULT_CHUNK_SIZE = 1000
+
+def chunk_seed(master_seed, chunk_index):
+    '''Derives the independent seed of chunk chunk_index from master_seed.'''
+    digest = hashlib.sha256('{0}:{1}'.format(master_seed, chunk_index).encode('ascii')).digest()
+    return int.from_bytes(digest[:16], 'big')
+
+class TournamentResult:
+    '''
+    Aggregated outcome of some number of games:
+    wins[i] counts games won by player i, with games that ended with no player
+    holding tokens counted in wins[players]; rounds[r] counts games that lasted r rounds.
+    '''
+
+    def __init__(self, players):
+        self.games = 0
+        self.wins = [0] * (players + 1)
+        self.rounds = Counter()
+
+    def add_game(self, lcr):
+        winner = lcr.winner()
+        self.wins[winner if winner is not None else lcr.number_of_players] += 1
+        self.rounds[lcr.round] += 1
+        self.games += 1
+
+    def copy(self):
+        '''Returns an independent TournamentResult with the same counts.'''
+        other = TournamentResult(len(self.wins) - 1)
+        other.merge(self)
+        return other
+
+    def merge(self, other):
+        self.games += other.games
+        self.wins = [a + b for a, b in zip(self.wins, other.wins)]
+        self.rounds.update(other.rounds)
+
+    def mean_rounds(self):
+        return sum(r * n for r, n in self.rounds.items()) / self.games if self.games else 0.0
+
+    def __eq__(self, other):
+        return (self.games, self.wins, self.rounds) == (other.games, other.wins, other.rounds)
+
+    def __repr__(self):
+        return 'TournamentResult(games={0}, wins={1}, rounds={2})'.format(self.games, self.wins, dict(sorted(self.rounds.items())))
+
+def play_chunk(task):
+    '''
+    Plays one chunk of games; task is (engine, players, master_seed, chunk_index, games).
+    Returns (chunk_index, TournamentResult).
+    '''
+    engine, players, master_seed, chunk_index, games = task
+    rng = random.Random(chunk_seed(master_seed, chunk_index))
+    result = TournamentResult(players)
+    for game in range(games):
+        lcr = ENGINES[engine](players=players, rng=rng)
+        while not lcr.game_over():
+            lcr.play_a_round()
+        result.add_game(lcr)
+    return chunk_index, result
+
+def run_tournament(games, players=5, engine='s', master_seed=1234, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''
+    Generator: plays games games of LCR over a pool of workers (None = one per CPU,
+    0 = in this process), yielding a snapshot of the running TournamentResult each time a chunk
+    completes (each its own object, unchanged by later chunks).  The last result yielded covers the whole tournament.
+    '''
+    tasks = [(engine, players, master_seed, chunk_index, min(chunk_size, games - first_game))
+             for chunk_index, first_game in enumerate(range(0, games, chunk_size))]
+    total = TournamentResult(players)
+    if workers == 0:
+        for task in tasks:
+            chunk_index, result = play_chunk(task)
+            total.merge(result)
+            yield total.copy()
+        return
+    with Pool(workers) as pool:
+        for chunk_index, result in pool.imap_unordered(play_chunk, tasks):
+            total.merge(result)
+            yield total.copy()
+
+def tournament(games, players=5, engine='s', master_seed=1234, workers=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    '''Plays a whole tournament and returns its TournamentResult.'''
+    total = TournamentResult(players)
+    for total in run_tournament(games, players, engine, master_seed, workers, chunk_size):
+        pass
+    return total
+
+
+#----- default main plays a 5-player tournament
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description='Plays a reproducible LCR tournament in parallel.')
+    parser.add_argument('-p', '--players', type=int, default=5, help='the number of players per game (must be > 1)')
+    parser.add_argument('-g', '--games', type=int, default=10000, help='the number of games to play')
+    parser.add_argument('-e', '--engine', type=str, default='s', choices=sorted(ENGINES), help='the engine type to use to play the games')
+    parser.add_argument('-s', '--seed', type=int, default=1234, help='the master seed')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='the number of worker processes (0 = no pool)')
+    parser.add_argument('-c', '--chunk', type=int, default=DEFAULT_CHUNK_SIZE, help='the number of games per chunk')
+    args = parser.parse_args()
+
+    result = tournament(args.games, args.players, args.engine, args.seed, args.workers, args.chunk)
+    print('Player,Wins')
+    for i, wins in enumerate(result.wins[:-1]):
+        print('{0},{1}'.format(i, wins))
+    print('None,{0}'.format(result.wins[-1]))
+    print('Rounds,Games')
+    for r in sorted(result.rounds):
+        print('{0},{1}'.format(r, result.rounds[r]))
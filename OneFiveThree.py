@@ -17,10 +17,31 @@ def integer_to_digits(i):
     (This implementation is from Dr. Peter Drake, via email on 2016-3-06.)"""
     return [i] if i < 10 else integer_to_digits(i // 10) + [i % 10]
 
-def cube_sum(i):
-    """Return the sum of the cubes of the digits of the specified integer."""
+def cube_sum_by_digits(i):
+    """Return the sum of the cubes of the digits of the specified integer,
+    from the list of its digits (the original implementation of cube_sum)."""
     return sum([i ** 3 for i in integer_to_digits(i)])
 
+# Sums of the cubes of the digits of every block of BLOCK_DIGITS digits (leading zeros add nothing).
+BLOCK_DIGITS = 4
+BLOCK_SIZE = 10 ** BLOCK_DIGITS
+BLOCK_CUBE_SUMS = [0] * BLOCK_SIZE
+for block in range(1, BLOCK_SIZE):
+    BLOCK_CUBE_SUMS[block] = BLOCK_CUBE_SUMS[block // 10] + (block % 10) ** 3
+
+def cube_sum(i):
+    """Return the sum of the cubes of the digits of the specified integer.
+    The digits are taken BLOCK_DIGITS at a time, each block's sum looked up in BLOCK_CUBE_SUMS,
+    so any int, however large, needs no recursion or lists.
+    (As with cube_sum_by_digits, a negative integer is its own single "digit".)"""
+    if i < 0:
+        return i ** 3
+    total = 0
+    while i >= BLOCK_SIZE:
+        i, block = divmod(i, BLOCK_SIZE)
+        total += BLOCK_CUBE_SUMS[block]
+    return total + BLOCK_CUBE_SUMS[i]
+
 def chain_153(i):
     """Return a list containing the sequence of integers chaining from the specified integer
     to 153, or a single element consisting of the specified integer itself if it does not
@@ -0,0 +1,143 @@
+"""
+Batch processing of OneFiveThree's 153 chains over whole [start, stop) ranges.
+
+OneFiveThree.chain_153 builds each chain by recursion, one number at a time.  Every chain
+is only long at its start, though: the digit-cube sum of any number below 10**18 is at
+most 18 * 9**3, and the sums of numbers that small stay below it.  So the length of every
+chain from a number up to TABLE_SIZE is computed once into the LENGTHS table, and the
+chain length of any number n (below 10**18) is then a single lookup:
+1 + LENGTHS[cube_sum(n)], or 1 if n does not form a 153 chain.
+
+Only positive multiples of 3 form chains, so a range is processed as NumPy arrays of its
+multiples of 3, chunk_size at a time, with the digit-cube sums taken a block of digits at
+a time for a whole chunk (looked up in OneFiveThree's BLOCK_CUBE_SUMS table).  Memory stays bounded by chunk_size however large the range,
+and the results are either summary statistics or whole chunks of chains written at once.
+"""
+
+import argparse
+import sys
+
+import numpy as np
+
+from OneFiveThree import BLOCK_CUBE_SUMS
+from OneFiveThree import BLOCK_SIZE
+from OneFiveThree import cube_sum
+
+BLOCK_CUBES = np.array(BLOCK_CUBE_SUMS, dtype=np.int64)
+
+# numbers below 10**18 (and a chunk past them) fit in int64, and their digit-cube sums are at most 18 * 9**3
+MAX_NUMBER = 10 ** 18 - 1
+TABLE_SIZE = 18 * 9 ** 3 + 1
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+def chain_length_table(size):
+    """Return an array of the chain_153 length of every integer in [0, size).
+    The digit-cube sums of the integers in the table must also be in the table."""
+    lengths = np.zeros(size, dtype=np.int64)
+    for i in range(size):
+        # follow the chain until it ends or reaches a known length, then fill in the lengths back along it
+        chain = []
+        j = i
+        while lengths[j] == 0 and j > 0 and j != 153 and j % 3 == 0:
+            chain.append(j)
+            j = cube_sum(j)
+        known = lengths[j] if lengths[j] else 1
+        for k in reversed(chain):
+            known += 1
+            lengths[k] = known
+        lengths[j] = lengths[j] or 1
+    return lengths
+
+LENGTHS = chain_length_table(TABLE_SIZE)
+
+def cube_sums(numbers):
+    """Return an array of the sums of the cubes of the digits of each of an array of non-negative integers."""
+    numbers = np.array(numbers, dtype=np.int64)
+    sums = np.zeros_like(numbers)
+    while numbers.any():
+        numbers, blocks = np.divmod(numbers, BLOCK_SIZE)
+        sums += BLOCK_CUBES[blocks]
+    return sums
+
+def chain_lengths(numbers):
+    """Return an array of the chain_153 length of each of an array of integers up to MAX_NUMBER."""
+    numbers = np.asarray(numbers, dtype=np.int64)
+    chained = (numbers > 0) & (numbers % 3 == 0) & (numbers != 153)
+    return np.where(chained, 1 + LENGTHS[cube_sums(np.where(chained, numbers, 0))], 1)
+
+def multiples_of_3(start, stop, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Generator: yields arrays of the positive multiples of 3 in the [start, stop) range,
+    in order, at most chunk_size at a time."""
+    if stop - 1 > MAX_NUMBER:
+        raise ValueError('Batch ranges must stop at or below {0}: stop={1}'.format(MAX_NUMBER + 1, stop))
+    first = max(3, start + (-start) % 3)
+    for chunk_start in range(first, stop, 3 * chunk_size):
+        yield np.arange(chunk_start, min(stop, chunk_start + 3 * chunk_size), 3, dtype=np.int64)
+
+def summarize_range(start, stop, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Return a dict of the summary statistics of the 153 chains from the numbers in the [start, stop) range:
+    the count of numbers, the count forming valid chains, the counts of chains of each length (a list,
+    indexed by length), the longest chain length, and the first number with a chain that long."""
+    histogram = np.zeros(0, dtype=np.int64)
+    longest = 0
+    longest_number = None
+    for numbers in multiples_of_3(start, stop, chunk_size):
+        lengths = chain_lengths(numbers)
+        counts = np.bincount(lengths)
+        if len(counts) > len(histogram):
+            histogram = np.concatenate([histogram, np.zeros(len(counts) - len(histogram), dtype=np.int64)])
+        histogram[:len(counts)] += counts
+        i = int(lengths.argmax())
+        if lengths[i] > longest:
+            longest = int(lengths[i])
+            longest_number = int(numbers[i])
+    return {
+        'numbers': max(0, stop - start),
+        'valid': int(histogram.sum()),
+        'length_counts': histogram.tolist(),
+        'longest': longest,
+        'longest_number': longest_number,
+    }
+
+def chain_texts():
+    """Return a list, indexed by the integers in [0, TABLE_SIZE), of their valid 153 chains as text,
+    one number per line (an empty string for integers that do not form a valid chain)."""
+    texts = [''] * TABLE_SIZE
+    texts[153] = '153\n'
+    for i in np.argsort(LENGTHS, kind='stable').tolist():
+        if i > 0 and i % 3 == 0 and i != 153:
+            texts[i] = '{0}\n'.format(i) + texts[cube_sum(i)]
+    return texts
+
+def write_range_valid(f, start, stop, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Writes to file f the same lines OneFiveThree.chain_rangeValid prints for the [start, stop) range,
+    one whole chunk of chains per write."""
+    texts = chain_texts()
+    for numbers in multiples_of_3(start, stop, chunk_size):
+        sums = cube_sums(numbers)
+        f.write(''.join(texts[n] if n == 153 else '{0}\n'.format(n) + texts[s]
+                        for n, s in zip(numbers.tolist(), sums.tolist())))
+
+
+#----- default main prints the summary statistics of a range (or its valid chains, like OneFiveThree)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Finds the 153 chains of a range of integers in batches.")
+    parser.add_argument('start', type=int, help='the first integer of the range')
+    parser.add_argument('stop', type=int, help='the integer after the last of the range')
+    parser.add_argument('-c', '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='the multiples of 3 processed per batch')
+    parser.add_argument('-w', '--write-chains', action='store_true', help='write the valid chains, one number per line, instead of a summary')
+    args = parser.parse_args()
+
+    if args.write_chains:
+        write_range_valid(sys.stdout, args.start, args.stop, args.chunk_size)
+    else:
+        summary = summarize_range(args.start, args.stop, args.chunk_size)
+        print('Numbers,{0}'.format(summary['numbers']))
+        print('Valid,{0}'.format(summary['valid']))
+        print('Longest,{0},{1}'.format(summary['longest'], summary['longest_number']))
+        for length, count in enumerate(summary['length_counts']):
+            if count:
+                print('Length,{0},{1}'.format(length, count))
@@ -0,0 +1,41 @@
+"""
+Benchmarks OneFiveThree.cube_sum (digit blocks looked up in BLOCK_CUBE_SUMS) against
+cube_sum_by_digits (the original, from the integer_to_digits list of digits),
+over random integers of several sizes.
+"""
+
+import argparse
+import random
+import timeit
+
+from OneFiveThree import cube_sum
+from OneFiveThree import cube_sum_by_digits
+
+def benchmark(function, numbers, repeat=5):
+    """Return the best time, in seconds, over repeat runs, for function to be called once on each of numbers."""
+    return min(timeit.repeat(lambda: [function(i) for i in numbers], number=1, repeat=repeat))
+
+def compare(digit_counts, count=10000, repeat=5, seed=153):
+    """Generator: yields (digits, by_digits_seconds, table_seconds) for count random integers
+    of each number of digits in digit_counts, after checking the two implementations agree."""
+    rng = random.Random(seed)
+    for digits in digit_counts:
+        numbers = [rng.randrange(10 ** (digits - 1), 10 ** digits) for _ in range(count)]
+        if [cube_sum(i) for i in numbers] != [cube_sum_by_digits(i) for i in numbers]:
+            raise AssertionError('cube_sum and cube_sum_by_digits differ on {0}-digit integers'.format(digits))
+        yield digits, benchmark(cube_sum_by_digits, numbers, repeat), benchmark(cube_sum, numbers, repeat)
+
+
+#----- default main prints a CSV table of the timings
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmarks the OneFiveThree cube_sum implementations.")
+    parser.add_argument('-d', '--digits', type=int, nargs='+', default=[3, 6, 9, 18, 50, 200], help='the integer sizes, in digits')
+    parser.add_argument('-n', '--count', type=int, default=10000, help='the integers timed per size')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='the runs per timing (the best is reported)')
+    args = parser.parse_args()
+
+    print('Digits,ByDigitsSeconds,TableSeconds,Speedup')
+    for digits, by_digits, table in compare(args.digits, args.count, args.repeat):
+        print('{0},{1:.4f},{2:.4f},{3:.1f}'.format(digits, by_digits, table, by_digits / table))
@@ -0,0 +1,137 @@
+'''
+Palindrome-permutation checks for many strings at once, and an index of strings by parity mask.
+
+Palindromes.is_palindrome_permutation builds a set of the characters that appear an odd
+number of times in one string.  That set can equally be kept as a bit mask: the XOR of
+one bit per character.  A string is permutable into a palindrome when its mask has at
+most one bit set, and two strings together are when the XOR of their masks does.
+
+For ASCII strings the mask has 128 bits, kept as two uint64 halves (lo for characters 0-63,
+hi for 64-127), so a whole batch of strings is concatenated into one byte array and the
+masks of every string come from one XOR-reduction per half.  Strings that are not ASCII
+fall back to an exact Python int mask with bit ord(c) for each character c.
+bytes work the same way, byte by byte: a NumPy 'S' array is read straight from its buffer,
+and a list of bytes is joined without decoding.
+As in Palindromes, the check is case-sensitive and counts every character, and None or
+'' is a palindrome permutation.
+'''
+
+from itertools import compress
+
+import numpy as np
+
+ONE = np.uint64(1)
+
+def _code(c):
+    '''Returns the code of c, a str character or a byte (an int, from iterating over bytes).'''
+    return c if isinstance(c, int) else ord(c)
+
+def parity_mask(s):
+    '''Returns the parity mask of s as an int: bit ord(c) is set if character (or byte) c appears in s an odd number of times.'''
+    mask = 0
+    for c in s or '':
+        mask ^= 1 << _code(c)
+    return mask
+
+def has_one_bit_at_most(mask):
+    '''Returns True if the int mask has at most one bit set.'''
+    return mask & (mask - 1) == 0
+
+def ascii_parity_masks(strings):
+    '''
+    Returns (lo, hi, is_ascii): uint64 arrays of the low and high halves of the parity mask of each of strings,
+    and a bool array of which strings are ASCII (the masks of the others are left 0).
+    '''
+    if isinstance(strings, np.ndarray) and strings.dtype.kind == 'S':
+        return _bytes_array_parity_masks(strings)
+    strings = list(strings)
+    # the strings are all str or all bytes: the first that is not None says which
+    is_bytes = next((isinstance(s, (bytes, bytearray)) for s in strings if s is not None), False)
+    empty = b'' if is_bytes else ''
+    if None in strings:
+        strings = [empty if s is None else s for s in strings]
+    lengths = np.fromiter(map(len, strings), dtype=np.int64, count=len(strings))
+    joined = empty.join(strings)
+    if joined.isascii():
+        is_ascii = np.ones(len(strings), dtype=bool)
+    else:
+        is_ascii = np.fromiter((s.isascii() for s in strings), dtype=bool, count=len(strings))
+        lengths[~is_ascii] = 0
+        joined = empty.join(compress(strings, is_ascii.tolist()))
+    lo = np.zeros(len(strings), dtype=np.uint64)
+    hi = np.zeros(len(strings), dtype=np.uint64)
+    codes = np.frombuffer(joined if is_bytes else joined.encode('ascii'), dtype=np.uint8)
+    if len(codes):
+        bits = ONE << (codes & 63).astype(np.uint64)
+        high = codes >= 64
+        # reduceat needs a start for each non-empty string only: an empty segment would return its next element
+        nonempty = lengths > 0
+        starts = (np.cumsum(lengths) - lengths)[nonempty]
+        lo[nonempty] = np.bitwise_xor.reduceat(np.where(high, np.uint64(0), bits), starts)
+        hi[nonempty] = np.bitwise_xor.reduceat(np.where(high, bits, np.uint64(0)), starts)
+    return lo, hi, is_ascii
+
+def _bytes_array_parity_masks(strings):
+    '''Returns (lo, hi, is_ascii) as ascii_parity_masks does, for a 1-D NumPy 'S' (bytes) array, from its buffer.'''
+    strings = np.ascontiguousarray(strings)
+    codes = strings.view(np.uint8).reshape(len(strings), strings.dtype.itemsize)
+    is_ascii = (codes < 128).all(axis=1)
+    # 'S' items are padded with zero bytes after their lengths
+    in_string = np.arange(codes.shape[1]) < np.char.str_len(strings)[:, None]
+    bits = ONE << (codes & 63).astype(np.uint64)
+    high = codes >= 64
+    lo = np.bitwise_xor.reduce(np.where(in_string & ~high, bits, np.uint64(0)), axis=1)
+    hi = np.bitwise_xor.reduce(np.where(in_string & high, bits, np.uint64(0)), axis=1)
+    lo[~is_ascii] = 0
+    hi[~is_ascii] = 0
+    return lo, hi, is_ascii
+
+def _as_sequence(strings):
+    '''Returns strings as a list, unless it is already a NumPy array.'''
+    return strings if isinstance(strings, np.ndarray) else list(strings)
+
+def parity_masks(strings):
+    '''Returns a list of the parity mask of each of strings, as ints (computed in bulk for the ASCII strings).'''
+    strings = _as_sequence(strings)
+    lo, hi, is_ascii = ascii_parity_masks(strings)
+    return [(h << 64) | l if a else parity_mask(s)
+            for s, l, h, a in zip(strings, lo.tolist(), hi.tolist(), is_ascii.tolist())]
+
+def is_palindrome_permutations(strings):
+    '''Returns a bool array: for each of strings (str or bytes), whether it is permutable into a palindrome.'''
+    strings = _as_sequence(strings)
+    lo, hi, is_ascii = ascii_parity_masks(strings)
+    result = ((lo == 0) & (hi & (hi - ONE) == 0)) | ((hi == 0) & (lo & (lo - ONE) == 0))
+    for i in np.flatnonzero(~is_ascii).tolist():
+        result[i] = has_one_bit_at_most(parity_mask(strings[i]))
+    return result
+
+class PalindromePartnerIndex:
+    '''
+    An index of strings by parity mask, for finding which strings can be combined into a palindrome.
+    Strings s and t can be (s + t is permutable into a palindrome) when their masks are equal,
+    or differ in one character: so the partners of s are the strings indexed under mask(s), or under
+    mask(s) with one bit flipped for any character of s or of the index, each a dict lookup.
+    '''
+
+    def __init__(self, strings):
+        self.strings = list(strings)
+        self.groups = {}
+        for i, mask in enumerate(parity_masks(self.strings)):
+            self.groups.setdefault(mask, []).append(i)
+        self.characters = {c for s in self.strings if s for c in s}
+
+    def partners(self, s):
+        '''Returns the sorted indices of the indexed strings t for which s + t is permutable into a palindrome.'''
+        mask = parity_mask(s)
+        found = list(self.groups.get(mask, []))
+        for c in self.characters.union(s or ''):
+            found.extend(self.groups.get(mask ^ (1 << _code(c)), []))
+        return sorted(found)
+
+    def pairs(self):
+        '''Generator: yields every pair of indices (i, j), i < j, of indexed strings that can be combined into a palindrome.'''
+        for i, s in enumerate(self.strings):
+            for j in self.partners(s):
+                if i < j:
+                    yield i, j
@@ -0,0 +1,181 @@
+'''
+Linear-time palindrome checks, and a streaming scanner for palindromes in large text files.
+
+Palindromes.is_palindrome recurses on s[1:-1] slices (copying O(n^2) characters, and
+overflowing the recursion limit after a few thousand), and is_palindrome_iter also slices.
+Here is_palindrome walks two indices in from the ends of s without copying anything, so
+it works on any sequence: str, bytes, bytearray, memoryview or list.
+
+With normalize=True, case is ignored and anything that is not a letter or a digit is
+skipped, so "A man, a plan, a canal: Panama!" is a palindrome.  For str elements this
+uses str.isalnum and str.lower; for bytes-like sequences (whose elements are ints) it
+uses the ASCII letters and digits only.
+
+longest_palindrome finds the longest palindromic substring with Manacher's algorithm,
+in time linear in the length of the sequence.  The file scanners memory-map the file
+and yield their results one line (record) at a time, so only the current line is ever
+copied out of the file.
+'''
+
+import argparse
+import mmap
+import os
+
+# For bytes-like sequences: the lowercase of each ASCII letter or digit byte, and None for every other byte.
+ASCII_FOLD = [ord(chr(b).lower()) if b < 128 and chr(b).isalnum() else None for b in range(256)]
+
+def _fold(c):
+    '''Returns the normalized form of c, a str character or a byte (int); None if c is to be skipped.'''
+    if isinstance(c, int):
+        return ASCII_FOLD[c]
+    return c.lower() if c.isalnum() else None
+
+def normalized(s):
+    '''Returns a list of the normalized elements of s, and a list of their indices in s.'''
+    elements = []
+    indices = []
+    for i, c in enumerate(s):
+        folded = _fold(c)
+        if folded is not None:
+            elements.append(folded)
+            indices.append(i)
+    return elements, indices
+
+def is_palindrome(s, normalize=False):
+    '''
+    Determines whether s is a palindromic sequence, comparing elements from both ends inward in place.
+    An s of None, or of fewer than two elements, is a palindrome.
+    If normalize is True, case is ignored and elements that are not letters or digits are skipped.
+    returns True if s is a palindrome, False otherwise.
+    '''
+    if not s:
+        return True
+    i = 0
+    j = len(s) - 1
+    if not normalize:
+        while i < j:
+            if s[i] != s[j]:
+                return False
+            i += 1
+            j -= 1
+        return True
+    while i < j:
+        a = _fold(s[i])
+        if a is None:
+            i += 1
+            continue
+        b = _fold(s[j])
+        if b is None:
+            j -= 1
+            continue
+        if a != b:
+            return False
+        i += 1
+        j -= 1
+    return True
+
+def manacher(s):
+    '''
+    Returns the palindrome radii of the sequence s (Manacher's algorithm, in linear time):
+    a list of 2 * len(s) + 1 lengths, where entry k is the length of the longest palindrome
+    centered on element k // 2 of s (k odd) or between elements k // 2 - 1 and k // 2 (k even).
+    '''
+    n = 2 * len(s) + 1
+    radii = [0] * n
+    center = right = 0
+    for k in range(n):
+        # mirror the palindrome around the rightmost one found so far, then extend it
+        r = min(radii[2 * center - k], right - k) if k < right else 0
+        # positions k - r - 1 and k + r + 1 hold elements of s only when they are odd
+        while k - r - 1 >= 0 and k + r + 1 < n and ((k - r - 1) % 2 == 0 or s[(k - r - 1) // 2] == s[(k + r + 1) // 2]):
+            r += 1
+        radii[k] = r
+        if k + r > right:
+            center, right = k, k + r
+    return radii
+
+def longest_palindrome(s, normalize=False):
+    '''
+    Returns (start, stop): the indices in s of its longest palindromic substring s[start:stop]
+    (the first one, if several are equally long), or (0, 0) if s is empty.
+    If normalize is True, the substring is the longest that is a palindrome when normalized,
+    starting and ending on a letter or digit.
+    '''
+    if not s:
+        return 0, 0
+    if normalize:
+        elements, indices = normalized(s)
+        if not elements:
+            return 0, 0
+        start, stop = longest_palindrome(elements)
+        return indices[start], indices[stop - 1] + 1
+    radii = manacher(s)
+    k = max(range(len(radii)), key=radii.__getitem__)
+    start = (k - radii[k]) // 2
+    return start, start + radii[k]
+
+def records(path):
+    '''
+    Generator: yields (line number, line) for each line of the file at path, from a memory map of it,
+    as bytes without its line ending.
+    '''
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as f:
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            start = 0
+            number = 0
+            size = len(mm)
+            while start < size:
+                end = mm.find(b'\n', start)
+                if end < 0:
+                    end = size
+                number += 1
+                stop = end - 1 if end > start and mm[end - 1] == 13 else end
+                yield number, mm[start:stop]
+                start = end + 1
+
+def palindromic_lines(path, normalize=False, encoding=None):
+    '''
+    Generator: yields (line number, line) for each non-empty palindromic line of the file at path.
+    The lines are bytes, compared byte by byte, unless an encoding is specified to decode them to str.
+    '''
+    for number, line in records(path):
+        if encoding is not None:
+            line = line.decode(encoding)
+        if line and is_palindrome(line, normalize):
+            yield number, line
+
+def longest_palindromes(path, normalize=False, encoding=None):
+    '''
+    Generator: yields (line number, start, stop, palindrome) for each non-empty line of the file at path:
+    the longest palindromic substring of the line, line[start:stop].
+    The lines are bytes, compared byte by byte, unless an encoding is specified to decode them to str.
+    '''
+    for number, line in records(path):
+        if encoding is not None:
+            line = line.decode(encoding)
+        if line:
+            start, stop = longest_palindrome(line, normalize)
+            yield number, start, stop, line[start:stop]
+
+
+#----- default main scans a text file for palindromic lines (or each line's longest palindrome)
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Scans a text file for palindromes, one line at a time.")
+    parser.add_argument('path', type=str, help='the text file to scan')
+    parser.add_argument('-n', '--normalize', action='store_true', help='ignore case, and everything but letters and digits')
+    parser.add_argument('-l', '--longest', action='store_true', help="report each line's longest palindrome, instead of palindromic lines")
+    parser.add_argument('-m', '--min-length', type=int, default=1, help='the shortest palindrome reported with --longest')
+    parser.add_argument('-e', '--encoding', type=str, default='utf-8', help='the text encoding of the file')
+    args = parser.parse_args()
+
+    if args.longest:
+        for number, start, stop, palindrome in longest_palindromes(args.path, args.normalize, args.encoding):
+            if stop - start >= args.min_length:
+                print('{0},{1},{2},{3}'.format(number, start, stop, palindrome))
+    else:
+        for number, line in palindromic_lines(args.path, args.normalize, args.encoding):
+            print('{0},{1}'.format(number, line))
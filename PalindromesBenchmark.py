@@ -0,0 +1,144 @@
+'''
+Benchmarks the palindrome checks of Palindromes (recursive and iterative) and PalindromeScan
+over generated strings of growing length, both palindromic and mismatched at the first
+character, and saves the results as JSON for comparison between versions.
+
+For each implementation, kind of input and length it reports the operations per second
+(from timeit), and the peak memory allocated by one call (from tracemalloc).  For each
+implementation and kind of input it also reports the scaling exponent: the slope of
+log(seconds per operation) against log(length), about 1 for a linear check and 2 for a
+quadratic one.  Palindromes.is_palindrome recurses once per pair of characters, so the
+lengths it would need more than the recursion limit for are skipped.
+
+With --baseline, the results are compared with those of an earlier JSON file, and any
+operations per second that fell by more than --tolerance are reported as regressions.
+'''
+
+import argparse
+import json
+import math
+import platform
+import sys
+import timeit
+import tracemalloc
+
+import PalindromeScan
+from Palindromes import is_palindrome
+from Palindromes import is_palindrome_iter
+
+IMPLEMENTATIONS = {
+    'recursive': is_palindrome,
+    'iterative': is_palindrome_iter,
+    'two_index': PalindromeScan.is_palindrome,
+    'reversed_slice': lambda s: s == s[::-1],
+}
+
+DEFAULT_LENGTHS = [16, 64, 256, 1024, 4096, 16384]
+KINDS = ('palindrome', 'mismatch')
+
+def make_input(kind, length):
+    '''Returns a string of length characters: a palindrome, or (kind 'mismatch') one with unequal ends.'''
+    half = ''.join(chr(ord('a') + i % 26) for i in range(length // 2))
+    s = half + ('m' if length % 2 else '') + half[::-1]
+    if kind == 'mismatch' and length > 1:
+        s = 'z' + s[1:-1] + 'y'
+    return s
+
+def fits_recursion(name, length):
+    '''Returns False if the implementation name cannot check a string of length characters within the recursion limit.'''
+    return name != 'recursive' or length // 2 + 50 < sys.getrecursionlimit()
+
+def measure(function, s, min_seconds=0.1):
+    '''Returns (ops_per_second, peak_bytes) for function(s): the best of 3 timings of at least min_seconds each.'''
+    timer = timeit.Timer(lambda: function(s))
+    number = 1
+    while timer.timeit(number) < min_seconds:
+        number *= 2
+    seconds = min(timer.repeat(repeat=3, number=number)) / number
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        function(s)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return 1 / seconds, peak
+
+def scaling_exponent(lengths, ops_per_second):
+    '''Returns the least-squares slope of log(seconds per operation) against log(length), or None for fewer than two points.'''
+    if len(lengths) < 2:
+        return None
+    xs = [math.log(n) for n in lengths]
+    ys = [-math.log(ops) for ops in ops_per_second]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / sum((x - mean_x) ** 2 for x in xs)
+
+def run_benchmark(names=tuple(IMPLEMENTATIONS), lengths=DEFAULT_LENGTHS, min_seconds=0.1):
+    '''
+    Returns the benchmark results as a JSON-ready dict: the Python version, a list of results
+    (each a dict of implementation, kind, length, ops_per_second and peak_bytes),
+    and the scaling exponent of each implementation for each kind.
+    '''
+    results = []
+    scaling = {}
+    for name in names:
+        function = IMPLEMENTATIONS[name]
+        for kind in KINDS:
+            measured = []
+            for length in lengths:
+                if not fits_recursion(name, length):
+                    continue
+                s = make_input(kind, length)
+                if function(s) != (kind == 'palindrome' or length < 2):
+                    raise AssertionError('{0} is wrong for a {1} of length {2}'.format(name, kind, length))
+                ops, peak = measure(function, s, min_seconds)
+                results.append({'implementation': name, 'kind': kind, 'length': length, 'ops_per_second': ops, 'peak_bytes': peak})
+                measured.append((length, ops))
+            scaling['{0}/{1}'.format(name, kind)] = scaling_exponent([n for n, _ in measured], [ops for _, ops in measured])
+    return {'python': platform.python_version(), 'results': results, 'scaling': scaling}
+
+def compare(results, baseline, tolerance=0.25):
+    '''
+    Returns a list of (implementation, kind, length, ratio) for each result also in baseline
+    whose ops_per_second fell to less than 1 - tolerance of the baseline's: ratio is new / baseline.
+    '''
+    key = lambda r: (r['implementation'], r['kind'], r['length'])
+    before = {key(r): r['ops_per_second'] for r in baseline['results']}
+    regressions = []
+    for r in results['results']:
+        if key(r) in before:
+            ratio = r['ops_per_second'] / before[key(r)]
+            if ratio < 1 - tolerance:
+                regressions.append(key(r) + (ratio,))
+    return regressions
+
+
+#----- default main runs every implementation, prints a CSV table, and saves the JSON results
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Benchmarks the palindrome check implementations.")
+    parser.add_argument('-i', '--implementations', type=str, nargs='+', default=list(IMPLEMENTATIONS), choices=list(IMPLEMENTATIONS), help='the implementations to time')
+    parser.add_argument('-l', '--lengths', type=int, nargs='+', default=DEFAULT_LENGTHS, help='the input lengths')
+    parser.add_argument('-s', '--min-seconds', type=float, default=0.1, help='the least time for each timing run')
+    parser.add_argument('-o', '--output', type=str, default='palindromes_benchmark.json', help='the JSON results file to write')
+    parser.add_argument('-b', '--baseline', type=str, default=None, help='an earlier JSON results file to compare with')
+    parser.add_argument('-t', '--tolerance', type=float, default=0.25, help='the fraction of ops/sec that may be lost before a regression is reported')
+    args = parser.parse_args()
+
+    results = run_benchmark(args.implementations, args.lengths, args.min_seconds)
+    print('Implementation,Kind,Length,OpsPerSecond,PeakBytes')
+    for r in results['results']:
+        print('{0},{1},{2},{3:.0f},{4}'.format(r['implementation'], r['kind'], r['length'], r['ops_per_second'], r['peak_bytes']))
+    for name, exponent in results['scaling'].items():
+        print('Scaling,{0},{1}'.format(name, 'n/a' if exponent is None else '{0:.2f}'.format(exponent)))
+    with open(args.output, 'w') as f:
+        json.dump(results, f, indent=2)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for name, kind, length, ratio in regressions:
+            print('Regression,{0},{1},{2},{3:.2f}'.format(name, kind, length, ratio))
+        sys.exit(1 if regressions else 0)
@@ -0,0 +1,172 @@
+'''
+Numerical integration (quadrature) rules with NumPy, for PiTrap's quarter circle or any integrand.
+
+PiTrap.pi_trap builds Python lists of n heights and n trapezoid areas.  Here an integrand
+is any function f of a NumPy array of x values returning an array of heights (quarter_circle
+is PiTrap's f in that form), and the rules evaluate it over whole arrays:
+- trapezoid and simpson: the composite rules on n equal sections;
+- romberg: Richardson extrapolation of trapezoid rules on 1, 2, 4, ... sections, each
+  level evaluating only the new midpoints;
+- adaptive_simpson: Simpson's rule on intervals halved only where the error estimate
+  (the difference between one interval and its two halves) is still above tolerance,
+  processing every interval of a level at once;
+- stream: the trapezoid or Simpson rule on n sections, chunk_size sections at a time,
+  yielding the running sum after each chunk, so any n runs in constant memory.
+
+pi_stream streams the quarter circle, and after each chunk reports the pi estimate given by
+the sections done so far plus the exact area of the rest of the quarter circle, and its error
+against math.pi: so the error reported as it goes is exactly the error of the sections done.
+'''
+
+import argparse
+import math
+
+import numpy as np
+
+RULES = ('trapezoid', 'simpson', 'romberg', 'adaptive')
+STREAM_RULES = ('trapezoid', 'simpson')
+
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+def quarter_circle(x):
+    '''Returns the heights of the unit quarter circle (PiTrap.f) at each of the x values, an array in [0, 1].'''
+    return np.sqrt(np.maximum(0.0, 1.0 - x * x))
+
+def quarter_circle_area(a, b):
+    '''Returns the exact area under the unit quarter circle between a and b, for 0 <= a <= b <= 1.'''
+    antiderivative = lambda x: (x * math.sqrt(1.0 - x * x) + math.asin(x)) / 2.0
+    return antiderivative(b) - antiderivative(a)
+
+def trapezoid(f, a, b, n):
+    '''Returns the integral of f from a to b by the composite trapezoid rule on n sections.'''
+    y = f(np.linspace(a, b, n + 1))
+    return float((b - a) / n * (y.sum() - (y[0] + y[-1]) / 2.0))
+
+def simpson(f, a, b, n):
+    '''Returns the integral of f from a to b by the composite Simpson's rule on n sections (n must be even).'''
+    if n % 2:
+        raise ValueError("Simpson's rule needs an even number of sections: n={0}".format(n))
+    y = f(np.linspace(a, b, n + 1))
+    return float((b - a) / n / 3.0 * (y[0] + y[-1] + 4.0 * y[1:-1:2].sum() + 2.0 * y[2:-1:2].sum()))
+
+def romberg(f, a, b, levels=20, tol=1e-12):
+    '''
+    Returns the integral of f from a to b by Romberg integration: up to levels rows of Richardson
+    extrapolation of the trapezoid rule on 1, 2, 4, ... 2**(levels - 1) sections, stopping
+    once the last two diagonal estimates differ by no more than tol.
+    '''
+    h = b - a
+    row = [h * (f(np.array([a]))[0] + f(np.array([b]))[0]) / 2.0]
+    for level in range(1, levels):
+        # the trapezoid rule on twice the sections reuses the last one, adding the new midpoints
+        midpoints = a + h * (np.arange(2 ** (level - 1)) + 0.5)
+        h /= 2.0
+        next_row = [row[0] / 2.0 + h * f(midpoints).sum()]
+        for k in range(1, level + 1):
+            next_row.append(next_row[k - 1] + (next_row[k - 1] - row[k - 1]) / (4 ** k - 1))
+        if abs(next_row[-1] - row[-1]) <= tol:
+            return float(next_row[-1])
+        row = next_row
+    return float(row[-1])
+
+def adaptive_simpson(f, a, b, tol=1e-10, max_depth=50):
+    '''
+    Returns the integral of f from a to b by adaptive Simpson's rule, to within about tol.
+    Each interval is accepted when Simpson's rule on its two halves differs from Simpson's rule
+    on the whole interval by no more than 15 times its share of tol (adding the difference / 15,
+    Richardson's correction); the others are halved, down to max_depth halvings.
+    '''
+    left = np.array([a], dtype=float)
+    right = np.array([b], dtype=float)
+    f_left, f_mid, f_right = f(left), f((left + right) / 2.0), f(right)
+    whole = (right - left) / 6.0 * (f_left + 4.0 * f_mid + f_right)
+    tolerance = np.array([tol])
+    total = 0.0
+    for depth in range(max_depth + 1):
+        mid = (left + right) / 2.0
+        f_left_mid = f((left + mid) / 2.0)
+        f_mid_right = f((mid + right) / 2.0)
+        first = (mid - left) / 6.0 * (f_left + 4.0 * f_left_mid + f_mid)
+        second = (right - mid) / 6.0 * (f_mid + 4.0 * f_mid_right + f_right)
+        error = first + second - whole
+        done = np.abs(error) <= 15.0 * tolerance
+        if depth == max_depth:
+            done[:] = True
+        total += (first + second + error / 15.0)[done].sum()
+        if done.all():
+            break
+        keep = ~done
+        # each interval still to refine becomes its two halves
+        left = np.concatenate([left[keep], mid[keep]])
+        right = np.concatenate([mid[keep], right[keep]])
+        f_left, f_mid, f_right = (np.concatenate([f_left[keep], f_mid[keep]]), np.concatenate([f_left_mid[keep], f_mid_right[keep]]),
+                                  np.concatenate([f_mid[keep], f_right[keep]]))
+        whole = np.concatenate([first[keep], second[keep]])
+        tolerance = np.concatenate([tolerance[keep], tolerance[keep]]) / 2.0
+    return float(total)
+
+def stream(f, a, b, n, chunk_size=DEFAULT_CHUNK_SIZE, rule='trapezoid'):
+    '''
+    Generator: integrates f from a to b by the composite rule (trapezoid or simpson) on n sections,
+    chunk_size sections at a time, yielding (sections done, x reached, sum of the integral so far) after each chunk.
+    '''
+    if rule not in STREAM_RULES:
+        raise ValueError('Unknown streaming rule {0}: expected one of {1}'.format(rule, STREAM_RULES))
+    if rule == 'simpson' and (n % 2 or chunk_size % 2):
+        raise ValueError("Simpson's rule needs even numbers of sections: n={0} chunk_size={1}".format(n, chunk_size))
+    h = (b - a) / n
+    total = 0.0
+    for start in range(0, n, chunk_size):
+        stop = min(n, start + chunk_size)
+        y = f(a + h * np.arange(start, stop + 1, dtype=np.float64))
+        if rule == 'trapezoid':
+            total += h * (y.sum() - (y[0] + y[-1]) / 2.0)
+        else:
+            total += h / 3.0 * (y[0] + y[-1] + 4.0 * y[1:-1:2].sum() + 2.0 * y[2:-1:2].sum())
+        yield stop, a + h * stop, float(total)
+
+def pi_stream(n, chunk_size=DEFAULT_CHUNK_SIZE, rule='trapezoid'):
+    '''
+    Generator: streams the quarter circle area on n sections (see stream), yielding after each chunk
+    (sections done, pi estimate, error against math.pi), where the estimate is 4 times the area of
+    the sections done plus the exact area of the rest of the quarter circle.
+    '''
+    for sections, x, total in stream(quarter_circle, 0.0, 1.0, n, chunk_size, rule):
+        pi_approx = 4.0 * (total + quarter_circle_area(min(x, 1.0), 1.0))
+        yield sections, pi_approx, math.pi - pi_approx
+
+def pi_quadrature(n, rule='trapezoid'):
+    '''Returns the approximation of pi from the quarter circle area by rule, on n sections (the most, for romberg and adaptive).'''
+    if rule == 'trapezoid':
+        return 4.0 * trapezoid(quarter_circle, 0.0, 1.0, n)
+    if rule == 'simpson':
+        return 4.0 * simpson(quarter_circle, 0.0, 1.0, n + n % 2)
+    if rule == 'romberg':
+        return 4.0 * romberg(quarter_circle, 0.0, 1.0, levels=max(1, n.bit_length()))
+    if rule == 'adaptive':
+        return 4.0 * adaptive_simpson(quarter_circle, 0.0, 1.0, tol=1e-12, max_depth=max(1, n.bit_length()))
+    raise ValueError('Unknown rule {0}: expected one of {1}'.format(rule, RULES))
+
+
+#----- default main compares the rules, or streams one rule on a huge number of sections
+
+if __name__ == '__main__':
+
+    parser = argparse.ArgumentParser(description="Approximates pi from the area of a quarter circle by quadrature.")
+    parser.add_argument('-r', '--rules', type=str, nargs='+', default=list(RULES), choices=RULES, help='the quadrature rules to compare')
+    parser.add_argument('-s', '--stream', type=int, default=None, help='stream the first rule on this many sections, reporting as it goes')
+    parser.add_argument('-c', '--chunk-size', type=int, default=DEFAULT_CHUNK_SIZE, help='the sections per chunk when streaming')
+    parser.add_argument('-e', '--report-every', type=int, default=100, help='the chunks between reports when streaming')
+    args = parser.parse_args()
+
+    if args.stream:
+        for chunk, (sections, pi_approx, pi_diff) in enumerate(pi_stream(args.stream, args.chunk_size, args.rules[0]), 1):
+            if chunk % args.report_every == 0 or sections == args.stream:
+                print(f"n_sections={sections:-12d} pi_approx={pi_approx:.15f} pi_diff={pi_diff:.4e}")
+    else:
+        for rule in args.rules:
+            for i in range(1, 7):
+                n_sections = 10 ** i
+                pi_approx = pi_quadrature(n_sections, rule)
+                pi_diff = math.pi - pi_approx
+                print(f"rule={rule:9s} n_sections={n_sections:-7d} pi_approx={pi_approx:.15f} pi_diff={pi_diff:.4e}")
@@ -7,8 +7,19 @@ gives us our approximation of pi.
 
 The more trapazoidal sections we use to calculate the quarter cirle area,
 the closer our approximation should be to "real" pi.
+
+pi_trap_parallel splits the sections into segments summed over a pool of worker processes,
+and adds the segments' partial sums (and the trapezoids within each segment) with Neumaier's
+compensated summation, so the rounding error does not grow with the number of sections.
+pi_trap_decimal does the same calculation with decimal.Decimal to any number of digits,
+to check the convergence of the trapezoid rule itself apart from floating point rounding.
 '''
+import argparse
+import decimal
 import math
+import os
+import time
+from multiprocessing import Pool
 
 def f(x):
     return math.sqrt(1 - (x * x))
@@ -19,16 +30,147 @@ def trap_area(a, b, half_section):
 def pi_trap(n_sections):
     section_width = 1.0 / float(n_sections)
     section_half_width = section_width / 2.0
-    y_vals = [f(float(i) * section_width) for i in range(n_sections)]
+    # n_sections trapezoids need n_sections + 1 heights: the last is f(1.0) == 0.0
+    y_vals = [f(float(i) * section_width) for i in range(n_sections + 1)]
     t_areas = [trap_area(y_vals[i-1], y2, section_half_width) for i, y2 in enumerate(y_vals[1:], 1)]
     area_sum = sum(t_areas)
     pi_approx = area_sum * 4.0
     return pi_approx
 
+def neumaier_sum(values):
+    '''Returns the sum of values (any iterable, consumed once) with Neumaier's compensated (improved Kahan) summation.'''
+    total = 0.0
+    compensation = 0.0
+    for v in values:
+        t = total + v
+        # keep the low-order bits lost by whichever addend is smaller
+        if abs(total) >= abs(v):
+            compensation += (total - t) + v
+        else:
+            compensation += (v - t) + total
+        total = t
+    return total + compensation
+
+def segment_area(task):
+    '''
+    Returns the area of the trapezoids start to stop - 1 of n_sections, for task = (n_sections, start, stop):
+    each trapezoid's area by trap_area, summed by neumaier_sum as it is generated, in constant memory.
+    '''
+    n_sections, start, stop = task
+    section_width = 1.0 / float(n_sections)
+    section_half_width = section_width / 2.0
+    return neumaier_sum(trap_areas(start, stop, section_width, section_half_width))
+
+def trap_areas(start, stop, section_width, section_half_width):
+    '''Generator: yields the area of each of the trapezoids start to stop - 1, computing each height once.'''
+    y1 = f(float(start) * section_width)
+    for i in range(start + 1, stop + 1):
+        y2 = f(float(i) * section_width)
+        yield trap_area(y1, y2, section_half_width)
+        y1 = y2
+
+def segments(n_sections, n_segments):
+    '''Returns a list of n_segments (n_sections, start, stop) tasks, as equal as possible, covering every section.'''
+    n_segments = max(1, min(n_segments, n_sections))
+    bounds = [n_sections * k // n_segments for k in range(n_segments + 1)]
+    return [(n_sections, start, stop) for start, stop in zip(bounds, bounds[1:])]
+
+def pi_trap_parallel(n_sections, workers=None, segments_per_worker=4, pool=None):
+    '''
+    Returns the same approximation as pi_trap, with the sections split into segments_per_worker segments
+    per worker process (None = one per CPU, 0 = in this process) and the partial sums added by neumaier_sum.
+    If pool is specified, the segments are summed over it (a Pool of workers processes), instead of a new Pool.
+    '''
+    n_workers = workers or os.cpu_count() or 1
+    tasks = segments(n_sections, n_workers * segments_per_worker)
+    if workers == 0:
+        partial_sums = list(map(segment_area, tasks))
+    elif pool is not None:
+        partial_sums = pool.map(segment_area, tasks)
+    else:
+        with Pool(n_workers) as pool:
+            partial_sums = pool.map(segment_area, tasks)
+    return neumaier_sum(partial_sums) * 4.0
+
+def pi_decimal(digits):
+    '''Returns pi to digits significant digits, as a Decimal, by Machin's formula.'''
+    def arctan_inverse(x):
+        # arctan(1/x) by its Taylor series
+        power = decimal.Decimal(1) / x
+        x_squared = x * x
+        total = power
+        k = 1
+        while True:
+            power /= -x_squared
+            term = power / (2 * k + 1)
+            if total + term == total:
+                return total
+            total += term
+            k += 1
+    with decimal.localcontext() as context:
+        context.prec = digits + 10
+        pi = 16 * arctan_inverse(decimal.Decimal(5)) - 4 * arctan_inverse(decimal.Decimal(239))
+    with decimal.localcontext() as context:
+        context.prec = digits
+        return +pi
+
+def pi_trap_decimal(n_sections, digits=50):
+    '''Returns the approximation of pi_trap for n_sections, calculated with Decimals of digits significant digits.'''
+    with decimal.localcontext() as context:
+        context.prec = digits
+        n = decimal.Decimal(n_sections)
+        one = decimal.Decimal(1)
+        # the trapezoids share their inner heights, and (f(0) + f(1)) / 2 == 1 / 2
+        y_sum = sum((one - (decimal.Decimal(i) / n) ** 2).sqrt() for i in range(1, n_sections))
+        area_sum = (y_sum + one / 2) / n
+        return area_sum * 4
+
+def sweep(exponents, worker_counts):
+    '''
+    Generator: yields (n_sections, workers, sections_per_second, pi_approx, pi_diff)
+    by pi_trap_parallel with each of worker_counts, for 10**i sections, for each i in exponents.
+    Each worker count's Pool is started (and its workers warmed up) once, before any timing,
+    so the sections per second measure the summation rather than process start-up.
+    '''
+    for workers in worker_counts:
+        n_workers = workers or os.cpu_count() or 1
+        pool = Pool(n_workers) if workers != 0 else None
+        try:
+            if pool is not None:
+                pool.map(segment_area, segments(n_workers, n_workers))
+            for i in exponents:
+                n_sections = 10 ** i
+                start = time.perf_counter()
+                pi_approx = pi_trap_parallel(n_sections, workers, pool=pool)
+                elapsed = time.perf_counter() - start
+                yield n_sections, workers, n_sections / elapsed, pi_approx, math.pi - pi_approx
+        finally:
+            if pool is not None:
+                pool.close()
+                pool.join()
+
 if __name__ == '__main__':
 
-    for i in range(1, 7):
-        n_sections = int(math.pow(10, i))
-        pi_approx = pi_trap(n_sections)
-        pi_diff = math.pi - pi_approx
-        print(f"n_sections={n_sections:-7d} pi_approx={pi_approx:.10f} pi_diff={pi_diff:.4e}")
+    parser = argparse.ArgumentParser(description="Approximates pi from the area of a quarter circle by the trapezoid rule.")
+    parser.add_argument('-n', '--max-exponent', type=int, default=7, help='the most sections, as a power of 10')
+    parser.add_argument('-w', '--workers', type=int, nargs='+', default=None, help='the worker counts to sweep (0 = no pool; default 1, 2, 4 ... CPUs)')
+    parser.add_argument('-d', '--digits', type=int, default=0, help='also check convergence with Decimals of this many digits (up to 10**5 sections)')
+    args = parser.parse_args()
+
+    worker_counts = args.workers
+    if worker_counts is None:
+        cpus = os.cpu_count() or 1
+        worker_counts = sorted({min(2 ** k, cpus) for k in range(cpus.bit_length() + 1)})
+
+    for n_sections, workers, sections_per_second, pi_approx, pi_diff in sweep(range(1, args.max_exponent + 1), worker_counts):
+        print(f"n_sections={n_sections:-9d} workers={workers:-3d} sections/sec={sections_per_second:12.0f} pi_approx={pi_approx:.15f} pi_diff={pi_diff:.4e}")
+
+    if args.digits:
+        pi = pi_decimal(args.digits)
+        for i in range(1, min(args.max_exponent, 5) + 1):
+            n_sections = 10 ** i
+            pi_approx = pi_trap_decimal(n_sections, args.digits)
+            with decimal.localcontext() as context:
+                context.prec = args.digits
+                pi_diff = pi - pi_approx
+            print(f"n_sections={n_sections:-9d} digits={args.digits} pi_approx={pi_approx:.30f} pi_diff={pi_diff:.10e}")
@@ -0,0 +1,141 @@
+'''
+Sweeps every one- and two-particle starting configuration of Pilton's Small World
+over a range of grid sizes, across a pool of worker processes.
+
+Each configuration is run (with PiltonWorldState.find_cycle) until it dies out,
+falls into a cycle, or reaches a step limit, and its statistics are appended to a CSV
+results table: extinction time, cycle transient and period, the most particles and the
+heaviest particle seen.  A restarted sweep reads the table first and skips every
+configuration already in it, so an interrupted sweep resumes where it stopped.
+
+Pilton's rules are not invariant under translation of the torus (particles move to
+1 + the sum of the other particles' coordinates, and decay where their coordinates equal
+the timestep modulo the grid dimensions), so translated configurations are NOT equivalent.
+The equivalences the sweep does remove are:
+- particle order: a configuration is a set of particles;
+- transposition (swapping x and y) on square grids, where the rules are symmetric in x and y.
+'''
+
+import argparse
+import csv
+import os
+from itertools import combinations
+from itertools import product
+from multiprocessing import Pool
+
+from PiltonWorld import PiltonParticle
+from PiltonWorld import PiltonWorldState
+
+DEFAULT_MAX_STEPS = 2000
+
+COLUMNS = ['Cols', 'Rows', 'Particles', 'ExtinctionTime', 'Transient', 'CyclePeriod', 'MaxParticles', 'MaxMass', 'Steps']
+
+def canonical(config, cols, rows):
+    '''
+    Returns the canonical form of config, a sequence of (x, y, mass) particles:
+    its sorted particles, or those of its transpose if smaller and the grid is square.
+    '''
+    config = tuple(sorted(config))
+    if cols == rows:
+        config = min(config, tuple(sorted((y, x, mass) for x, y, mass in config)))
+    return config
+
+def configurations(cols, rows, counts=(1, 2), masses=(1,)):
+    '''
+    Generator: yields the canonical form of every configuration of counts particles
+    (each on its own cell, each with one of the specified masses), once per equivalence class.
+    '''
+    cells = [(x, y) for y in range(rows) for x in range(cols)]
+    for count in counts:
+        for chosen in combinations(cells, count):
+            for chosen_masses in product(masses, repeat=count):
+                config = tuple(sorted((x, y, mass) for (x, y), mass in zip(chosen, chosen_masses)))
+                if canonical(config, cols, rows) == config:
+                    yield config
+
+def config_text(config):
+    '''Returns config as text, in the PiltonParticle str format, e.g. "x3y2m1 x0y0m1".'''
+    return ' '.join(str(PiltonParticle(*p)) for p in config)
+
+def run_configuration(task):
+    '''
+    Runs the configuration of task = (cols, rows, config, max_steps) and returns its results row:
+    a list of values for COLUMNS, with None for an extinction time or cycle that was not reached.
+    '''
+    cols, rows, config, max_steps = task
+    world = PiltonWorldState(cols, rows)
+    world.particles = [PiltonParticle(*p) for p in config]
+    cycle = world.find_cycle(max_steps)
+    # every state of the run is seen by the end of the cycle's first period
+    steps = sum(cycle) if cycle else max_steps
+    max_particles = len(world.particles)
+    max_mass = max(p.mass for p in world.particles)
+    extinction_time = None
+    while world.timestep < steps:
+        world.do_simulation_step()
+        if world.particles:
+            max_particles = max(max_particles, len(world.particles))
+            max_mass = max(max_mass, max(p.mass for p in world.particles))
+        elif extinction_time is None:
+            extinction_time = world.timestep
+    transient, period = cycle if cycle else (None, None)
+    return [cols, rows, config_text(config), extinction_time, transient, period, max_particles, max_mass, steps]
+
+def read_done(path):
+    '''Returns the set of (cols, rows, particles text) already in the results table at path.'''
+    if not os.path.exists(path):
+        return set()
+    with open(path, newline='') as f:
+        return {(int(row['Cols']), int(row['Rows']), row['Particles']) for row in csv.DictReader(f)}
+
+def run_sweep(path, sizes, counts=(1, 2), masses=(1,), max_steps=DEFAULT_MAX_STEPS, workers=None, chunk_size=64):
+    '''
+    Generator: runs every configuration of counts particles on each n-by-n grid for n in sizes
+    that is not already in the results table at path, over a pool of workers
+    (None = one per CPU, 0 = in this process), appending each results row to the table
+    (and yielding it) as it completes.
+    '''
+    done = read_done(path)
+    tasks = [(n, n, config, max_steps) for n in sizes for config in configurations(n, n, counts, masses)
+             if (n, n, config_text(config)) not in done]
+    is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(COLUMNS)
+        if workers == 0:
+            for row in map(run_configuration, tasks):
+                writer.writerow(['' if v is None else v for v in row])
+                f.flush()
+                yield row
+            return
+        with Pool(workers) as pool:
+            for row in pool.imap_unordered(run_configuration, tasks, chunksize=chunk_size):
+                writer.writerow(['' if v is None else v for v in row])
+                f.flush()
+                yield row
+
+
+#----- default main sweeps one- and two-particle configurations of mass 1 on 5x5 to 31x31 grids
+
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Sweeps Pilton's Small World over starting configurations.")
+    parser.add_argument('-o', '--output', type=str, default='pilton_sweep.csv', help='the results table (resumed if it exists)')
+    parser.add_argument('-n', '--min-size', type=int, default=5, help='the smallest grid size (n-by-n)')
+    parser.add_argument('-N', '--max-size', type=int, default=31, help='the largest grid size (n-by-n)')
+    parser.add_argument('-p', '--particles', type=int, nargs='+', default=[1, 2], help='the particle counts to sweep')
+    parser.add_argument('-m', '--masses', type=int, nargs='+', default=[1], help='the particle masses to sweep')
+    parser.add_argument('-t', '--max-steps', type=int, default=DEFAULT_MAX_STEPS, help='the step limit per run')
+    parser.add_argument('-w', '--workers', type=int, default=None, help='the number of worker processes (0 = no pool)')
+    args = parser.parse_args()
+
+    sizes = range(args.min_size, args.max_size + 1)
+    runs = extinct = cycles = 0
+    for row in run_sweep(args.output, sizes, args.particles, args.masses, args.max_steps, args.workers):
+        runs += 1
+        extinct += row[3] is not None
+        cycles += row[5] is not None
+        if runs % 1000 == 0:
+            print('Runs,{0},Extinct,{1},Cycles,{2}'.format(runs, extinct, cycles))
+    print('Runs,{0},Extinct,{1},Cycles,{2}'.format(runs, extinct, cycles))
@@ -4,6 +4,8 @@ An implementation of the "Small World" described in Barry Pilton's article:
 https://ianstewartjoat.weebly.com/manifold-5.html
 '''
 
+from math import lcm
+
 #----- particle class, particle class, particle class has location and mass!
 
 class PiltonParticle(tuple):
@@ -65,17 +67,158 @@ class PiltonWorldState:
         self._cols = numberOfCols
         self._rows = numberOfRows
         self.timestep = 0
-        self.particles = []
+        self._particles = []
+        # (timestep at which the cycle starts, cycle period), once found by find_cycle
+        self._cycle = None
+
+    @property
+    def particles(self):
+        return self._particles
+
+    @particles.setter
+    def particles(self, particles):
+        # a new set of particles starts a new run, whose cycle (if any) is not yet known
+        self._particles = particles
+        self._cycle = None
+
+    @property
+    def cycle(self):
+        '''
+        Returns (timestep at which the cycle starts, cycle period) if find_cycle found one, or
+        (a timestep at which the world was in its cycle, cycle period) if jump_to did; else None.
+        '''
+        return self._cycle
 
     def do_simulation_step(self):
         t = self.timestep + 1
-        self.particles = coalesce_particles(decay_particles(t, coalesce_particles(move_particles(t, self.particles, self._cols, self._rows)), self._cols, self._rows))
+        self._particles = coalesce_particles(decay_particles(t, coalesce_particles(move_particles(t, self._particles, self._cols, self._rows)), self._cols, self._rows))
         self.timestep = t
 
     def do_simulation_reset(self):
         self.timestep = 0
         self.particles = []
 
+    def copy(self):
+        '''Returns an independent PiltonWorldState with the same dimensions, timestep and particles.'''
+        other = type(self)(self._cols, self._rows)
+        other.timestep = self.timestep
+        other.particles = list(self.particles)
+        other._cycle = self._cycle
+        return other
+
+    def canonical_state(self, modulus=1):
+        '''
+        Returns a hashable description of this world's state that determines its future:
+        its sorted particles, and its timestep modulo the lcm of modulus, the grid dimensions and the particles' masses
+        (the values that the timestep is taken modulo of, when particles move and decay).
+        An empty world never changes again, whatever the timestep, so its residue is always 0.
+        '''
+        particles = self.particles
+        if not particles:
+            return ((), 0)
+        period = lcm(modulus, self._cols, self._rows, *{p.mass for p in particles})
+        return (tuple(sorted(particles)), self.timestep % period)
+
+    def find_cycle(self, max_steps=100000):
+        '''
+        Finds the cycle this world eventually falls into, from its current state, with Brent's algorithm
+        (which keeps only two world states, not the whole history).  Returns (transient, period):
+        the number of steps before the cycle starts, and the cycle's period; or None if no cycle
+        is found within about max_steps steps.  An extinct world is a cycle of period 1.
+        The world itself is not advanced.
+
+        The timestep residue in canonical_state only covers the masses present at the time, so a
+        repeat of canonical_state is confirmed by checking that the period is a multiple of every mass
+        met along the cycle; if it is not, the search is repeated with those masses in the modulus.
+        '''
+        modulus = 1
+        while True:
+            found = self._brent(modulus, max_steps)
+            if found is None:
+                return None
+            transient, period = found
+            start = self.copy()
+            for _ in range(transient):
+                start.do_simulation_step()
+            cycle_modulus = modulus
+            for _ in range(period):
+                cycle_modulus = lcm(cycle_modulus, *{p.mass for p in start.particles})
+                start.do_simulation_step()
+            if not start.particles or period % cycle_modulus == 0:
+                self._cycle = (self.timestep + transient, period)
+                return found
+            modulus = cycle_modulus
+
+    def _brent(self, modulus, max_steps):
+        '''Brent's cycle-finding algorithm over canonical_state(modulus): returns (transient, period) or None.'''
+        power = period = 1
+        tortoise = self.canonical_state(modulus)
+        hare = self.copy()
+        hare.do_simulation_step()
+        steps = 1
+        while tortoise != hare.canonical_state(modulus):
+            if steps >= max_steps:
+                return None
+            if power == period:
+                tortoise = hare.canonical_state(modulus)
+                power *= 2
+                period = 0
+            hare.do_simulation_step()
+            period += 1
+            steps += 1
+        # run a second world period steps ahead of the first, until their states match
+        tortoise = self.copy()
+        hare = self.copy()
+        for _ in range(period):
+            hare.do_simulation_step()
+        transient = 0
+        while tortoise.canonical_state(modulus) != hare.canonical_state(modulus):
+            tortoise.do_simulation_step()
+            hare.do_simulation_step()
+            transient += 1
+        return transient, period
+
+    def jump_to(self, t):
+        '''
+        Advances this world to timestep t.  Once the world is in a known cycle (see find_cycle),
+        only the remainder of t modulo the cycle period is stepped.  Otherwise the world itself is
+        stepped towards t as the hare of Brent's algorithm, and the rest is skipped as soon as
+        that finds the period, so no step is ever taken twice.
+        '''
+        if t < self.timestep:
+            raise ValueError('Cannot jump back from timestep {0} to {1}'.format(self.timestep, t))
+        if self._cycle is None:
+            self._step_finding_cycle(t)
+        if self._cycle is not None:
+            start, period = self._cycle
+            while self.timestep < min(start, t):
+                self.do_simulation_step()
+            for _ in range((t - self.timestep) % period):
+                self.do_simulation_step()
+            self.timestep = t
+
+    def _step_finding_cycle(self, t):
+        '''
+        Steps this world towards timestep t with Brent's algorithm, the world itself being the hare,
+        and stops early once it repeats an earlier state, setting the cycle to (the timestep reached, the period).
+        A repeat is two equal particle lists a number of steps apart that is a multiple of the grid
+        dimensions and of every mass met in between, so it determines the world's whole future.
+        '''
+        power = period = 0
+        while self.timestep < t:
+            if period == power:
+                tortoise = tuple(sorted(self.particles))
+                modulus = lcm(self._cols, self._rows, *{p.mass for p in tortoise})
+                power = max(1, 2 * power)
+                period = 0
+            self.do_simulation_step()
+            period += 1
+            particles = tuple(sorted(self.particles))
+            modulus = lcm(modulus, *{p.mass for p in particles})
+            if particles == tortoise and (not particles or period % modulus == 0):
+                self._cycle = (self.timestep, period)
+                return
+
 
 #---- functions that change the world
 #
@@ -85,6 +228,36 @@ class PiltonWorldState:
 # Encapsulation would reduce the parameter list per function, making the syntax cleaner.
 # But, having them global, with explicit parameters, makes unit testing individual functions easier.
 
+def find_molecules(particles, cols, rows):
+    '''
+    Returns a list of molecule labels, one per PiltonParticle in particles: two particles have the same label
+    if and only if they are edge-adjacent-reachable to each other (on the cols-by-rows torus), i.e. in the same molecule.
+    Particles are indexed by location, and molecules found by union-find over each location's four edge-neighbors,
+    so this takes roughly linear time.  Equal particles (same location and mass) are always in the same molecule.
+    '''
+    # one union-find node per distinct particle; parent[i] == i for a molecule's root
+    nodes = {}
+    node_of = [nodes.setdefault(p, len(nodes)) for p in particles]
+    parent = list(range(len(nodes)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    at = {}
+    for p, i in nodes.items():
+        at.setdefault(p.location, []).append(i)
+    for (x, y), here in at.items():
+        for neighbor in (((x - 1) % cols, y), ((x + 1) % cols, y), (x, (y - 1) % rows), (x, (y + 1) % rows)):
+            for j in at.get(neighbor, ()):
+                for i in here:
+                    ri, rj = root(i), root(j)
+                    if ri != rj:
+                        parent[max(ri, rj)] = min(ri, rj)
+    return [root(i) for i in node_of]
+
 def find_molecule(p, particles, cols, rows):
     '''
     Returns the set of PiltonParticles in particles that are edge-adjacent-reachable to each other,
@@ -92,21 +265,20 @@ def find_molecule(p, particles, cols, rows):
     Two particles are edge adjacent if they share a common cell edge.
     Diagonal-adjacency (sharing a common cell corner) does not count for molecule membership.
     '''
-    molecule = {p}
-    adjacents = [o for o in particles if p.is_adjacent_to(o, cols, rows)]
-    if not adjacents:
-        return molecule
-    else:
-        for a in adjacents:
-            remaining = [o for o in particles if o not in adjacents and o != p]
-            molecule.update(find_molecule(a, remaining, cols, rows))
-        return molecule
+    particles = list(particles)
+    if p not in particles:
+        particles.append(p)
+    labels = find_molecules(particles, cols, rows)
+    label = labels[particles.index(p)]
+    return {o for o, l in zip(particles, labels) if l == label}
 
 def find_others(p, particles, cols, rows):
     '''
     Returns the set of PiltonParticles in particles that are NOT edge-adjacent-reachable to PiltonParticle p.
     '''
-    return [o for o in particles if o not in find_molecule(p, particles, cols, rows)]
+    particles = list(particles)
+    molecule = find_molecule(p, particles, cols, rows)
+    return [o for o in particles if o not in molecule]
 
 def move_particle(t, p, others, cols, rows):
     '''
@@ -114,9 +286,16 @@ def move_particle(t, p, others, cols, rows):
     The others list contains all PiltonParticles currently in the world, but not part of p's molecule.
     Returns either a new particle at the new position, or the same particle if it does not move.
     '''
+    return move_particle_by_sums(t, p, sum([o.x for o in others]), sum([o.y for o in others]), cols, rows)
+
+def move_particle_by_sums(t, p, others_x, others_y, cols, rows):
+    '''
+    Moves (or leaves unmoved) PiltonParticle p, relative to timestep t, like move_particle,
+    given the sums others_x and others_y of the coordinates of the particles not part of p's molecule.
+    '''
     if t % p.mass == 0:
-        x = (1 + sum([o.x for o in others])) % cols
-        y = (1 + sum([o.y for o in others])) % rows
+        x = (1 + others_x) % cols
+        y = (1 + others_y) % rows
         return PiltonParticle(x, y, p.mass)
     else:
         return p
@@ -125,8 +304,18 @@ def move_particles(t, particles, cols, rows):
     '''
     Moves (or leaves unmoved) each PiltonParticle in the particles list relative to the current timestep t.
     Returns a new list of the particles in their new positions.
+    Molecules are found once, so each particle's "others" sums are the totals minus its own molecule's sums.
     '''
-    return [move_particle(t, p, find_others(p, particles, cols, rows), cols, rows) for p in particles]
+    labels = find_molecules(particles, cols, rows)
+    total_x = sum(p.x for p in particles)
+    total_y = sum(p.y for p in particles)
+    molecule_x = {}
+    molecule_y = {}
+    for p, label in zip(particles, labels):
+        molecule_x[label] = molecule_x.get(label, 0) + p.x
+        molecule_y[label] = molecule_y.get(label, 0) + p.y
+    return [move_particle_by_sums(t, p, total_x - molecule_x[label], total_y - molecule_y[label], cols, rows)
+            for p, label in zip(particles, labels)]
 
 def coalesce_particles(particles):
     '''
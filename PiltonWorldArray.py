@@ -0,0 +1,129 @@
+'''
+An array-backed PiltonWorldState, for worlds with many particles.
+
+PiltonWorldState keeps a list of PiltonParticle tuples and builds several new lists of
+them every step.  PiltonWorldArrayState keeps the particles' x, y and mass in parallel
+NumPy columns instead, and does each part of a step with array operations:
+- molecules are the connected components (scipy.sparse.csgraph) of the graph of occupied
+  cells, linked to their occupied edge-neighbors on the torus, which are found by a sorted
+  search of the occupied linear cell indices only; each particle's "others" sums are the
+  totals minus its molecule's sums (np.add.at);
+- moves and decays are computed for every particle at once, decays by repeating each
+  decaying particle once per decay product and adding an offset table;
+- coalescing is a group-by on each particle's linear cell index (np.unique).
+It follows exactly the same rules as PiltonWorld's functions, and the particles property
+still reads and writes lists of PiltonParticle, so existing callers (and find_cycle and
+jump_to) work unchanged.
+'''
+
+import numpy as np
+from scipy.sparse import csr_matrix
+from scipy.sparse.csgraph import connected_components
+
+from PiltonWorld import PiltonParticle
+from PiltonWorld import PiltonWorldState
+
+# (dx, dy) of the decay products of a particle, indexed by its decay kind:
+# 0 = no decay (the particle itself), 1 = x decays, 2 = y decays, 3 = both decay.
+# Unused entries pad each row to the largest number of products, 4.
+DECAY_COUNTS = np.array([1, 2, 2, 4])
+DECAY_DX = np.array([[0, 0, 0, 0], [-1, 1, 0, 0], [0, 0, 0, 0], [-1, 1, -1, 1]])
+DECAY_DY = np.array([[0, 0, 0, 0], [0, 0, 0, 0], [-1, 1, 0, 0], [-1, -1, 1, 1]])
+
+def group_sums(groups, values):
+    '''Returns the integer sums of values by group, for groups numbered 0 .. n-1.'''
+    sums = np.zeros(groups.max() + 1 if len(groups) else 0, dtype=np.int64)
+    np.add.at(sums, groups, values)
+    return sums
+
+class PiltonWorldArrayState(PiltonWorldState):
+
+    def __init__(self, numberOfCols, numberOfRows):
+        super().__init__(numberOfCols, numberOfRows)
+        self._set_columns(np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64))
+
+    def _set_columns(self, x, y, mass):
+        self._x = x
+        self._y = y
+        self._mass = mass
+
+    @property
+    def particles(self):
+        '''Returns the particles as a list of PiltonParticle.'''
+        return [PiltonParticle(x, y, mass) for x, y, mass in zip(self._x.tolist(), self._y.tolist(), self._mass.tolist())]
+
+    @particles.setter
+    def particles(self, particles):
+        columns = np.array([tuple(p) for p in particles], dtype=np.int64).reshape(-1, 3)
+        self._set_columns(columns[:, 0].copy(), columns[:, 1].copy(), columns[:, 2].copy())
+        self._cycle = None
+
+    def copy(self):
+        '''Returns an independent PiltonWorldArrayState with the same dimensions, timestep and particles.'''
+        other = PiltonWorldArrayState(self._cols, self._rows)
+        other.timestep = self.timestep
+        other._set_columns(self._x.copy(), self._y.copy(), self._mass.copy())
+        other._cycle = self._cycle
+        return other
+
+    def do_simulation_step(self):
+        t = self.timestep + 1
+        self._move(t)
+        self._coalesce()
+        self._decay(t)
+        self._coalesce()
+        self.timestep = t
+
+    def _molecule_labels(self):
+        '''
+        Returns an array of molecule labels, one per particle, equal for particles in the same molecule.
+        Particles are in the same molecule as their occupied edge-neighbor cells; particles alone on a cell
+        with no occupied neighbor are each a molecule of their own (equal particles sharing one).
+        '''
+        cols, rows = self._cols, self._rows
+        flat = self._y * cols + self._x
+        cells, cell_of = np.unique(flat, return_inverse=True)
+        cell_of = cell_of.reshape(-1)
+        x, y = cells % cols, cells // cols
+        # each occupied cell's right and lower neighbors on the torus (which cover the left and upper ones too)
+        neighbors = np.concatenate([y * cols + (x + 1) % cols, (y + 1) % rows * cols + x])
+        found = np.minimum(np.searchsorted(cells, neighbors), len(cells) - 1)
+        linked = cells[found] == neighbors
+        first = np.tile(np.arange(len(cells)), 2)[linked]
+        second = found[linked]
+        edges = csr_matrix((np.ones(len(first), dtype=np.int8), (first, second)), shape=(len(cells), len(cells)))
+        _, cell_labels = connected_components(edges, directed=False)
+        has_neighbor = np.bincount(np.concatenate([first, second]), minlength=len(cells)) > 0
+        alone = ~has_neighbor[cell_of]
+        if not alone.any():
+            return cell_labels[cell_of]
+        # a particle alone on its cell, with no neighbors: a molecule per distinct particle there
+        _, distinct = np.unique(np.stack([flat, self._mass]), axis=1, return_inverse=True)
+        return np.where(alone, len(cells) + distinct.reshape(-1), cell_labels[cell_of])
+
+    def _move(self, t):
+        if len(self._mass) == 0:
+            return
+        _, molecules = np.unique(self._molecule_labels(), return_inverse=True)
+        molecules = molecules.reshape(-1)
+        others_x = self._x.sum() - group_sums(molecules, self._x)[molecules]
+        others_y = self._y.sum() - group_sums(molecules, self._y)[molecules]
+        moving = t % self._mass == 0
+        self._x = np.where(moving, (1 + others_x) % self._cols, self._x)
+        self._y = np.where(moving, (1 + others_y) % self._rows, self._y)
+
+    def _coalesce(self):
+        cells, group = np.unique(self._y * self._cols + self._x, return_inverse=True)
+        mass = group_sums(group.reshape(-1), self._mass)
+        self._set_columns(cells % self._cols, cells // self._cols, mass)
+
+    def _decay(self, t):
+        decaying = t % self._mass == 0
+        kind = decaying * ((self._x == t % self._cols) + 2 * (self._y == t % self._rows))
+        counts = DECAY_COUNTS[kind]
+        source = np.repeat(np.arange(len(kind)), counts)
+        product = np.arange(len(source)) - np.repeat(np.cumsum(counts) - counts, counts)
+        product_kind = kind[source]
+        x = (self._x[source] + DECAY_DX[product_kind, product]) % self._cols
+        y = (self._y[source] + DECAY_DY[product_kind, product]) % self._rows
+        self._set_columns(x, y, self._mass[source])
@@ -0,0 +1,56 @@
+'''
+Runs a simulation in batches scheduled on an event loop, without blocking it, for PiltonWorldSimulator.
+
+A blocking while-loop never returns to Tk's mainloop, which then cannot handle STOP (or redraw).
+A BatchRunner instead steps for about batch_seconds, then reschedules itself with after(),
+redrawing at most refresh_hz times a second, however fast the steps run.  It keeps the id of
+its one pending batch, so starting it again while it runs does nothing, and stopping it cancels
+that batch.  It only needs after and after_cancel functions like Tk's, so it runs without a display.
+'''
+
+import time
+
+class BatchRunner:
+    '''
+    Calls step repeatedly in batches scheduled with after(milliseconds, callback) (which returns an id
+    for after_cancel(id)), and redraw after a batch once at least 1 / refresh_hz seconds have passed
+    since the last redraw.
+    '''
+
+    def __init__(self, after, after_cancel, step, redraw, batch_seconds=0.02, refresh_hz=60, clock=time.perf_counter):
+        self._after = after
+        self._after_cancel = after_cancel
+        self._step = step
+        self._redraw = redraw
+        self.batch_seconds = batch_seconds
+        self.refresh_hz = refresh_hz
+        self._clock = clock
+        # the id of the pending batch, or None when stopped
+        self._after_id = None
+        self._last_redraw = None
+
+    @property
+    def running(self):
+        '''Returns True if a batch is scheduled.'''
+        return self._after_id is not None
+
+    def start(self):
+        '''Schedules the first batch, unless one is already pending.'''
+        if self._after_id is None:
+            self._after_id = self._after(0, self._run_batch)
+
+    def stop(self):
+        '''Cancels the pending batch, if any.'''
+        if self._after_id is not None:
+            self._after_cancel(self._after_id)
+            self._after_id = None
+
+    def _run_batch(self):
+        batch_end = self._clock() + self.batch_seconds
+        while self._clock() < batch_end:
+            self._step()
+        now = self._clock()
+        if self._last_redraw is None or now - self._last_redraw >= 1 / self.refresh_hz:
+            self._redraw()
+            self._last_redraw = now
+        self._after_id = self._after(1, self._run_batch)
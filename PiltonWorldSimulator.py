@@ -1,14 +1,20 @@
 '''
 GUI for running 7x7 Pilton World Simulation
+
+START runs the simulation without blocking Tk: a PiltonWorldRunner.BatchRunner takes steps
+in after()-scheduled batches of about _batch_seconds each, returning to the Tk event loop
+between batches, and redraws the display at most _refresh_hz times a second, however fast
+the steps run.  START while running does nothing, and STOP and RESET cancel the pending batch.
+Particle rectangles are created once and then moved (or hidden) with coords/itemconfig.
 '''
 from tkinter import Tk
 from tkinter import ttk
 from tkinter import Canvas
 from tkinter import StringVar
-from tkinter import BooleanVar
 from tkinter import Text
 from PiltonWorld import PiltonParticle
 from PiltonWorld import PiltonWorldState
+from PiltonWorldRunner import BatchRunner
 
 # ----- Core dimensions
 _cols = 7
@@ -17,6 +23,10 @@ _cell_width_pixels = 35  # cells are square, so height == width
 _grid_width_pixels = _cols * _cell_width_pixels + 1
 _grid_height_pixels = _rows * _cell_width_pixels + 1
 
+# ----- Run mode timing
+_batch_seconds = 0.02  # time spent stepping before returning to the Tk event loop
+_refresh_hz = 60       # most redraws per second while running (about the display refresh rate)
+
 # ----- Model
 
 starting_particles = [PiltonParticle(3,2,1)]
@@ -31,37 +41,51 @@ status_prefix = "World {0}x{1}".format(_cols, _rows)
 def particles_text(ps):
     return str([str(p) for p in ps.particles]).replace("'","")
 
-def update_display():
-    textcanvas.delete('all')
-    textcanvas.create_text(1, 1, anchor='nw', width=(textcanvas.winfo_width() - 2), text=particles_text(ps))
+# Canvas items reused from one display update to the next
+particle_items = []
+text_item = None
 
-    gridcanvas.delete('all')
-    for p in ps.particles:
+def update_display():
+    global text_item
+    particles = ps.particles
+    if text_item is None:
+        text_item = textcanvas.create_text(1, 1, anchor='nw')
+    textcanvas.itemconfigure(text_item, width=(textcanvas.winfo_width() - 2), text=particles_text(ps))
+
+    # move the existing rectangles, creating more only when there are more particles than ever before
+    for i, p in enumerate(particles):
         gx0 = p.x * _cell_width_pixels
         gy0 = p.y * _cell_width_pixels
         gx1 = gx0 + _cell_width_pixels
         gy1 = gy0 + _cell_width_pixels
-        gridcanvas.create_rectangle(gx0, gy0, gx1, gy1, fill='red', outline=_backcolor)
+        if i < len(particle_items):
+            gridcanvas.coords(particle_items[i], gx0, gy0, gx1, gy1)
+            gridcanvas.itemconfigure(particle_items[i], state='normal')
+        else:
+            particle_items.append(gridcanvas.create_rectangle(gx0, gy0, gx1, gy1, fill='red', outline=_backcolor))
+    for item in particle_items[len(particles):]:
+        gridcanvas.itemconfigure(item, state='hidden')
 
-    statustext.set("{0} : t={1} particles={2}".format(status_prefix, ps.timestep, len(ps.particles)))
+    statustext.set("{0} : t={1} particles={2}".format(status_prefix, ps.timestep, len(particles)))
 
 def do_step():
     ps.do_simulation_step()
     update_display()
 
 # NOTE 2018-6-10
-# WARNING !!! Start/Stop doesn't work !!!
-# Need to learn about the equivalent of SwingWorker for Python Tkinter
+# Start/Stop needed the equivalent of SwingWorker for Python Tkinter:
+# a blocking while-loop never returns to mainloop, which then cannot handle STOP (or redraw).
+# Instead, runner (a BatchRunner, created with the view) steps for a short while, then reschedules itself with after().
 
-# def do_start():
-#     sim_running.set(True)
-#     while sim_running.get():
-#         do_step()
+def do_start():
+    runner.start()
 
-# def do_stop():
-#     sim_running.set(False)
+def do_stop():
+    runner.stop()
+    update_display()
 
 def do_reset():
+    runner.stop()
     ps.do_simulation_reset()
     ps.particles = starting_particles
     update_display()
@@ -75,8 +99,7 @@ root.title("Pilton Small World")
 
 statustext = StringVar()
 
-# sim_running = BooleanVar()
-# sim_running.set(False)
+runner = BatchRunner(root.after, root.after_cancel, ps.do_simulation_step, update_display, _batch_seconds, _refresh_hz)
 
 mainframe = ttk.Frame(root, padding='3 3 3 3')
 mainframe.grid(column=0, row=0, sticky="nsew")
@@ -120,15 +143,11 @@ textcanvas.grid(column=2, row=1, columnspan=2, sticky='e')
 btnstep = ttk.Button(mainframe, text="STEP", command=do_step)
 btnstep.grid(column=0, row=2, sticky='w')
 
-# NOTE 2018-6-10
-# WARNING !!! Start/Stop doesn't work !!!
-# Need to learn about the equivalent of SwingWorker for Python Tkinter
-
-# btnStart = ttk.Button(mainframe, text="START", command=do_start)
-# btnStart.grid(column=1, row=2, sticky='w')
+btnStart = ttk.Button(mainframe, text="START", command=do_start)
+btnStart.grid(column=1, row=2, sticky='w')
 
-# btnStop = ttk.Button(mainframe, text="STOP", command=do_stop)
-# btnStop.grid(column=2, row=2, sticky='w')
+btnStop = ttk.Button(mainframe, text="STOP", command=do_stop)
+btnStop.grid(column=2, row=2, sticky='w')
 
 btnReset = ttk.Button(mainframe, text="RESET", command=do_reset)
 btnReset.grid(column=3, row=2, sticky='e')
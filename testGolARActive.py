@@ -0,0 +1,52 @@
+import random
+import unittest
+
+import GolAR
+import GolARActive
+import testGolAR
+
+class TestGolARActive(unittest.TestCase):
+
+    # a 2x2 block (still life) well away from a blinker (period 2 oscillator)
+    block = {(20, 20), (21, 20), (20, 21), (21, 21)}
+
+    def test_life_matches_set_based_life(self):
+        active = GolARActive.life(testGolAR.TestGolAR.acorn)
+        gol = GolAR.life(testGolAR.TestGolAR.acorn)
+        for generation in range(1, 301):
+            self.assertEqual(next(active), next(gol), "generation {0}".format(generation))
+
+    def test_soup_matches_step(self):
+        rng = random.Random(1234)
+        soup = {(rng.randrange(40), rng.randrange(40)) for i in range(600)}
+        universe = GolARActive.ActiveLife(soup)
+        expect = soup
+        for generation in range(1, 301):
+            universe.step()
+            expect = GolAR.step(GolAR.conway_rules, GolAR.neighbors_rect, expect)
+            self.assertEqual(universe.live_cells(), expect, "generation {0}".format(generation))
+
+    def test_settled_regions_cost_nothing(self):
+        cells = self.block | testGolAR.TestGolAR.blinker1
+        universe = GolARActive.ActiveLife(cells)
+        universe.advance(4)
+        for generation in range(5, 21):
+            universe.step()
+            self.assertEqual(universe.evaluated, 0, "generation {0}".format(generation))
+            self.assertEqual(universe.active, 0, "generation {0}".format(generation))
+            expect = testGolAR.TestGolAR.blinker1 if generation % 2 == 0 else testGolAR.TestGolAR.blinker2
+            self.assertEqual(universe.live_cells(), self.block | expect, "generation {0}".format(generation))
+
+    def test_disturbed_parked_region(self):
+        # a glider heading south-east into a settled blinker wakes the parked cells up
+        glider = {(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)}
+        blinker = {(x + 12, y + 12) for x, y in testGolAR.TestGolAR.blinker1}
+        universe = GolARActive.ActiveLife(glider | blinker)
+        expect = glider | blinker
+        for generation in range(1, 121):
+            universe.step()
+            expect = GolAR.step(GolAR.conway_rules, GolAR.neighbors_rect, expect)
+            self.assertEqual(universe.live_cells(), expect, "generation {0}".format(generation))
+
+if __name__ == '__main__':
+    unittest.main()
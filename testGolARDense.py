@@ -0,0 +1,57 @@
+import unittest
+
+import GolAR
+import GolARDense
+import testGolAR
+
+class TestGolARDense(unittest.TestCase):
+
+    def test_rule_table(self):
+        table = GolARDense.rule_table(GolAR.conway_rules)
+        for is_alive in (False, True):
+            for neighbors in range(GolARDense.MAX_NEIGHBORS + 1):
+                expect = GolAR.conway_rules(neighbors, is_alive)
+                actual = bool(table[int(is_alive), neighbors])
+                self.assertEqual(actual, expect, "alive={0} neighbors={1}".format(is_alive, neighbors))
+
+    def test_grid_round_trip(self):
+        grid = GolARDense.to_grid(testGolAR.TestGolAR.acorn, 10, 5)
+        self.assertEqual(GolARDense.to_live_cells(grid), testGolAR.TestGolAR.acorn)
+        with self.assertRaises(ValueError):
+            GolARDense.to_grid({(10, 0)}, 10, 5)
+
+    def test_step(self):
+        grid = GolARDense.to_grid(testGolAR.TestGolAR.blinker1, 5, 5)
+        grid = GolARDense.step(GolAR.conway_rules, grid)
+        self.assertEqual(GolARDense.to_live_cells(grid), testGolAR.TestGolAR.blinker2, "step 1")
+        grid = GolARDense.step(GolAR.conway_rules, grid)
+        self.assertEqual(GolARDense.to_live_cells(grid), testGolAR.TestGolAR.blinker1, "step 2")
+
+    def test_life_matches_set_based_life(self):
+        # acorn stays within this board for the generations compared
+        origin = (-40, -40)
+        dense = GolARDense.life(testGolAR.TestGolAR.acorn, 100, 100, origin)
+        sparse = GolAR.life(testGolAR.TestGolAR.acorn)
+        for generation in range(1, 101):
+            self.assertEqual(next(dense), next(sparse), "generation {0}".format(generation))
+
+    def test_torus_wraps(self):
+        # a blinker straddling the left/right edges of a torus
+        cells = {(4, 2), (0, 2), (1, 2)}
+        grid = GolARDense.step(GolAR.conway_rules, GolARDense.to_grid(cells, 5, 5), torus=True)
+        self.assertEqual(GolARDense.to_live_cells(grid), {(0, 1), (0, 2), (0, 3)})
+
+    def test_other_rules(self):
+        # HighLife (B36/S23) differs from Conway only on births with 6 neighbors
+        def highlife_rules(number_of_neighbors, is_alive):
+            return number_of_neighbors in (2, 3) if is_alive else number_of_neighbors in (3, 6)
+        origin = (-20, -20)
+        grid = GolARDense.to_grid(testGolAR.TestGolAR.acorn, 50, 50, origin)
+        cells = testGolAR.TestGolAR.acorn
+        for generation in range(30):
+            grid = GolARDense.step(highlife_rules, grid)
+            cells = GolAR.step(highlife_rules, GolAR.neighbors_rect, cells)
+            self.assertEqual(GolARDense.to_live_cells(grid, origin), cells, "generation {0}".format(generation))
+
+if __name__ == '__main__':
+    unittest.main()
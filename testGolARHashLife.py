@@ -0,0 +1,56 @@
+import unittest
+
+import GolAR
+import GolARHashLife
+import testGolAR
+
+class TestGolARHashLife(unittest.TestCase):
+
+    # glider, travelling one cell south-east every 4 generations
+    glider = {(1, 0), (2, 1), (0, 2), (1, 2), (2, 2)}
+
+    def test_round_trip(self):
+        hl = GolARHashLife.HashLife(testGolAR.TestGolAR.acorn)
+        self.assertEqual(hl.live_cells(), testGolAR.TestGolAR.acorn)
+        self.assertEqual(hl.population, len(testGolAR.TestGolAR.acorn))
+        self.assertEqual(hl.bounding_box(), (1, 1, 7, 3))
+        self.assertEqual(hl.to_text(), '##..###\n...#...\n.#.....')
+
+    def test_life_matches_set_based_life(self):
+        hl = GolARHashLife.HashLife(testGolAR.TestGolAR.acorn).life()
+        gol = GolAR.life(testGolAR.TestGolAR.acorn)
+        for generation in range(1, 201):
+            self.assertEqual(next(hl), next(gol), "generation {0}".format(generation))
+
+    def test_advance_matches_step(self):
+        expect = testGolAR.TestGolAR.acorn
+        for i in range(1000):
+            expect = GolAR.step(GolAR.conway_rules, GolAR.neighbors_rect, expect)
+        hl = GolARHashLife.HashLife(testGolAR.TestGolAR.acorn)
+        hl.advance(1000)
+        self.assertEqual(hl.generation, 1000)
+        self.assertEqual(hl.live_cells(), expect)
+
+    def test_advance_far(self):
+        generations = 4 * 10 ** 12
+        hl = GolARHashLife.HashLife(self.glider)
+        hl.advance(generations)
+        shift = generations // 4
+        self.assertEqual(hl.live_cells(), {(x + shift, y + shift) for x, y in self.glider})
+
+    def test_small_cache(self):
+        # a tiny cache evicts constantly, but must not change results
+        hl = GolARHashLife.HashLife(testGolAR.TestGolAR.acorn, cache_size=1024)
+        hl.advance(100)
+        expect = GolARHashLife.HashLife(testGolAR.TestGolAR.acorn)
+        expect.advance(100)
+        self.assertEqual(hl.live_cells(), expect.live_cells())
+
+    def test_empty(self):
+        hl = GolARHashLife.HashLife()
+        hl.advance(12345)
+        self.assertEqual(hl.live_cells(), set())
+        self.assertIsNone(hl.bounding_box())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+
+import GolAR
+import GolARDense
+import GolARTiled
+import testGolAR
+
+class TestGolARTiled(unittest.TestCase):
+
+    def test_matches_set_based_life(self):
+        # small tiles, so acorn spreads across many tile borders
+        with GolARTiled.TiledLife(100, 100, testGolAR.TestGolAR.acorn, origin=(-40, -40), tile_size=16, workers=2) as board:
+            gol = GolAR.life(testGolAR.TestGolAR.acorn)
+            for generation in range(1, 61):
+                board.step()
+                self.assertEqual(board.live_cells(), next(gol), "generation {0}".format(generation))
+            self.assertEqual(len(board.tile_timings), 60)
+            self.assertEqual(len(board.tile_timings[0]), 49)
+            self.assertGreaterEqual(board.load_imbalance(), 1.0)
+
+    def test_torus_matches_dense(self):
+        cells = {(0, 0), (1, 0), (2, 0), (9, 5), (9, 6), (9, 7), (5, 9), (6, 9), (7, 9), (8, 8)}
+        grid = GolARDense.to_grid(cells, 10, 10)
+        with GolARTiled.TiledLife(10, 10, cells, rules='B3/S23', torus=True, tile_size=4, workers=0) as board:
+            for generation in range(1, 31):
+                board.step()
+                grid = GolARDense.step(GolAR.conway_rules, grid, torus=True)
+                self.assertTrue((board.grid == grid).all(), "generation {0}".format(generation))
+
+    def test_in_process_boards_are_independent(self):
+        blinker = {(1, 0), (1, 1), (1, 2)}
+        block = {(0, 0), (1, 0), (0, 1), (1, 1)}
+        with GolARTiled.TiledLife(5, 5, blinker, tile_size=2, workers=0) as first:
+            with GolARTiled.TiledLife(6, 6, block, rules='B36/S23', tile_size=3, workers=0) as second:
+                first.step()
+                second.step()
+                self.assertEqual(first.live_cells(), {(0, 1), (1, 1), (2, 1)})
+                self.assertEqual(second.live_cells(), block)
+            # closing the second board leaves the first one stepping its own grid
+            first.step()
+            self.assertEqual(first.live_cells(), blinker)
+
+    def test_rulestring_table(self):
+        self.assertTrue((GolARDense.rulestring_table('B3/S23') == GolARDense.rule_table(GolAR.conway_rules)).all())
+        with self.assertRaises(ValueError):
+            GolARDense.rulestring_table('23/3')
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+
+try:
+    import LangtonAnt
+    import pygame
+except ImportError:
+    LangtonAnt = None
+from LangtonAntEngine import LangtonAntEngine
+
+@unittest.skipIf(LangtonAnt is None, 'needs pygame')
+class TestLangtonAnt(unittest.TestCase):
+
+    def test_adapt_steps_scales_to_budget(self):
+        self.assertEqual(LangtonAnt.adapt_steps(100, 0.01, 0.01), 100)
+        self.assertEqual(LangtonAnt.adapt_steps(100, 0.02, 0.03), 150)
+        self.assertEqual(LangtonAnt.adapt_steps(100, 0.03, 0.02), 66)
+
+    def test_adapt_steps_clamps(self):
+        factor = LangtonAnt.MAX_STEPS_FACTOR
+        # far too fast, or too quick to time: grow by at most the factor
+        self.assertEqual(LangtonAnt.adapt_steps(100, 1e-9, 0.03), 100 * factor)
+        self.assertEqual(LangtonAnt.adapt_steps(100, 0.0, 0.03), 100 * factor)
+        # far too slow: shrink by at most the factor, and never below one step
+        self.assertEqual(LangtonAnt.adapt_steps(100, 10.0, 0.03), 100 // factor)
+        self.assertEqual(LangtonAnt.adapt_steps(1, 10.0, 0.03), 1)
+
+    def test_record_covers_changed_cells(self):
+        engine = LangtonAntEngine(20, 20, ant=(10, 10), facing=0)
+        for frame in range(5):
+            before = {(x, y): engine.state_at((x, y)) for x in range(20) for y in range(20)}
+            xs, ys, _ = engine.record(150)
+            recorded = set(zip(xs, ys))
+            changed = {cell for cell, state in before.items() if engine.state_at(cell) != state}
+            self.assertLessEqual(changed, recorded, 'frame {0}'.format(frame))
+            self.assertEqual(len(xs), 150)
+
+    def test_draw_cells_rects(self):
+        engine = LangtonAntEngine(20, 20, ant=(10, 10), facing=0)
+        surface = pygame.Surface(LangtonAnt.get_display_size(20, 20))
+        LangtonAnt.draw_grid(surface, engine, 20, 20)
+        xs, ys, _ = engine.record(40)
+        cells = set(zip(xs, ys))
+        rects = LangtonAnt.draw_cells(surface, engine, cells)
+        # one rectangle per recorded cell, and the ant's last
+        self.assertEqual(len(rects), len(cells) + 1)
+        expect = {LangtonAnt.get_cell_pixels(cell) + LangtonAnt.CELL_SIZE for cell in cells}
+        self.assertEqual({tuple(rect) for rect in rects[:-1]}, expect)
+        self.assertEqual(tuple(rects[-1]), LangtonAnt.get_cell_pixels(engine.ant) + LangtonAnt.CELL_SIZE)
+        # their union is the area the frame changed, and nothing else needs redrawing
+        fresh = pygame.Surface(surface.get_size())
+        LangtonAnt.draw_grid(fresh, engine, 20, 20)
+        fresh.blit(LangtonAnt.RED_CELL, LangtonAnt.get_cell_pixels(engine.ant))
+        self.assertEqual(pygame.image.tobytes(surface, 'RGB'), pygame.image.tobytes(fresh, 'RGB'))
+
+
+if __name__ == '__main__':
+    unittest.main()
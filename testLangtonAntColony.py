@@ -0,0 +1,55 @@
+import unittest
+
+import numpy as np
+
+import LangtonAntColony
+from LangtonAntEngine import LangtonAntEngine
+
+class TestLangtonAntColony(unittest.TestCase):
+
+    def test_one_ant_matches_engine(self):
+        for rule in ('RL', 'LLRR', [[(1, 'R', 1), (1, 'L', 1)], [(1, 'R', 1), (0, 'N', 0)]]):
+            for conflict in LangtonAntColony.CONFLICT_POLICIES:
+                colony = LangtonAntColony.LangtonAntColony(13, 9, positions=[(6, 4)], facings=[1], rule=rule, conflict=conflict)
+                engine = LangtonAntEngine(13, 9, ant=(6, 4), facing=1, rule=rule)
+                colony.run(3000)
+                engine.run(3000)
+                x, y, facing, state = colony.ants()[0]
+                self.assertEqual((x, y), engine.ant)
+                self.assertEqual((facing, state), (engine.facing, engine.state))
+                cells = {(int(x), int(y)): int(colony.grid[y, x]) for y, x in zip(*np.nonzero(colony.grid))}
+                self.assertEqual(cells, engine.cells())
+
+    def test_seeded_runs_replay(self):
+        a = LangtonAntColony.LangtonAntColony(64, 48, ants=200, seed=99)
+        b = LangtonAntColony.LangtonAntColony(64, 48, ants=200, seed=99)
+        a.run(500)
+        b.run(500)
+        self.assertEqual(a.ants(), b.ants())
+        self.assertTrue((a.grid == b.grid).all())
+        self.assertEqual(len({(x, y) for x, y, f, s in LangtonAntColony.LangtonAntColony(8, 8, ants=64, seed=1).ants()}), 64)
+
+    def test_conflict_policies(self):
+        # two ants facing north on the same white cell
+        each = LangtonAntColony.LangtonAntColony(9, 9, positions=[(4, 4), (4, 4)], facings=[0, 0], conflict='each')
+        each.step()
+        # the first turns right on white and blackens the cell, so the second turns left on black and whitens it
+        self.assertEqual(each.ants(), [(5, 4, 1, 0), (3, 4, 3, 0)])
+        self.assertEqual(each.population(), 0)
+        once = LangtonAntColony.LangtonAntColony(9, 9, positions=[(4, 4), (4, 4)], facings=[0, 0], conflict='once')
+        once.step()
+        # both read white and turn right; the cell is written once
+        self.assertEqual(once.ants(), [(5, 4, 1, 0), (5, 4, 1, 0)])
+        self.assertEqual(once.population(), 1)
+
+    def test_bad_arguments(self):
+        with self.assertRaises(ValueError):
+            LangtonAntColony.LangtonAntColony(4, 4, ants=17)
+        with self.assertRaises(ValueError):
+            LangtonAntColony.LangtonAntColony(4, 4, conflict='random')
+        with self.assertRaises(ValueError):
+            LangtonAntColony.LangtonAntColony(4, 4, positions=[(0, 0)], facings=[0, 1])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+import unittest
+
+import LangtonAntEngine
+
+# (dx, dy) of a move in each facing: N, E, S, W
+DELTAS = [(0, -1), (1, 0), (0, 1), (-1, 0)]
+
+def reference_ant(steps, ant=(0, 0), facing=0, cols=None, rows=None):
+    '''The two-color ant stepped the obvious way, on a dict of black cells; returns (cells, ant, facing).'''
+    black = {}
+    for i in range(steps):
+        if ant in black:
+            facing = (facing - 1) % 4
+            del black[ant]
+        else:
+            facing = (facing + 1) % 4
+            black[ant] = 1
+        ant = (ant[0] + DELTAS[facing][0], ant[1] + DELTAS[facing][1])
+        if cols is not None:
+            ant = (ant[0] % cols, ant[1] % rows)
+    return black, ant, facing
+
+class TestLangtonAntEngine(unittest.TestCase):
+
+    def assertMatchesReference(self, engine, steps, **kwargs):
+        cells, ant, facing = reference_ant(steps, **kwargs)
+        self.assertEqual(engine.cells(), cells)
+        self.assertEqual(engine.ant, ant)
+        self.assertEqual(engine.facing, facing)
+        self.assertEqual(engine.population(), len(cells))
+
+    def test_unbounded_matches_reference(self):
+        # small tiles make the ant cross many tile edges, in every direction, before and into the highway
+        engine = LangtonAntEngine.LangtonAntEngine(ant=(3, -5), facing=2, tile_size=8)
+        engine.run(12000)
+        self.assertEqual(engine.steps, 12000)
+        self.assertMatchesReference(engine, 12000, ant=(3, -5), facing=2)
+
+    def test_torus_matches_reference(self):
+        engine = LangtonAntEngine.LangtonAntEngine(cols=11, rows=7, ant=(5, 3))
+        for steps in (1, 10, 1000, 3000):
+            engine.run(steps - engine.steps)
+            self.assertMatchesReference(engine, steps, ant=(5, 3), cols=11, rows=7)
+
+    def test_step_matches_run(self):
+        stepped = LangtonAntEngine.LangtonAntEngine(tile_size=4)
+        for i in range(500):
+            stepped.step()
+        run = LangtonAntEngine.LangtonAntEngine(tile_size=4)
+        run.run(500)
+        self.assertEqual(stepped.cells(), run.cells())
+        self.assertEqual(stepped.ant, run.ant)
+
+    def test_highway(self):
+        # the ant builds its highway, moving 2 cells diagonally every 104 steps, from about step 10,000
+        engine = LangtonAntEngine.LangtonAntEngine()
+        engine.run(11000)
+        ant = engine.ant
+        population = engine.population()
+        engine.run(104)
+        self.assertEqual(abs(engine.ant[0] - ant[0]), 2)
+        self.assertEqual(abs(engine.ant[1] - ant[1]), 2)
+        self.assertEqual(engine.population(), population + 12)
+
+    def test_to_text(self):
+        engine = LangtonAntEngine.LangtonAntEngine()
+        engine.run(4)
+        # four right turns on white cells: the ant walks a 2x2 square back to its start
+        self.assertEqual(engine.to_text(), 'A#\n##')
+        self.assertEqual(engine.bounding_box(), (0, 0, 1, 1))
+        self.assertEqual(engine.state_at((100, 100)), 0)
+
+    def test_rule_string_matches_reference(self):
+        # LLRR grows a symmetric pattern forever; compare it with the rule stepped the obvious way
+        rule = 'LLRR'
+        engine = LangtonAntEngine.LangtonAntEngine(rule=rule, tile_size=16)
+        engine.run(5000)
+        cells, ant, facing = {}, (0, 0), 0
+        for i in range(5000):
+            color = cells.get(ant, 0)
+            facing = (facing + LangtonAntEngine.TURN_LETTERS[rule[color]]) % 4
+            cells[ant] = (color + 1) % len(rule)
+            ant = (ant[0] + DELTAS[facing][0], ant[1] + DELTAS[facing][1])
+        self.assertEqual(engine.cells(), {cell: color for cell, color in cells.items() if color})
+        self.assertEqual(engine.ant, ant)
+        self.assertEqual(engine.facing, facing)
+
+    def test_turmite_table(self):
+        self.assertEqual(LangtonAntEngine.turmite_table('rl'), [[(1, 1, 0), (0, -1, 0)]])
+        # the Fibonacci spiral turmite: two states, two colors
+        table = [[(1, 'R', 1), (1, 'L', 1)], [(1, 'R', 1), (0, 'N', 0)]]
+        self.assertEqual(LangtonAntEngine.turmite_table(table), [[(1, 1, 1), (1, 3, 1)], [(1, 1, 1), (0, 0, 0)]])
+        engine = LangtonAntEngine.LangtonAntEngine(rule=table)
+        engine.run(3)
+        self.assertEqual(engine.state, 1)
+        for bad in ('R', 'RX', [[(2, 'R', 0), (0, 'L', 0)]], [[(1, 'R', 1), (0, 'L', 0)]], [[(1, 'R', 0)], [(0, 'L', 0), (0, 'L', 0)]]):
+            with self.assertRaises(ValueError, msg=repr(bad)):
+                LangtonAntEngine.turmite_table(bad)
+
+    def test_advance_finds_highway(self):
+        expect = LangtonAntEngine.LangtonAntEngine(tile_size=32)
+        expect.run(50000)
+        engine = LangtonAntEngine.LangtonAntEngine(tile_size=32)
+        engine.advance(30001)
+        self.assertIsNotNone(engine.highway)
+        self.assertEqual(engine.highway.period, 104)
+        self.assertEqual(sorted(map(abs, engine.highway.displacement)), [2, 2])
+        # continuing from mid-period, and jumping across tile edges, still matches stepping every move
+        engine.advance(19999)
+        self.assertEqual(engine.steps, 50000)
+        self.assertEqual(engine.cells(), expect.cells())
+        self.assertEqual(engine.ant, expect.ant)
+        self.assertEqual(engine.facing, expect.facing)
+
+    def test_jump_tiles_final_cells(self):
+        # a long jump over many tiny tiles writes the stripe in closed form, and still matches stepping every move
+        expect = LangtonAntEngine.LangtonAntEngine(tile_size=5)
+        expect.run(250003)
+        engine = LangtonAntEngine.LangtonAntEngine(tile_size=5)
+        engine.advance(250003)
+        self.assertEqual(engine.cells(), expect.cells())
+        self.assertEqual((engine.ant, engine.facing), (expect.ant, expect.facing))
+        highway = engine.highway
+        # no later period writes any of the final cells again
+        dx, dy = highway.displacement
+        offsets = {(qx, qy) for qx, qy, color in highway.cells}
+        for qx, qy, color in highway.final_cells:
+            self.assertFalse(any((qx - m * dx, qy - m * dy) in offsets for m in range(1, 100)))
+        self.assertLess(len(highway.final_cells), len(highway.cells))
+        self.assertGreater(highway.overlap_periods, 0)
+
+    def test_advance_finds_cycle(self):
+        # RR turns right on every cell, so the ant walks a 2x2 square, back to all white every 8 steps
+        engine = LangtonAntEngine.LangtonAntEngine(rule='RR')
+        engine.advance(10 ** 12 + 3)
+        self.assertEqual(engine.highway.period, 8)
+        self.assertEqual(engine.highway.displacement, (0, 0))
+        self.assertEqual(engine.cells(), {(0, 0): 1, (1, 0): 1, (1, 1): 1})
+        self.assertEqual(engine.ant, (0, 1))
+
+    def test_advance_without_highway(self):
+        # RLR never settles down: advance must fall back on stepping every move
+        expect = LangtonAntEngine.LangtonAntEngine(rule='RLR')
+        expect.run(20000)
+        engine = LangtonAntEngine.LangtonAntEngine(rule='RLR')
+        engine.advance(20000, window=1000)
+        self.assertIsNone(engine.highway)
+        self.assertEqual(engine.cells(), expect.cells())
+
+    def test_bad_dimensions(self):
+        with self.assertRaises(ValueError):
+            LangtonAntEngine.LangtonAntEngine(cols=10)
+        with self.assertRaises(ValueError):
+            LangtonAntEngine.LangtonAntEngine(cols=0, rows=10)
+
+
+if __name__ == '__main__':
+    unittest.main()
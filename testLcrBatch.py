@@ -0,0 +1,71 @@
+import unittest
+
+import numpy as np
+
+from LcrBatch import LcrBatchEngine
+from LcrBatch import LcrBatchEngineCenterVariant1
+from LcrBatch import play_games
+from LcrEngine import LcrEngine
+from LcrEngine import LcrEngineCenterVariant1
+
+class TestLcrBatchEngine(unittest.TestCase):
+
+    def test__init__(self):
+        batch = LcrBatchEngine(players=4, games=10, seed=1)
+        self.assertEqual(batch.tokens.shape, (10, 4))
+        self.assertTrue((batch.tokens == 3).all(), 'each player starts with three tokens')
+        self.assertTrue((batch.center == 0).all(), 'center starts empty')
+        with self.assertRaises(RuntimeError):
+            LcrBatchEngine(players=1)
+
+    def testTokensAreConserved(self):
+        batch = LcrBatchEngineCenterVariant1(players=5, games=1000, seed=1)
+        while not batch.game_over():
+            batch.play_a_round()
+            totals = batch.tokens.sum(axis=1) + batch.center
+            self.assertTrue((totals == 15).all(), 'round {0}'.format(batch.round.max()))
+            self.assertTrue((batch.tokens >= 0).all(), 'round {0}'.format(batch.round.max()))
+
+    def testGameOver(self):
+        batch = LcrBatchEngine(players=3, games=500, seed=1)
+        batch.play()
+        self.assertTrue((np.count_nonzero(batch.tokens > 0, axis=1) <= 1).all(), 'every game ends with at most one player holding tokens')
+        winners = batch.winners()
+        for game in range(batch.number_of_games):
+            holders = [i for i, t in enumerate(batch.tokens[game]) if t > 0]
+            expect = holders[0] if len(holders) == 1 else -1
+            self.assertEqual(winners[game], expect, 'game {0}'.format(game))
+
+    def testStandardRulesMatchScalarEngine(self):
+        self.assertOutcomesConsistent('s', LcrEngine)
+
+    def testCenterVariant1MatchesScalarEngine(self):
+        self.assertOutcomesConsistent('cv1', LcrEngineCenterVariant1)
+
+    def assertOutcomesConsistent(self, engine, scalar_class, players=3, scalar_games=3000):
+        # Win fractions per seat (plus no-winner) and mean game length, compared against the scalar engine.
+        # Both runs are seeded, so this check is deterministic.
+        scalar_wins = np.zeros(players + 1)
+        scalar_rounds = 0
+        lcr = scalar_class(players=players)
+        lcr.set_seed(a=1234)
+        for game in range(scalar_games):
+            lcr = scalar_class(players=players)
+            while not lcr.game_over():
+                lcr.play_a_round()
+            holders = [i for i, t in enumerate(lcr.tokens) if t > 0]
+            scalar_wins[holders[0] if len(holders) == 1 else players] += 1
+            scalar_rounds += lcr.round
+        batch_wins, batch_rounds = play_games(30000, players, engine, seed=1234, batch_size=10000)
+        scalar_fractions = scalar_wins / scalar_games
+        batch_fractions = batch_wins / batch_wins.sum()
+        for seat in range(players + 1):
+            msg = 'seat={0} scalar={1:.4f} batch={2:.4f}'.format(seat, scalar_fractions[seat], batch_fractions[seat])
+            self.assertAlmostEqual(scalar_fractions[seat], batch_fractions[seat], delta=0.03, msg=msg)
+        scalar_mean = scalar_rounds / scalar_games
+        batch_mean = np.dot(np.arange(len(batch_rounds)), batch_rounds) / batch_rounds.sum()
+        self.assertAlmostEqual(scalar_mean, batch_mean, delta=0.05 * scalar_mean, msg='mean rounds')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -58,6 +58,25 @@ class TestLcrEngineCenterVariant1(unittest.TestCase):
         expect = '1,1,2,4,2,2,5,2,3,3'
         self.assertEqual(lcr.csv_state_string(), expect, 'state should match expect based on set_seed')
 
+    def testRenamedTakeCenterFace(self):
+        # a variant that renames its no-op face declares that face as the one to take the center on
+        class Blank(LcrEngine):
+            FACE_DELTAS = {'Blank': (0, 0, 0, 0), 'Left': (-1, 1, 0, 0), 'Right': (-1, 0, 1, 0), 'Center': (-1, 0, 0, 1)}
+            TAKE_CENTER_ON_ALL = 'Blank'
+
+            def __init__(self, players=3, rng=None):
+                super().__init__(players, rng)
+                self.faces = ['Blank', 'Left', 'Blank', 'Right', 'Blank', 'Center']
+
+        renamed = Blank(players=8)
+        renamed.set_seed(a=1234)
+        renamed.play_a_round()
+        lcr = LcrEngineCenterVariant1(players=8)
+        lcr.set_seed(a=1234)
+        lcr.play_a_round()
+        self.assertEqual(renamed.csv_state_string(), lcr.csv_state_string())
+        self.assertIn((0, 0, 0, 0, True), renamed.outcome_table()[3])
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,79 @@
+import unittest
+
+import numpy as np
+
+import LcrMarkov
+from LcrBatch import play_games
+from LcrEngine import LcrEngine
+from LcrEngine import LcrEngineCenterVariant1
+
+class TestLcrMarkov(unittest.TestCase):
+
+    def testTurnOutcomes(self):
+        table = LcrEngine().outcome_table()
+        for dice in range(1, LcrMarkov.MAX_DICE + 1):
+            outcomes = LcrMarkov.turn_outcomes(table[dice])
+            self.assertAlmostEqual(sum(o[-1] for o in outcomes), 1.0, msg='dice={0}'.format(dice))
+        # one die: half dots, and a sixth each of left, right and center
+        expect = [(-1, 0, 0, 1, False, 1 / 6), (-1, 0, 1, 0, False, 1 / 6), (-1, 1, 0, 0, False, 1 / 6), (0, 0, 0, 0, False, 0.5)]
+        self.assertEqual(LcrMarkov.turn_outcomes(table[1]), expect)
+        variant_table = LcrEngineCenterVariant1().outcome_table()
+        self.assertIn((0, 0, 0, 0, True, 0.125), LcrMarkov.turn_outcomes(variant_table[3]))
+
+    def testEnumerateStates(self):
+        states = LcrMarkov.enumerate_states(2)
+        self.assertEqual(len(states), 28)  # 6 tokens among 3 places: C(8, 2)
+        self.assertTrue((states.sum(axis=1) == 6).all())
+        self.assertEqual(len({tuple(s) for s in states}), len(states))
+
+    def testProbabilitiesSumToOne(self):
+        for engine in ('s', 'cv1'):
+            result = LcrMarkov.solve(players=4, engine=engine, rounds_distribution=True)
+            total = sum(result.win_probabilities) + result.no_winner_probability
+            self.assertAlmostEqual(total, 1.0, places=9, msg=engine)
+            self.assertAlmostEqual(sum(result.rounds_distribution) + result.unresolved_probability, 1.0, places=9, msg=engine)
+            self.assertLess(result.unresolved_probability, 1e-11, msg=engine)
+            # the expected rounds solved for directly is the mean of the propagated distribution
+            mean_rounds = sum(r * p for r, p in enumerate(result.rounds_distribution))
+            self.assertAlmostEqual(result.expected_rounds, mean_rounds, places=6, msg=engine)
+
+    def testRoundsDistributionIsOptional(self):
+        result = LcrMarkov.solve(players=3)
+        self.assertIsNone(result.rounds_distribution)
+        self.assertEqual(result.unresolved_probability, 0.0)
+
+    def testTwoPlayerFirstRound(self):
+        # Games are only checked for game over at the end of a round, so none lasts zero rounds,
+        # but a 2-player game can end after one (e.g. if player 0 rolls three Centers and player 1 all dots).
+        result = LcrMarkov.solve(players=2, rounds_distribution=True)
+        self.assertEqual(result.rounds_distribution[0], 0.0)
+        self.assertGreater(result.rounds_distribution[1], 0.0)
+
+    def testFiveAndSixPlayers(self):
+        for players in (5, 6):
+            for engine in ('s', 'cv1'):
+                msg = 'players={0} engine={1}'.format(players, engine)
+                result = LcrMarkov.solve(players=players, engine=engine)
+                self.assertEqual(len(result.win_probabilities), players, msg=msg)
+                total = sum(result.win_probabilities) + result.no_winner_probability
+                self.assertAlmostEqual(total, 1.0, places=9, msg=msg)
+                # the last seat to roll is the least likely to win
+                self.assertEqual(min(result.win_probabilities), result.win_probabilities[-1], msg=msg)
+                self.assertGreater(result.expected_rounds, 1.0, msg=msg)
+        # the center variant recycles tokens, so its games last far longer (985 rounds for 6 players)
+        self.assertAlmostEqual(result.expected_rounds, 985.28, delta=0.01)
+
+    def testMatchesSimulation(self):
+        for engine in ('s', 'cv1'):
+            result = LcrMarkov.solve(players=3, engine=engine)
+            wins, rounds = play_games(30000, 3, engine, seed=4321, batch_size=10000)
+            fractions = wins / wins.sum()
+            expect = result.win_probabilities + [result.no_winner_probability]
+            for seat in range(4):
+                self.assertAlmostEqual(fractions[seat], expect[seat], delta=0.015, msg='engine={0} seat={1}'.format(engine, seat))
+            mean_rounds = np.dot(np.arange(len(rounds)), rounds) / rounds.sum()
+            self.assertAlmostEqual(mean_rounds, result.expected_rounds, delta=0.02 * result.expected_rounds, msg=engine)
+
+
+if __name__ == '__main__':
+    unittest.main()
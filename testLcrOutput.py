@@ -0,0 +1,108 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+import LcrOutput
+from LcrEngine import LcrEngine
+
+class TestLcrOutput(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def playGames(self, writer, games, first_game=0):
+        # Returns the csv_state_string rows recorded, prefixed with the game index, as the CLI prints them.
+        expect = []
+        lcr = LcrEngine(players=4)
+        lcr.set_seed(a=1234)
+        for game in range(first_game, first_game + games):
+            lcr = LcrEngine(players=4)
+            writer.record(lcr, game)
+            expect.append('{0},{1}'.format(game, lcr.csv_state_string()))
+            while not lcr.game_over():
+                lcr.play_a_round()
+                writer.record(lcr, game)
+                expect.append('{0},{1}'.format(game, lcr.csv_state_string()))
+        return expect
+
+    def testRoundTripAndAppend(self):
+        for fmt in LcrOutput.FORMATS:
+            path = os.path.join(self.directory.name, 'rounds.' + fmt)
+            # a tiny chunk size forces many bulk writes
+            with LcrOutput.LcrRoundWriter(path, 4, fmt, chunk_rows=7) as writer:
+                expect = self.playGames(writer, 5)
+            with LcrOutput.LcrRoundWriter(path, 4, fmt, chunk_rows=7, append=True) as writer:
+                expect += self.playGames(writer, 3, first_game=5)
+            actual = LcrOutput.read_rounds(path, 4, fmt)
+            self.assertEqual(actual.shape, (len(expect), 7), fmt)
+            self.assertEqual([','.join(map(str, row)) for row in actual], expect, fmt)
+
+    def testCsvHeader(self):
+        path = os.path.join(self.directory.name, 'rounds.csv')
+        with LcrOutput.LcrRoundWriter(path, 2, 'csv') as writer:
+            pass
+        with open(path) as f:
+            self.assertEqual(f.read(), 'Game,Round,Center,Player0,Player1\n')
+
+    def testNpyHeader(self):
+        path = os.path.join(self.directory.name, 'rounds.npy')
+        with LcrOutput.LcrRoundWriter(path, 3, 'npy') as writer:
+            writer.record(LcrEngine(players=3), 0)
+        self.assertEqual(np.load(path).tolist(), [[0, 0, 0, 3, 3, 3]])
+
+    def testAppendToMissingFile(self):
+        for fmt in LcrOutput.FORMATS:
+            path = os.path.join(self.directory.name, 'missing.' + fmt)
+            with LcrOutput.LcrRoundWriter(path, 3, fmt, append=True) as writer:
+                writer.record(LcrEngine(players=3), 0)
+            self.assertEqual(LcrOutput.read_rounds(path, 3, fmt).tolist(), [[0, 0, 0, 3, 3, 3]], fmt)
+
+    def testAppendToExistingNpy(self):
+        path = os.path.join(self.directory.name, 'rounds.npy')
+        with LcrOutput.LcrRoundWriter(path, 3, 'npy') as writer:
+            writer.record(LcrEngine(players=3), 0)
+        with LcrOutput.LcrRoundWriter(path, 3, 'npy', append=True) as writer:
+            self.assertEqual(writer.rows_written, 1)
+            writer.record(LcrEngine(players=3), 1)
+        self.assertEqual(np.load(path).tolist(), [[0, 0, 0, 3, 3, 3], [1, 0, 0, 3, 3, 3]])
+
+    def testInterruptedNpyKeepsFlushedRows(self):
+        path = os.path.join(self.directory.name, 'rounds.npy')
+        writer = LcrOutput.LcrRoundWriter(path, 3, 'npy', chunk_rows=2)
+        for game in range(3):
+            writer.record(LcrEngine(players=3), game)
+        # not closed: the header already counts the chunk that was flushed
+        self.assertEqual(np.load(path)[:, 0].tolist(), [0, 1])
+        writer.close()
+        self.assertEqual(np.load(path)[:, 0].tolist(), [0, 1, 2])
+
+    def testAppendRejectsMismatchedNpy(self):
+        path = os.path.join(self.directory.name, 'other.npy')
+        np.save(path, np.zeros((2, 5), dtype=np.int32))
+        with self.assertRaises(ValueError):
+            LcrOutput.LcrRoundWriter(path, 3, 'npy', append=True)
+        np.save(path, np.zeros((2, 6), dtype=np.float64))
+        with self.assertRaises(ValueError):
+            LcrOutput.LcrRoundWriter(path, 3, 'npy', append=True)
+        with self.assertRaises(ValueError):
+            LcrOutput.LcrRoundWriter(path, 3, 'xls')
+
+    def testAppendRejectsMismatchedCsv(self):
+        path = os.path.join(self.directory.name, 'rounds.csv')
+        with LcrOutput.LcrRoundWriter(path, 3, 'csv') as writer:
+            writer.record(LcrEngine(players=3), 0)
+        with self.assertRaises(ValueError):
+            LcrOutput.LcrRoundWriter(path, 4, 'csv', append=True)
+        # the file is left as it was, and a run with the same players still appends
+        with LcrOutput.LcrRoundWriter(path, 3, 'csv', append=True) as writer:
+            writer.record(LcrEngine(players=3), 1)
+        self.assertEqual(LcrOutput.read_rounds(path, 3, 'csv').tolist(), [[0, 0, 0, 3, 3, 3], [1, 0, 0, 3, 3, 3]])
+
+
+if __name__ == '__main__':
+    unittest.main()
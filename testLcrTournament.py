@@ -0,0 +1,44 @@
+import random
+import unittest
+
+import LcrTournament
+from LcrEngine import LcrEngine
+
+class TestLcrTournament(unittest.TestCase):
+
+    def testIndependentStreams(self):
+        # Two engines with their own streams are unaffected by the global random module.
+        a = LcrEngine(players=4, rng=random.Random(42))
+        b = LcrEngine(players=4, rng=random.Random(42))
+        a.play_a_round()
+        random.random()
+        b.play_a_round()
+        self.assertEqual(a.csv_state_string(), b.csv_state_string())
+
+    def testChunkSeeds(self):
+        self.assertEqual(LcrTournament.chunk_seed(1234, 7), LcrTournament.chunk_seed(1234, 7))
+        self.assertNotEqual(LcrTournament.chunk_seed(1234, 7), LcrTournament.chunk_seed(1234, 8))
+        self.assertNotEqual(LcrTournament.chunk_seed(1234, 7), LcrTournament.chunk_seed(1235, 7))
+
+    def testSameResultForAnyWorkerCount(self):
+        expect = LcrTournament.tournament(1000, players=4, master_seed=99, workers=0, chunk_size=100)
+        self.assertEqual(expect.games, 1000)
+        self.assertEqual(sum(expect.wins), 1000)
+        self.assertEqual(sum(expect.rounds.values()), 1000)
+        for workers in (1, 3):
+            actual = LcrTournament.tournament(1000, players=4, master_seed=99, workers=workers, chunk_size=100)
+            self.assertEqual(actual, expect, 'workers={0}'.format(workers))
+        other = LcrTournament.tournament(1000, players=4, master_seed=100, workers=0, chunk_size=100)
+        self.assertNotEqual(other, expect, 'different master seed')
+
+    def testStreamsRunningTotals(self):
+        totals = [result.games for result in LcrTournament.run_tournament(250, players=3, engine='cv1', workers=0, chunk_size=100)]
+        self.assertEqual(totals, [100, 200, 250])
+        # each yield is a snapshot, not the running total changed by later chunks
+        results = list(LcrTournament.run_tournament(250, players=3, engine='cv1', workers=0, chunk_size=100))
+        self.assertEqual([result.games for result in results], [100, 200, 250])
+        self.assertEqual([sum(result.wins) for result in results], [100, 200, 250])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import contextlib
+import io
+import unittest
+
+import numpy as np
+
+import OneFiveThree
+import OneFiveThreeBatch
+
+class TestOneFiveThreeBatch(unittest.TestCase):
+
+    def testChainLengths(self):
+        numbers = list(range(-10, 5000)) + [10 ** 17 + 2, OneFiveThreeBatch.MAX_NUMBER]
+        expected = [len(OneFiveThree.chain_153(i)) for i in numbers]
+        self.assertEqual(OneFiveThreeBatch.chain_lengths(numbers).tolist(), expected)
+
+    def testCubeSumTable(self):
+        numbers = list(range(-20, 20000)) + [10 ** 40 + 153, 7 ** 300, 3 * 10 ** 500 - 1]
+        self.assertEqual([OneFiveThree.cube_sum(i) for i in numbers], [OneFiveThree.cube_sum_by_digits(i) for i in numbers])
+
+    def testCubeSums(self):
+        numbers = [0, 7, 153, 370, 9876543210, 10 ** 17 + 2]
+        self.assertEqual(OneFiveThreeBatch.cube_sums(numbers).tolist(), [OneFiveThree.cube_sum(i) for i in numbers])
+
+    def testMultiplesOf3(self):
+        chunks = list(OneFiveThreeBatch.multiples_of_3(-5, 40, chunk_size=4))
+        self.assertEqual([len(chunk) for chunk in chunks], [4, 4, 4, 1])
+        self.assertEqual(np.concatenate(chunks).tolist(), list(range(3, 40, 3)))
+        with self.assertRaises(ValueError):
+            list(OneFiveThreeBatch.multiples_of_3(0, OneFiveThreeBatch.MAX_NUMBER + 2))
+
+    def testSummarizeRange(self):
+        summary = OneFiveThreeBatch.summarize_range(1, 1000, chunk_size=10)
+        self.assertEqual(summary, OneFiveThreeBatch.summarize_range(1, 1000))
+        lengths = [len(OneFiveThree.chain_153(i)) for i in range(3, 1000, 3)]
+        self.assertEqual(summary['numbers'], 999)
+        self.assertEqual(summary['valid'], 333)
+        self.assertEqual(summary['length_counts'], [lengths.count(n) for n in range(max(lengths) + 1)])
+        self.assertEqual(summary['longest'], max(lengths))
+        self.assertEqual(summary['longest_number'], 3 + 3 * lengths.index(max(lengths)))
+
+    def testWriteRangeValid(self):
+        for start, stop in [(1, 1000), (150, 160), (7, 8)]:
+            printed = io.StringIO()
+            with contextlib.redirect_stdout(printed):
+                OneFiveThree.chain_rangeValid(start, stop)
+            written = io.StringIO()
+            OneFiveThreeBatch.write_range_valid(written, start, stop, chunk_size=17)
+            self.assertEqual(written.getvalue(), printed.getvalue())
+
+
+if __name__ == '__main__':
+    unittest.main()
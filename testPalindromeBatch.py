@@ -0,0 +1,49 @@
+import unittest
+
+import numpy as np
+
+import testPalindromes
+from PalindromeBatch import PalindromePartnerIndex
+from PalindromeBatch import is_palindrome_permutations
+from PalindromeBatch import parity_mask
+from PalindromeBatch import parity_masks
+from Palindromes import is_palindrome_permutation
+
+
+class TestPalindromeBatch(unittest.TestCase):
+
+    test_strings = list(testPalindromes.TestPalindromes.test_data) + [
+        'racecar', 'carrace', 'aabbc', 'aabbcd', '\x00\x7f\x7f', '~~', '@`', 'Aa', 'éé', 'éèé', '漢a漢', '漢ab', 'ab' * 40 + 'c'
+    ]
+
+    def test_is_palindrome_permutations(self):
+        expect = [is_palindrome_permutation(s) for s in self.test_strings]
+        self.assertEqual(is_palindrome_permutations(self.test_strings).tolist(), expect)
+        self.assertEqual(is_palindrome_permutations(iter(self.test_strings)).tolist(), expect)
+        self.assertEqual(is_palindrome_permutations(np.array(['aab', 'abc', 'xx'])).tolist(), [True, False, True])
+        self.assertEqual(is_palindrome_permutations([]).tolist(), [])
+
+    def test_bytes(self):
+        data = [s.encode('latin-1') for s in self.test_strings if s is not None and s.isascii()] + [b'\xe9\xe9x', b'\xe9x']
+        expect = [is_palindrome_permutation(s) for s in data]
+        self.assertEqual(is_palindrome_permutations(data).tolist(), expect)
+        self.assertEqual(is_palindrome_permutations(np.array(data)).tolist(), expect)
+        self.assertEqual(is_palindrome_permutations(np.array([b'aab', b'ab\x00ba', b'abc'])).tolist(), [True, True, False])
+        self.assertEqual(parity_masks(np.array(data)), [parity_mask(s) for s in data])
+        self.assertEqual(PalindromePartnerIndex([b'ab', b'ba', b'a']).partners(b'a'), [0, 1, 2])
+
+    def test_parity_masks(self):
+        self.assertEqual(parity_masks(self.test_strings), [parity_mask(s) for s in self.test_strings])
+        self.assertEqual(parity_mask('abca'), (1 << ord('b')) | (1 << ord('c')))
+
+    def test_partner_index(self):
+        index = PalindromePartnerIndex(self.test_strings)
+        for s in ['', 'ab', 'c', 'zz', 'é', 'racecar' + 'x', None]:
+            expect = [j for j, t in enumerate(self.test_strings) if is_palindrome_permutation((s or '') + (t or ''))]
+            self.assertEqual(index.partners(s), expect, 's={0}'.format(s))
+        pairs = list(PalindromePartnerIndex(['ab', 'ba', 'a', 'abc']).pairs())
+        self.assertEqual(pairs, [(0, 1), (0, 2), (0, 3), (1, 2), (1, 3)])
+
+
+if __name__ == '__main__':
+    unittest.main()
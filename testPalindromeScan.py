@@ -0,0 +1,57 @@
+import os
+import tempfile
+import unittest
+
+import PalindromeScan
+import testPalindromes
+
+
+class TestPalindromeScan(unittest.TestCase):
+
+    def test_is_palindrome(self):
+        for s, expect in testPalindromes.TestPalindromes.test_data.items():
+            self.assertEqual(PalindromeScan.is_palindrome(s), expect, "s={0}".format(s))
+            if s:
+                self.assertEqual(PalindromeScan.is_palindrome(memoryview(s.encode('ascii'))), expect, "s={0}".format(s))
+        # far longer than the recursion limit
+        self.assertTrue(PalindromeScan.is_palindrome('ab' * 50000 + 'a'))
+        self.assertFalse(PalindromeScan.is_palindrome('ab' * 50000 + 'b'))
+
+    def test_is_palindrome_normalized(self):
+        for s in ["A man, a plan, a canal: Panama!", "A rat tara!", "Ésé", "!?", b"Never odd, or even."]:
+            self.assertTrue(PalindromeScan.is_palindrome(s, normalize=True), "s={0}".format(s))
+        self.assertFalse(PalindromeScan.is_palindrome("A rat tart!", normalize=True))
+        self.assertFalse(PalindromeScan.is_palindrome(b"Never odd, or eve.", normalize=True))
+
+    def test_longest_palindrome(self):
+        self.assertEqual(PalindromeScan.longest_palindrome(''), (0, 0))
+        self.assertEqual(PalindromeScan.longest_palindrome('abc'), (0, 1))
+        self.assertEqual(PalindromeScan.longest_palindrome('xabbay'), (1, 5))
+        self.assertEqual(PalindromeScan.longest_palindrome('forgeeksskeegfor'), (3, 13))
+        self.assertEqual(PalindromeScan.longest_palindrome(b'abacdfgdcaba'), (0, 3))
+        self.assertEqual(PalindromeScan.longest_palindrome('So: Was it a car or a cat I saw?', normalize=True), (4, 31))
+        # every longest palindrome agrees with a brute-force search
+        for s in ['abaxabaxabb', 'aaaa', 'abcbd', 'babcbabcbaccba']:
+            start, stop = PalindromeScan.longest_palindrome(s)
+            longest = max(j - i for i in range(len(s)) for j in range(i + 1, len(s) + 1) if s[i:j] == s[i:j][::-1])
+            self.assertEqual(stop - start, longest)
+            self.assertEqual(s[start:stop], s[start:stop][::-1])
+
+    def test_file_scanners(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'lines.txt')
+            with open(path, 'wb') as f:
+                f.write(b'abba\r\n\nracecar level\nNever odd or even\nx')
+            self.assertEqual(list(PalindromeScan.palindromic_lines(path)), [(1, b'abba'), (5, b'x')])
+            self.assertEqual(list(PalindromeScan.palindromic_lines(path, normalize=True, encoding='utf-8')),
+                             [(1, 'abba'), (4, 'Never odd or even'), (5, 'x')])
+            longest = list(PalindromeScan.longest_palindromes(path))
+            self.assertEqual(longest[1], (3, 0, 7, b'racecar'))
+            self.assertEqual(len(longest), 4)
+            empty = os.path.join(directory, 'empty.txt')
+            open(empty, 'wb').close()
+            self.assertEqual(list(PalindromeScan.palindromic_lines(empty)), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
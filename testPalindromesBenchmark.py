@@ -0,0 +1,36 @@
+import json
+import unittest
+
+import PalindromesBenchmark
+
+
+class TestPalindromesBenchmark(unittest.TestCase):
+
+    def test_make_input(self):
+        for length in [0, 1, 2, 7, 30]:
+            palindrome = PalindromesBenchmark.make_input('palindrome', length)
+            mismatch = PalindromesBenchmark.make_input('mismatch', length)
+            self.assertEqual((len(palindrome), len(mismatch)), (length, length))
+            self.assertEqual(palindrome, palindrome[::-1])
+            self.assertEqual(mismatch == mismatch[::-1], length < 2)
+
+    def test_scaling_exponent(self):
+        self.assertAlmostEqual(PalindromesBenchmark.scaling_exponent([10, 100, 1000], [1e6, 1e5, 1e4]), 1.0)
+        self.assertAlmostEqual(PalindromesBenchmark.scaling_exponent([10, 100], [1e6, 1e4]), 2.0)
+        self.assertIsNone(PalindromesBenchmark.scaling_exponent([10], [1e6]))
+
+    def test_run_and_compare(self):
+        results = PalindromesBenchmark.run_benchmark(['recursive', 'two_index'], [8, 4000], min_seconds=0.001)
+        results = json.loads(json.dumps(results))
+        # the recursive implementation skips the length beyond the recursion limit
+        self.assertEqual(len(results['results']), 6)
+        self.assertEqual(set(results['scaling']), {'recursive/palindrome', 'recursive/mismatch', 'two_index/palindrome', 'two_index/mismatch'})
+        self.assertIsNone(results['scaling']['recursive/palindrome'])
+        self.assertEqual(PalindromesBenchmark.compare(results, results), [])
+        slower = {'results': [dict(r, ops_per_second=r['ops_per_second'] / 2) for r in results['results']]}
+        self.assertEqual(len(PalindromesBenchmark.compare(slower, results)), 6)
+        self.assertEqual(PalindromesBenchmark.compare(slower, results, tolerance=0.6), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
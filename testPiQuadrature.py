@@ -0,0 +1,48 @@
+import math
+import unittest
+
+import numpy as np
+
+import PiQuadrature
+import PiTrap
+
+
+class TestPiQuadrature(unittest.TestCase):
+
+    def test_exact_rules(self):
+        # the trapezoid rule is exact for lines, Simpson's for cubics
+        self.assertAlmostEqual(PiQuadrature.trapezoid(lambda x: 3 * x + 1, 0.0, 2.0, 3), 8.0)
+        self.assertAlmostEqual(PiQuadrature.simpson(lambda x: x ** 3, 0.0, 2.0, 2), 4.0)
+        with self.assertRaises(ValueError):
+            PiQuadrature.simpson(lambda x: x, 0.0, 1.0, 3)
+
+    def test_smooth_integrands(self):
+        self.assertAlmostEqual(PiQuadrature.romberg(np.exp, 0.0, 1.0), math.e - 1, places=12)
+        self.assertAlmostEqual(PiQuadrature.adaptive_simpson(np.sin, 0.0, math.pi), 2.0, places=9)
+        self.assertAlmostEqual(PiQuadrature.adaptive_simpson(lambda x: 1 / x, 0.01, 1.0), math.log(100), places=9)
+
+    def test_pi_quadrature(self):
+        # the trapezoid rule matches PiTrap.pi_trap, now that it includes the final interval
+        for n in (10, 1000):
+            self.assertAlmostEqual(PiQuadrature.pi_quadrature(n), PiTrap.pi_trap(n), places=12)
+        for rule in PiQuadrature.RULES:
+            self.assertLess(abs(math.pi - PiQuadrature.pi_quadrature(100000, rule)), 1e-7, rule)
+        self.assertAlmostEqual(4 * PiQuadrature.quarter_circle_area(0.0, 1.0), math.pi)
+
+    def test_stream(self):
+        for rule in PiQuadrature.STREAM_RULES:
+            chunks = list(PiQuadrature.stream(PiQuadrature.quarter_circle, 0.0, 1.0, 1000, chunk_size=64, rule=rule))
+            self.assertEqual([sections for sections, x, total in chunks][-2:], [960, 1000])
+            method = PiQuadrature.trapezoid if rule == 'trapezoid' else PiQuadrature.simpson
+            self.assertAlmostEqual(chunks[-1][2], method(PiQuadrature.quarter_circle, 0.0, 1.0, 1000), places=13)
+        reports = list(PiQuadrature.pi_stream(1000, chunk_size=100))
+        self.assertEqual(len(reports), 10)
+        sections, pi_approx, pi_diff = reports[-1]
+        self.assertAlmostEqual(pi_approx, PiQuadrature.pi_quadrature(1000), places=13)
+        self.assertEqual(pi_diff, math.pi - pi_approx)
+        with self.assertRaises(ValueError):
+            list(PiQuadrature.stream(np.sqrt, 0.0, 1.0, 10, chunk_size=3, rule='simpson'))
+
+
+if __name__ == '__main__':
+    unittest.main()
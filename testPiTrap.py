@@ -0,0 +1,42 @@
+import decimal
+import math
+import unittest
+
+import PiTrap
+
+
+class TestPiTrap(unittest.TestCase):
+
+    def test_neumaier_sum(self):
+        self.assertEqual(PiTrap.neumaier_sum([1e100, 1.0, -1e100]), 1.0)
+        self.assertEqual(PiTrap.neumaier_sum([0.1] * 10), math.fsum([0.1] * 10))
+        self.assertEqual(PiTrap.neumaier_sum([]), 0.0)
+
+    def test_segments(self):
+        tasks = PiTrap.segments(10, 4)
+        self.assertEqual(tasks, [(10, 0, 2), (10, 2, 5), (10, 5, 7), (10, 7, 10)])
+        self.assertEqual(PiTrap.segments(3, 8), [(3, 0, 1), (3, 1, 2), (3, 2, 3)])
+
+    def test_pi_trap_parallel(self):
+        for n_sections in (1, 10, 12345):
+            expect = PiTrap.pi_trap(n_sections)
+            self.assertAlmostEqual(PiTrap.pi_trap_parallel(n_sections, workers=0), expect, places=13)
+        self.assertAlmostEqual(PiTrap.pi_trap_parallel(12345, workers=2), PiTrap.pi_trap(12345), places=13)
+
+    def test_sweep(self):
+        results = list(PiTrap.sweep([1, 3], [0, 2]))
+        self.assertEqual([(n, workers) for n, workers, *_ in results], [(10, 0), (1000, 0), (10, 2), (1000, 2)])
+        for n_sections, workers, sections_per_second, pi_approx, pi_diff in results:
+            self.assertGreater(sections_per_second, 0)
+            self.assertAlmostEqual(pi_approx, PiTrap.pi_trap(n_sections), places=13)
+            self.assertEqual(pi_diff, math.pi - pi_approx)
+
+    def test_decimal(self):
+        self.assertEqual(str(PiTrap.pi_decimal(30)), '3.14159265358979323846264338328')
+        pi_approx = PiTrap.pi_trap_decimal(1000, 40)
+        self.assertIsInstance(pi_approx, decimal.Decimal)
+        self.assertAlmostEqual(float(pi_approx), PiTrap.pi_trap(1000), places=13)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,47 @@
+import csv
+import os
+import tempfile
+import unittest
+
+import PiltonSweep
+
+class TestPiltonSweep(unittest.TestCase):
+
+    def testConfigurationCounts(self):
+        # 25 cells of a 5x5 grid, up to transposition: 5 on the diagonal + 20 / 2 off it
+        self.assertEqual(len(list(PiltonSweep.configurations(5, 5, (1,)))), 15)
+        # 300 unordered pairs, of which 20 are their own transpose: (300 + 20) / 2
+        self.assertEqual(len(list(PiltonSweep.configurations(5, 5, (2,)))), 160)
+        # no transposition on a rectangular grid
+        self.assertEqual(len(list(PiltonSweep.configurations(5, 4, (1,)))), 20)
+        self.assertEqual(len(list(PiltonSweep.configurations(5, 5, (1,), masses=(1, 2)))), 30)
+
+    def testCanonical(self):
+        self.assertEqual(PiltonSweep.canonical([(3, 1, 1), (2, 4, 1)], 5, 5), ((1, 3, 1), (4, 2, 1)))
+        self.assertEqual(PiltonSweep.canonical([(3, 1, 1), (2, 4, 1)], 5, 6), ((2, 4, 1), (3, 1, 1)))
+
+    def testRunConfiguration(self):
+        # see testPiltonWorld.testFindCycle
+        row = PiltonSweep.run_configuration((8, 8, ((0, 0, 3),), 1000))
+        self.assertEqual(row, [8, 8, 'x0y0m3', None, 9, 24, 4, 3, 33])
+        row = PiltonSweep.run_configuration((7, 7, ((3, 2, 1),), 50))
+        self.assertEqual(row[:6], [7, 7, 'x3y2m1', None, None, None])
+        self.assertEqual(row[6:], [9, 6, 50])
+
+    def testSweepResumes(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, 'sweep.csv')
+            first = list(PiltonSweep.run_sweep(path, [5], counts=(1,), max_steps=100, workers=0))
+            self.assertEqual(len(first), 15)
+            # a restarted sweep runs only the configurations not yet in the table
+            second = list(PiltonSweep.run_sweep(path, [5, 6], counts=(1,), max_steps=100, workers=0))
+            self.assertEqual(len(second), 21)
+            self.assertTrue(all(row[0] == 6 for row in second))
+            with open(path, newline='') as f:
+                rows = list(csv.DictReader(f))
+            self.assertEqual(len(rows), 36)
+            self.assertEqual(list(rows[0]), PiltonSweep.COLUMNS)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -76,6 +76,11 @@ class TestPiltonWorld(unittest.TestCase):
             actual = PiltonWorld.find_molecule(p, allparticles, self._COLS, self._ROWS)
             msg = "p={0} expect={1} actual={2}".format(p, expect, actual)
             self.assertTrue(ignoreOrderEqual(actual, expect), msg)
+        # any iterable of particles will do, not just a list
+        p = makeParticles((6,6,1))[0]
+        self.assertEqual(PiltonWorld.find_molecule(p, tuple(allparticles), self._COLS, self._ROWS), expect1)
+        self.assertEqual(PiltonWorld.find_molecule(p, iter(allparticles), self._COLS, self._ROWS), expect1)
+        self.assertEqual(set(PiltonWorld.find_others(p, iter(allparticles), self._COLS, self._ROWS)), set(allparticles) - expect1)
 
     def testFindOthers(self):
         allparticles = makeParticles((6,6), (5,6), (6,5), (5,5), (6,3), (5,3), (3,6), (3,5), (3,3), mass=1)
@@ -97,6 +102,15 @@ class TestPiltonWorld(unittest.TestCase):
             msg = "p={0} expect={1} actual={2}".format(p, expect, actual)
             self.assertTrue(ignoreOrderEqual(actual, expect), msg)
 
+    def testFindMolecules(self):
+        allparticles = makeParticles((6,6), (5,6), (6,5), (5,5), (6,3), (5,3), (3,6), (3,5), (3,3), (0,3), mass=1)
+        labels = PiltonWorld.find_molecules(allparticles, self._COLS, self._ROWS)
+        # (0,3) wraps around the torus to join (6,3) and (5,3)
+        expect = [[0, 1, 2, 3], [4, 5, 9], [6, 7], [8]]
+        actual = sorted(sorted(i for i, label in enumerate(labels) if label == l) for l in set(labels))
+        msg = "expect={0} actual={1}".format(expect, actual)
+        self.assertEqual(actual, expect, msg)
+
     def testMoveParticles(self):
         source = makeParticles((0,0,4), (4,2,2), (2,4,2), (6,6,1), (6,4,1), (4,6,1), (4,4,1))
         expect = makeParticles((0,0,4), (0,0,1), (2,4,2), (4,2,2), (0,2,1), (2,0,1), (2,2,1))
@@ -137,8 +151,66 @@ class TestPiltonWorld(unittest.TestCase):
                 msg = "t={0} expect={1} actual={2}".format(pwEngine.timestep, expect, actual)
                 self.assertTrue(ignoreOrderEqual(actual, expect), msg)
 
+    def testFindCycle(self):
+        # On an 8x8 grid a single particle of mass 3 settles, after 9 steps, into a cycle of period 24.
+        pwEngine = PiltonWorldState(8, 8)
+        pwEngine.particles = makeParticles((0,0,3))
+        self.assertEqual(pwEngine.find_cycle(), (9, 24))
+        self.assertEqual(pwEngine.cycle, (9, 24))
+        self.assertEqual(pwEngine.timestep, 0, "find_cycle does not advance the world")
+        # Pilton's own 7x7 example keeps growing heavier particles, so never cycles.
+        pwEngine = PiltonWorldState(self._COLS, self._ROWS)
+        pwEngine.particles = self.EXPECT_WORLD_SEQUENCE[0]
+        self.assertIsNone(pwEngine.find_cycle(max_steps=500))
+        # An extinct world is a cycle of period 1.
+        pwEngine.particles = []
+        self.assertEqual(pwEngine.find_cycle(), (0, 1))
+
+    def testJumpTo(self):
+        pwEngine = PiltonWorldState(8, 8)
+        pwEngine.particles = makeParticles((0,0,3))
+        for t in (5, 9, 40, 1001):
+            stepped = pwEngine.copy()
+            while stepped.timestep < t:
+                stepped.do_simulation_step()
+            jumped = pwEngine.copy()
+            jumped.jump_to(t)
+            self.assertEqual(jumped.timestep, t)
+            msg = "t={0} expect={1} actual={2}".format(t, stepped.particles, jumped.particles)
+            self.assertTrue(ignoreOrderEqual(jumped.particles, stepped.particles), msg)
+        pwEngine.jump_to(10 ** 12)
+        start, period = pwEngine.cycle
+        self.assertEqual(period, 24)
+        self.assertTrue(9 <= start < 9 + 2 * 24, "jump_to stops once the period is known")
+        with self.assertRaises(ValueError):
+            pwEngine.jump_to(0)
+        pwEngine.particles = makeParticles((3,2,1))
+        self.assertIsNone(pwEngine.cycle, "new particles start a new run")
+
+    def testJumpToStepsOnce(self):
+        # Pilton's own 7x7 example never cycles, so jump_to takes exactly the steps that stepping would.
+        pwEngine = CountingState(self._COLS, self._ROWS)
+        pwEngine.particles = self.EXPECT_WORLD_SEQUENCE[0]
+        pwEngine.jump_to(300)
+        self.assertEqual(pwEngine.steps, 300)
+        self.assertIsNone(pwEngine.cycle)
+        stepped = PiltonWorldState(self._COLS, self._ROWS)
+        stepped.particles = self.EXPECT_WORLD_SEQUENCE[0]
+        while stepped.timestep < 300:
+            stepped.do_simulation_step()
+        self.assertTrue(ignoreOrderEqual(pwEngine.particles, stepped.particles))
+
 #----- Helper functions
 
+class CountingState(PiltonWorldState):
+    '''A PiltonWorldState that counts the simulation steps it takes.'''
+
+    steps = 0
+
+    def do_simulation_step(self):
+        self.steps += 1
+        super().do_simulation_step()
+
 def ignoreOrderEqual(particles1, particles2):
     if len(particles1) != len(particles2):
         return False
@@ -0,0 +1,64 @@
+import random
+import unittest
+
+import testPiltonWorld
+from PiltonWorld import PiltonParticle
+from PiltonWorld import PiltonWorldState
+from PiltonWorldArray import PiltonWorldArrayState
+
+class TestPiltonWorldArray(unittest.TestCase):
+
+    def testPiltonWorldSequence(self):
+        # Pilton's example world, as checked for PiltonWorldState in testPiltonWorld
+        worldTest = testPiltonWorld.TestPiltonWorld('testPiltonWorldState')
+        worldTest.setUp()
+        expect_sequence = worldTest.EXPECT_WORLD_SEQUENCE
+        pwEngine = PiltonWorldArrayState(7, 7)
+        pwEngine.particles = expect_sequence[0]
+        while pwEngine.timestep < max(expect_sequence):
+            pwEngine.do_simulation_step()
+            if pwEngine.timestep in expect_sequence:
+                expect = expect_sequence[pwEngine.timestep]
+                actual = pwEngine.particles
+                msg = "t={0} expect={1} actual={2}".format(pwEngine.timestep, expect, actual)
+                self.assertTrue(testPiltonWorld.ignoreOrderEqual(actual, expect), msg)
+
+    def testMatchesListState(self):
+        # random worlds, including 1-wide grids and colocated particles, stepped both ways
+        rng = random.Random(1234)
+        for trial in range(100):
+            cols, rows = rng.randint(1, 9), rng.randint(1, 9)
+            particles = [PiltonParticle(rng.randrange(cols), rng.randrange(rows), rng.randint(1, 4)) for i in range(rng.randint(0, 12))]
+            listEngine = PiltonWorldState(cols, rows)
+            arrayEngine = PiltonWorldArrayState(cols, rows)
+            listEngine.particles = list(particles)
+            arrayEngine.particles = list(particles)
+            for step in range(30):
+                listEngine.do_simulation_step()
+                arrayEngine.do_simulation_step()
+                msg = "cols={0} rows={1} start={2} t={3}".format(cols, rows, particles, listEngine.timestep)
+                self.assertEqual(sorted(arrayEngine.particles), sorted(listEngine.particles), msg)
+
+    def testSparseHugeWorld(self):
+        # molecules are found from the occupied cells only, so a 10^5-by-10^5 grid costs no more than a small one
+        particles = [PiltonParticle(0, 0, 2), PiltonParticle(1, 0, 3), PiltonParticle(99999, 0, 1), PiltonParticle(500, 99999, 5)]
+        listEngine = PiltonWorldState(100000, 100000)
+        arrayEngine = PiltonWorldArrayState(100000, 100000)
+        listEngine.particles = list(particles)
+        arrayEngine.particles = list(particles)
+        for step in range(20):
+            listEngine.do_simulation_step()
+            arrayEngine.do_simulation_step()
+            self.assertEqual(sorted(arrayEngine.particles), sorted(listEngine.particles), "t={0}".format(listEngine.timestep))
+
+    def testFindCycle(self):
+        pwEngine = PiltonWorldArrayState(8, 8)
+        pwEngine.particles = [PiltonParticle(0, 0, 3)]
+        self.assertEqual(pwEngine.find_cycle(), (9, 24))
+        pwEngine.jump_to(1000)
+        self.assertEqual(pwEngine.timestep, 1000)
+        self.assertIsInstance(pwEngine.copy(), PiltonWorldArrayState)
+
+
+if __name__ == '__main__':
+    unittest.main()
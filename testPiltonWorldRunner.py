@@ -0,0 +1,87 @@
+import unittest
+
+from PiltonWorld import PiltonParticle
+from PiltonWorld import PiltonWorldState
+from PiltonWorldRunner import BatchRunner
+
+class FakeScheduler:
+    '''Stands in for Tk's after and after_cancel, running the pending callbacks only when told to.'''
+
+    def __init__(self):
+        self.pending = {}
+        self.next_id = 0
+
+    def after(self, milliseconds, callback):
+        self.next_id += 1
+        self.pending[self.next_id] = callback
+        return self.next_id
+
+    def after_cancel(self, after_id):
+        del self.pending[after_id]
+
+    def run_pending(self):
+        callbacks = list(self.pending.values())
+        self.pending.clear()
+        for callback in callbacks:
+            callback()
+
+class FakeClock:
+    '''A clock that advances tick seconds every time it is read.'''
+
+    def __init__(self, tick):
+        self.now = 0.0
+        self.tick = tick
+
+    def __call__(self):
+        self.now += self.tick
+        return self.now
+
+class TestBatchRunner(unittest.TestCase):
+
+    def setUp(self):
+        self.scheduler = FakeScheduler()
+        self.world = PiltonWorldState(7, 7)
+        self.world.particles = [PiltonParticle(3, 2, 1)]
+        self.redraws = 0
+        # each clock read is 1 ms, so a 10 ms batch takes a handful of steps
+        self.runner = BatchRunner(self.scheduler.after, self.scheduler.after_cancel, self.world.do_simulation_step,
+                                  self.redraw, batch_seconds=0.01, refresh_hz=50, clock=FakeClock(0.001))
+
+    def redraw(self):
+        self.redraws += 1
+
+    def testStartTwiceSchedulesOneLoop(self):
+        self.runner.start()
+        self.runner.start()
+        self.assertEqual(len(self.scheduler.pending), 1)
+        for batch in range(5):
+            self.scheduler.run_pending()
+            self.assertEqual(len(self.scheduler.pending), 1, "batch {0}".format(batch))
+        self.assertTrue(self.runner.running)
+        self.assertGreater(self.world.timestep, 0)
+
+    def testStopCancelsPendingBatch(self):
+        self.runner.start()
+        self.scheduler.run_pending()
+        self.runner.stop()
+        self.assertFalse(self.runner.running)
+        self.assertEqual(self.scheduler.pending, {})
+        timestep = self.world.timestep
+        self.scheduler.run_pending()
+        self.assertEqual(self.world.timestep, timestep)
+        # start after stop runs a single loop again
+        self.runner.stop()
+        self.runner.start()
+        self.runner.start()
+        self.assertEqual(len(self.scheduler.pending), 1)
+
+    def testRedrawsAreThrottled(self):
+        self.runner.start()
+        for batch in range(10):
+            self.scheduler.run_pending()
+        # batches of about 12 ms, redrawn at most every 20 ms: the first batch and then every other one
+        self.assertEqual(self.redraws, 5)
+
+
+if __name__ == '__main__':
+    unittest.main()